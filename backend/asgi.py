@@ -0,0 +1,252 @@
+"""
+ASGI entry point for the API.
+
+Server-Sent Event streams are served natively on the event loop: a client
+waiting for board events holds an asyncio task and a queue, not a thread,
+so thousands of open boards cannot starve ticket traffic the way they
+starve a fixed pool of sync workers. Every other route runs the regular
+Flask app through a WSGI bridge on a bounded thread pool sized to the
+database connection pool, so SQLAlchemy, the JWT checks, metrics and CORS
+behave exactly as under WSGI. Password hashing already runs on its own pool
+(see password_hashing.py), so a login burst waits there and gets 503s
+instead of tying up the bridge.
+
+    uvicorn asgi:application --host 0.0.0.0 --port 5001
+    gunicorn -c gunicorn.conf.py                      # SERVER_MODE=asgi
+
+Database access stays synchronous: the routes share their models and
+transactions with the WSGI path, and the bridge threads map one-to-one onto
+pooled connections, which is what an async driver would multiplex anyway.
+"""
+
+import asyncio
+import os
+import re
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from app import (NATIVE_STREAM_KEY, REVOKED_FRAME, app, board_channel, event_bus, format_sse, init_app,
+                 pool_options, revokes_stream)
+from events import AsyncSubscription, SlowConsumerError
+
+# Request bodies above this size are buffered on disk before the app sees them
+SPOOL_MAX_SIZE = 1024 * 1024
+# /api/events/stream for the caller's own board, or /api/boards/<id>/events/stream
+STREAM_PATH = re.compile(r'/api(?:/boards/\d+)?/events/stream')
+
+
+def build_environ(scope, body):
+    """Translate an ASGI HTTP scope into a PEP 3333 environ."""
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    client_host, client_port = scope.get('client') or ('', 0)
+    # WSGI strings are the raw bytes decoded as latin-1
+    path = scope.get('raw_path') or scope['path'].encode('utf-8')
+    path = path.split(b'?', 1)[0].decode('latin-1')
+    root_path = scope.get('root_path', '')
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path,
+        'PATH_INFO': path,
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'REMOTE_ADDR': client_host,
+        'REMOTE_PORT': str(client_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        # The body is fully buffered, so requests sent without a
+        # Content-Length (chunked uploads) can be read to the end
+        'wsgi.input_terminated': True,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope.get('headers', []):
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        if name == 'CONTENT_TYPE' or name == 'CONTENT_LENGTH':
+            environ[name] = value
+            continue
+        key = f'HTTP_{name}'
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+class KanbanASGI:
+
+    def __init__(self, flask_app, bus, threads=None, startup=None):
+        self.flask_app = flask_app
+        self.bus = bus
+        # Run on a bridge thread at lifespan startup, so a worker checks its
+        # database before it accepts requests
+        self.startup = startup
+        self.threads = threads or pool_options['pool_size'] + pool_options['max_overflow']
+        self.executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='wsgi-bridge')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http':
+            if scope['method'] == 'GET' and STREAM_PATH.fullmatch(scope['path']):
+                await self.stream_events(scope, receive, send)
+            else:
+                await self.call_wsgi(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                if self.startup is not None:
+                    try:
+                        await asyncio.get_running_loop().run_in_executor(self.executor, self.startup)
+                    except Exception as e:
+                        self.flask_app.logger.exception('Startup failed')
+                        await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                        return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def read_body(self, receive):
+        body = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            body.write(message.get('body', b''))
+            more_body = message.get('more_body', False)
+        body.seek(0)
+        return body
+
+    async def call_wsgi(self, scope, receive, send):
+        """Run the Flask app for one request on the bridge pool, streaming its response."""
+        body = await self.read_body(receive)
+        if body is None:
+            return
+        environ = build_environ(scope, body)
+        loop = asyncio.get_running_loop()
+
+        def send_from_thread(message):
+            # Blocking until the server takes each chunk gives streamed
+            # exports the same back-pressure as under WSGI
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        def run():
+            response = {}
+
+            def start_response(status, headers, exc_info=None):
+                if exc_info and response.get('started'):
+                    raise exc_info[1].with_traceback(exc_info[2])
+                response['status'] = int(status.split(' ', 1)[0])
+                response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                       for name, value in headers]
+                return lambda data: write(data)
+
+            def start():
+                if not response.get('started'):
+                    response['started'] = True
+                    send_from_thread({'type': 'http.response.start', 'status': response['status'],
+                                      'headers': response['headers']})
+
+            def write(data):
+                if data:
+                    start()
+                    send_from_thread({'type': 'http.response.body', 'body': data, 'more_body': True})
+
+            result = self.flask_app.wsgi_app(environ, start_response)
+            try:
+                for chunk in result:
+                    write(chunk)
+                start()
+                send_from_thread({'type': 'http.response.body', 'body': b'', 'more_body': False})
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+                body.close()
+
+        await loop.run_in_executor(self.executor, run)
+
+    def run_buffered(self, environ):
+        """Run the Flask app for one request and return (status, headers, body)."""
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split(' ', 1)[0])
+            response['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                   for name, value in headers]
+
+        result = self.flask_app.wsgi_app(environ, start_response)
+        try:
+            body = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+            environ['wsgi.input'].close()
+        return response['status'], response['headers'], body
+
+    async def stream_events(self, scope, receive, send):
+        """GET /api/events/stream on the event loop, framed exactly like the Flask route.
+
+        The Flask route runs first, on the bridge pool, so a stream gets the
+        same authentication, board access check, rate limits, admission
+        control, metrics and CORS headers as under WSGI. Instead of a body it
+        leaves the board to subscribe to, and the user whose removal from it
+        ends the stream, in the environ.
+        """
+        body = await self.read_body(receive)
+        if body is None:
+            return
+        environ = build_environ(scope, body)
+        native = environ[NATIVE_STREAM_KEY] = {}
+        status, headers, content = await asyncio.get_running_loop().run_in_executor(
+            self.executor, self.run_buffered, environ)
+        if 'board_id' not in native:
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': content})
+            return
+        subscription = self.bus.subscribe(board_channel(native['board_id']), AsyncSubscription)
+        headers = [(name, value) for name, value in headers if name != b'content-length']
+
+        async def wait_for_disconnect():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+
+        disconnected = asyncio.ensure_future(wait_for_disconnect())
+        try:
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': b'retry: 3000\n\n', 'more_body': True})
+            heartbeat = self.flask_app.config['SSE_HEARTBEAT_SECONDS']
+            while True:
+                next_event = asyncio.ensure_future(subscription.get(timeout=heartbeat))
+                await asyncio.wait({next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+                if disconnected.done():
+                    next_event.cancel()
+                    return
+                try:
+                    event = next_event.result()
+                except SlowConsumerError:
+                    await send({'type': 'http.response.body', 'body': b'event: dropped\ndata: {}\n\n',
+                                'more_body': False})
+                    return
+                if revokes_stream(event, native['user_id']):
+                    await send({'type': 'http.response.body', 'body': REVOKED_FRAME.encode('utf-8'),
+                                'more_body': False})
+                    return
+                # Comment lines keep proxies from timing out idle connections
+                frame = format_sse(event) if event is not None else ': heartbeat\n\n'
+                await send({'type': 'http.response.body', 'body': frame.encode('utf-8'), 'more_body': True})
+        finally:
+            disconnected.cancel()
+            subscription.close()
+
+
+application = KanbanASGI(app, event_bus, int(os.getenv('ASGI_THREADS', '0')) or None, startup=init_app)
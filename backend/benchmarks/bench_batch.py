@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Benchmark POST /api/tickets/batch for create, move and delete batches.
+
+    python benchmarks/bench_batch.py --sizes 1000 10000
+"""
+
+import argparse
+import time
+
+from common import auth_headers, create_user, load_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    args = parser.parse_args()
+
+    app_module = load_app()
+    client = app_module.app.test_client()
+
+    print(f"{'ops':>8} {'phase':>8} {'seconds':>9} {'ops/sec':>10}")
+    for size in args.sizes:
+        headers = auth_headers(app_module, create_user(app_module, f'bench_batch_{size}'))
+
+        def run(phase, operations):
+            started = time.perf_counter()
+            response = client.post('/api/tickets/batch', json={'operations': operations}, headers=headers)
+            elapsed = time.perf_counter() - started
+            assert response.status_code == 200, response.get_data(as_text=True)
+            print(f"{size:>8} {phase:>8} {elapsed:>9.3f} {size / elapsed:>10.0f}")
+            return [result['id'] for result in response.get_json()['results']]
+
+        ids = run('create', [
+            {'op': 'create', 'title': f'Ticket {i}', 'description': 'Imported', 'labels': [f'label-{i % 20}']}
+            for i in range(size)
+        ])
+        run('move', [{'op': 'move', 'id': ticket_id, 'status': 'in-progress'} for ticket_id in ids])
+        run('delete', [{'op': 'delete', 'id': ticket_id} for ticket_id in ids])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark loading a shared board as its members.
+
+Seeds one board with --tickets tickets and --members members, the owner
+among them, and each request is made by the next member in turn, so every
+one pays its own membership check. Board routes check membership with one
+primary key lookup per request and ticket routes with a join, so the
+queries column should read the same whatever the board's size. They come
+from the Server-Timing header.
+
+    python benchmarks/bench_boards.py --tickets 100000 --members 50
+"""
+
+import argparse
+import itertools
+import os
+import random
+import re
+from datetime import datetime
+
+from common import auth_headers, create_users, load_app, measure, seed_tickets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tickets', type=int, default=100000)
+    parser.add_argument('--members', type=int, default=50)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    os.environ['SERVER_TIMING'] = 'true'
+    app_module = load_app()
+    app, db, Ticket = app_module.app, app_module.db, app_module.Ticket
+    client = app.test_client()
+    random.seed(42)
+
+    user_ids = create_users(app_module, 'bench_boards', args.members)
+    with app.app_context():
+        board_id = app_module.add_board('Shared bench board', user_ids[0]).id
+        db.session.execute(db.insert(app_module.BoardMember), [
+            {'board_id': board_id, 'user_id': user_id, 'role': 'member', 'created_at': datetime.utcnow()}
+            for user_id in user_ids[1:]
+        ])
+        db.session.commit()
+    seed_tickets(app_module, board_id, args.tickets)
+    with app.app_context():
+        todo = db.session.execute(
+            db.select(Ticket.id).where(Ticket.board_id == board_id, Ticket.status == 'todo').limit(1000)
+        ).scalars().all()
+    members = itertools.cycle([auth_headers(app_module, user_id) for user_id in user_ids])
+    board = f'/api/boards/{board_id}'
+    queries = {}
+
+    def request(name, method, url, expected=200, headers=None, **kwargs):
+        def run():
+            response = client.open(url() if callable(url) else url, method=method,
+                                   headers={**next(members), **(headers or {})}, **kwargs)
+            assert response.status_code == expected, response.get_data(as_text=True)
+            queries[name] = re.search(r'"(\d+) queries"', response.headers['Server-Timing']).group(1)
+        return name, run
+
+    etag = client.get(f'{board}/summary?limit={args.limit}', headers=next(members)).headers['ETag']
+    requests = [
+        request('summary', 'GET', f'{board}/summary?limit={args.limit}'),
+        request('summary 304', 'GET', f'{board}/summary?limit={args.limit}', expected=304,
+                headers={'If-None-Match': etag}),
+        request('first page', 'GET', f'{board}/tickets?limit={args.limit}'),
+        request('done page', 'GET', f'{board}/tickets?limit={args.limit}&status=done'),
+        request('ticket', 'GET', lambda: f'/api/tickets/{random.choice(todo)}'),
+    ]
+
+    print(f"{args.tickets} tickets, {args.members} members")
+    print(f"{'request':>12} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'queries':>8}")
+    for name, run in requests:
+        stats = measure(run, args.repeat)
+        print(f"{name:>12} {stats['p50']:>8.2f} {stats['p95']:>8.2f} {stats['max']:>8.2f} {queries[name]:>8}")
+
+
+if __name__ == '__main__':
+    main()
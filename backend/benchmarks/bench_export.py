@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark GET /api/tickets/export throughput and peak memory.
+
+The response is consumed chunk by chunk and discarded, so the peak reported
+by tracemalloc is what the server side needs. It should stay flat as the
+ticket count grows.
+
+    python benchmarks/bench_export.py --sizes 10000 100000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from common import auth_headers, create_user, load_app, own_board, seed_tickets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--formats', nargs='+', default=['ndjson', 'csv'])
+    parser.add_argument('--gzip', action='store_true', help='request gzip content encoding')
+    args = parser.parse_args()
+
+    app_module = load_app()
+    client = app_module.app.test_client()
+
+    print(f"{'tickets':>8} {'format':>7} {'seconds':>9} {'rows/sec':>10} {'MiB out':>8} {'peak MiB':>9}")
+    for size in args.sizes:
+        user_id = create_user(app_module, f'bench_export_{size}')
+        seed_tickets(app_module, own_board(app_module, user_id), size)
+        headers = auth_headers(app_module, user_id)
+        if args.gzip:
+            headers['Accept-Encoding'] = 'gzip'
+
+        for export_format in args.formats:
+            tracemalloc.start()
+            started = time.perf_counter()
+            response = client.get(f'/api/tickets/export?format={export_format}', headers=headers,
+                                  buffered=False)
+            assert response.status_code == 200, response.get_data(as_text=True)
+            received = sum(len(chunk) for chunk in response.response)
+            response.close()
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{size:>8} {export_format:>7} {elapsed:>9.2f} {size / elapsed:>10.0f} "
+                  f"{received / 2 ** 20:>8.1f} {peak / 2 ** 20:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
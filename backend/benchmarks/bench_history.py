@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark ticket writes and analytics as the history log grows.
+
+The benchmark user starts with --own-history synthetic transitions. For
+each size the log is then topped up with history for --users other
+boards, and the benchmark user's tickets are moved between columns.
+Write latency should stay flat as the log grows: a status change appends
+a row and touches a few rollup rows. The analytics endpoints read the
+daily rollups; 'raw scan' computes the same year of daily flow straight
+from the benchmark user's log for comparison.
+
+    python benchmarks/bench_history.py --sizes 0 1000000 5000000
+"""
+
+import argparse
+import random
+import uuid
+from datetime import datetime, timedelta
+
+from common import auth_headers, create_user, load_app, measure, own_board, seed_tickets
+
+
+def add_synthetic_history(app_module, count, board_ids, batch_size=50000):
+    """Append count status transitions spread over a year and over board_ids."""
+    db, TicketTransition = app_module.db, app_module.TicketTransition
+    start = datetime.utcnow() - timedelta(days=365)
+    statuses = [None] + app_module.VALID_STATUSES
+    with app_module.app.app_context():
+        for offset in range(0, count, batch_size):
+            rows = []
+            for _ in range(min(batch_size, count - offset)):
+                old_status, new_status = random.sample(statuses, 2)
+                rows.append({
+                    'board_id': random.choice(board_ids), 'ticket_id': str(uuid.uuid4()),
+                    'field': 'status', 'old_value': old_status, 'new_value': new_status,
+                    'occurred_at': start + timedelta(seconds=random.randrange(365 * 86400)),
+                })
+            db.session.execute(db.insert(TicketTransition), rows)
+            db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[0, 1000000])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--tickets', type=int, default=2000)
+    parser.add_argument('--own-history', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    app_module = load_app()
+    app, db, Ticket, TicketTransition = app_module.app, app_module.db, app_module.Ticket, app_module.TicketTransition
+    client = app.test_client()
+    random.seed(42)
+
+    user_id = create_user(app_module, 'bench_history')
+    board_id = own_board(app_module, user_id)
+    seed_tickets(app_module, board_id, args.tickets)
+    add_synthetic_history(app_module, args.own_history, [board_id])
+    with app.app_context():
+        app_module.rebuild_history_rollups()
+        ticket_ids = db.session.execute(db.select(Ticket.id).where(Ticket.board_id == board_id)).scalars().all()
+    headers = auth_headers(app_module, user_id)
+    year = f"from={(datetime.utcnow() - timedelta(days=365)).date()}"
+
+    def change_status():
+        ticket_id = random.choice(ticket_ids)
+        status = random.choice(app_module.VALID_STATUSES)
+        response = client.put(f'/api/tickets/{ticket_id}', json={'status': status}, headers=headers)
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    def get(url):
+        def load():
+            response = client.get(url, headers=headers)
+            assert response.status_code == 200, response.get_data(as_text=True)
+        return load
+
+    def raw_scan():
+        with app.app_context():
+            db.session.execute(
+                db.select(db.func.date(TicketTransition.occurred_at), TicketTransition.new_value, db.func.count())
+                .where(TicketTransition.board_id == board_id, TicketTransition.field == 'status',
+                       TicketTransition.occurred_at >= datetime.utcnow() - timedelta(days=365))
+                .group_by(db.func.date(TicketTransition.occurred_at), TicketTransition.new_value)
+            ).all()
+
+    print(f"{'log rows':>10} {'write p50':>10} {'write p95':>10} {'flow p50':>9} {'lead p50':>9} {'raw scan p50':>13}")
+    total = 0
+    for size in args.sizes:
+        if size > total:
+            add_synthetic_history(app_module, size - total, range(1000000, 1000000 + args.users))
+            total = size
+        writes = measure(change_status, args.repeat)
+        flow = measure(get(f'/api/analytics/cumulative-flow?{year}'), 20)
+        lead = measure(get(f'/api/analytics/lead-time?{year}'), 20)
+        raw = measure(raw_scan, 20)
+        with app.app_context():
+            rows = db.session.execute(db.select(db.func.count()).select_from(TicketTransition)).scalar()
+        print(f"{rows:>10} {writes['p50']:>10.1f} {writes['p95']:>10.1f} {flow['p50']:>9.1f} "
+              f"{lead['p50']:>9.1f} {raw['p50']:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark background job enqueue and dispatch throughput.
+
+Enqueue is measured as request handlers do it, one job per committed
+transaction, and as a batch committed together. Dispatch queues --jobs jobs
+and times a pool of each --workers size from start until the queue is empty,
+with a task that does nothing ('noop') and one that writes a row ('write'),
+so the numbers show the queue's own overhead and how it holds up next to
+real work. Each worker claims --batch-size jobs per poll.
+
+    python benchmarks/bench_jobs.py --jobs 2000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import time
+
+from common import create_user, load_app, measure, own_board
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--batch-size', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    # Workers are started per round below, not on import, and each round
+    # waits for the queue to empty, so nothing else may be scheduled on it
+    os.environ['JOB_WORKERS'] = '0'
+    os.environ['COMPACT_CHANGES_INTERVAL_SECONDS'] = '0'
+    app_module = load_app()
+    app, db, Job, job_queue = app_module.app, app_module.db, app_module.Job, app_module.job_queue
+    board_id = own_board(app_module, create_user(app_module, 'bench_jobs'))
+
+    @job_queue.task('noop')
+    def noop(index):
+        pass
+
+    @job_queue.task('write')
+    def write(index):
+        app_module.bump_board_version(board_id)
+        db.session.commit()
+
+    def enqueue_one():
+        with app.app_context():
+            job_queue.enqueue('noop', index=0)
+            db.session.commit()
+
+    stats = measure(enqueue_one, args.repeat)
+    with app.app_context():
+        started = time.perf_counter()
+        for index in range(args.jobs):
+            job_queue.enqueue('noop', index=index)
+        db.session.commit()
+        batched = args.jobs / (time.perf_counter() - started)
+        db.session.execute(db.delete(Job))
+        db.session.commit()
+    print(f"enqueue, one per transaction: p50 {stats['p50']:.2f} ms, p95 {stats['p95']:.2f} ms")
+    print(f"enqueue, {args.jobs} per transaction: {batched:.0f} jobs/s")
+    print()
+
+    print(f"{'task':>6} {'workers':>8} {'jobs':>7} {'seconds':>8} {'jobs/s':>8}")
+    for task in ('noop', 'write'):
+        for workers in args.workers:
+            with app.app_context():
+                for index in range(args.jobs):
+                    job_queue.enqueue(task, index=index)
+                db.session.commit()
+            started = time.perf_counter()
+            pool = app_module.WorkerPool(job_queue, workers, poll_interval=0.05, batch_size=args.batch_size).start()
+            with app.app_context():
+                while db.session.execute(db.select(db.func.count()).select_from(Job)).scalar():
+                    db.session.rollback()
+                    time.sleep(0.01)
+            elapsed = time.perf_counter() - started
+            pool.stop()
+            print(f"{task:>6} {workers:>8} {args.jobs:>7} {elapsed:>8.2f} {args.jobs / elapsed:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
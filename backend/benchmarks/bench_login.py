@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark ticket read latency while a burst of logins competes for workers.
+
+Requests are served by a fixed pool of threads, like sync gunicorn workers.
+Each round submits a login burst and a stream of GET /api/tickets calls, and
+reports ticket latency (queueing included) and how many logins were served
+or turned away with 503. Compare an effectively unbounded hashing queue with
+the bounded default:
+
+    python benchmarks/bench_login.py --queues 1000 4 --logins 40 --reads 200
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import auth_headers, create_user, load_app, own_board, seed_tickets
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--queues', type=int, nargs='+', default=[1000, 4],
+                        help='hashing queue limits to compare')
+    parser.add_argument('--server-workers', type=int, default=8)
+    parser.add_argument('--logins', type=int, default=40)
+    parser.add_argument('--reads', type=int, default=200)
+    parser.add_argument('--tickets', type=int, default=1000)
+    args = parser.parse_args()
+
+    app_module = load_app()
+    app, hasher = app_module.app, app_module.password_hasher
+    local = threading.local()
+
+    def client():
+        if not hasattr(local, 'client'):
+            local.client = app.test_client()
+        return local.client
+
+    client().post('/api/register', json={'username': 'bench_login', 'email': 'bench_login@bench.local',
+                                         'password': 'benchmark-password'})
+    reader = create_user(app_module, 'bench_login_reader')
+    seed_tickets(app_module, own_board(app_module, reader), args.tickets)
+    headers = auth_headers(app_module, reader)
+
+    def login():
+        response = client().post('/api/login', json={'username': 'bench_login',
+                                                     'password': 'benchmark-password'})
+        return response.status_code
+
+    def read(submitted):
+        response = client().get('/api/tickets', headers=headers)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return (time.perf_counter() - submitted) * 1000
+
+    print(f"bcrypt rounds: {hasher.rounds}, hash workers: {hasher.workers}, "
+          f"server workers: {args.server_workers}")
+    print(f"{'queue':>6} {'ok':>5} {'503':>5} {'read p50':>9} {'read p95':>9} {'read p99':>9} {'seconds':>8}")
+    for queue in args.queues:
+        hasher.max_pending = queue
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.server_workers) as server:
+            logins = [server.submit(login) for _ in range(args.logins)]
+            reads = []
+            for _ in range(args.reads):
+                reads.append(server.submit(read, time.perf_counter()))
+                time.sleep(0.002)
+            latencies = sorted(future.result() for future in reads)
+            statuses = [future.result() for future in logins]
+        elapsed = time.perf_counter() - started
+        print(f"{queue:>6} {statuses.count(200):>5} {statuses.count(503):>5} "
+              f"{statistics.median(latencies):>9.1f} {percentile(latencies, 0.95):>9.1f} "
+              f"{percentile(latencies, 0.99):>9.1f} {elapsed:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
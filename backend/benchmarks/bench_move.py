@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark POST /api/tickets/<id>/move as columns grow.
+
+Each size seeds a new user's board and drags cards to random spots within
+the todo column and across columns. Ticket rows written per move are counted
+from the executed UPDATE statements and should stay at one regardless of
+column size. The last column shows a full rebalance of the todo column,
+which runs in the background and only after repeated moves into one gap.
+
+    python benchmarks/bench_move.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import random
+
+from sqlalchemy import event
+
+from common import auth_headers, create_user, load_app, measure, own_board, seed_tickets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    app_module = load_app()
+    app, db, Ticket = app_module.app, app_module.db, app_module.Ticket
+    client = app.test_client()
+    random.seed(42)
+
+    rows_written = []
+
+    def count_ticket_updates(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('UPDATE ticket '):
+            rows_written[-1] += cursor.rowcount
+
+    print(f"{'tickets':>8} {'todo':>7} {'move':>7} {'rows/move':>10} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'max ms':>8} {'max key':>8} {'rebalance ms':>13}")
+    for size in args.sizes:
+        user_id = create_user(app_module, f'bench_move_{size}')
+        board_id = own_board(app_module, user_id)
+        seed_tickets(app_module, board_id, size)
+        headers = auth_headers(app_module, user_id)
+        with app.app_context():
+            todo = db.session.execute(
+                db.select(Ticket.id).where(Ticket.board_id == board_id, Ticket.status == 'todo')
+            ).scalars().all()
+            done = db.session.execute(
+                db.select(Ticket.id).where(Ticket.board_id == board_id, Ticket.status == 'done').limit(1000)
+            ).scalars().all()
+            event.listen(db.engine, 'after_cursor_execute', count_ticket_updates)
+
+        def within_column():
+            ticket_id, anchor = random.sample(todo, 2)
+            rows_written.append(0)
+            response = client.post(f'/api/tickets/{ticket_id}/move', json={'after_id': anchor}, headers=headers)
+            assert response.status_code == 200, response.get_data(as_text=True)
+
+        def across_columns():
+            ticket_id = done.pop()
+            todo.append(ticket_id)
+            rows_written.append(0)
+            response = client.post(f'/api/tickets/{ticket_id}/move', json={'before_id': random.choice(todo[:-1])},
+                                   headers=headers)
+            assert response.status_code == 200, response.get_data(as_text=True)
+
+        # Each move across columns takes a card out of done for good
+        for name, move, repeat in (('within', within_column, args.repeat),
+                                   ('across', across_columns, min(args.repeat, len(done)))):
+            rows_written.clear()
+            stats = measure(move, repeat)
+            with app.app_context():
+                longest = db.session.execute(
+                    db.select(db.func.max(db.func.length(Ticket.rank))).where(Ticket.board_id == board_id)
+                ).scalar()
+            rows_per_move = max(rows_written)
+            rebalance = ''
+            if name == 'across':
+                with app.app_context():
+                    rebalance = f"{measure(lambda: app_module.run_rebalance('todo', board_id), 1)['max']:.0f}"
+            print(f"{size:>8} {len(todo):>7} {name:>7} {rows_per_move:>10} {stats['p50']:>8.1f} "
+                  f"{stats['p95']:>8.1f} {stats['max']:>8.1f} {longest:>8} {rebalance:>13}")
+
+        with app.app_context():
+            event.remove(db.engine, 'after_cursor_execute', count_ticket_updates)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark GET /api/tickets as a user's ticket count grows.
+
+Seeds one user per size, then times the first page and a page taken from the
+middle of the list. With keyset pagination both should stay roughly flat.
+
+    python benchmarks/bench_pagination.py --sizes 1000 10000 100000
+"""
+
+import argparse
+
+from common import auth_headers, create_user, load_app, measure, own_board, seed_tickets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=30)
+    args = parser.parse_args()
+
+    app_module = load_app()
+    client = app_module.app.test_client()
+    Ticket = app_module.Ticket
+
+    print(f"{'tickets':>10} {'page':>8} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for size in args.sizes:
+        user_id = create_user(app_module, f'bench_pagination_{size}')
+        board_id = own_board(app_module, user_id)
+        seed_tickets(app_module, board_id, size)
+        headers = auth_headers(app_module, user_id)
+
+        with app_module.app.app_context():
+            middle = (Ticket.query.filter_by(board_id=board_id)
+                      .order_by(Ticket.updated_at.desc(), Ticket.id.desc())
+                      .offset(size // 2).first())
+            middle_cursor = app_module.encode_cursor(middle.updated_at, middle.id)
+
+        pages = {
+            'first': f'/api/tickets?limit={args.limit}',
+            'middle': f'/api/tickets?limit={args.limit}&cursor={middle_cursor}',
+            'done': f'/api/tickets?limit={args.limit}&status=done&cursor={middle_cursor}',
+        }
+        for name, url in pages.items():
+            def fetch():
+                response = client.get(url, headers=headers)
+                assert response.status_code == 200, response.get_data(as_text=True)
+            stats = measure(fetch, args.repeat)
+            print(f"{size:>10} {name:>8} {stats['p50']:>9.2f} {stats['p95']:>9.2f} {stats['max']:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
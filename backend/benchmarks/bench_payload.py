@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark board payload size and latency by representation and encoding.
+
+Loads GET /api/board/summary for boards of each size with every card's
+description padded to --description-bytes, as the full representation, as
+view=summary and as a single field, each uncompressed and with every coding
+the server can produce. The sizes are the bytes on the wire.
+
+    python benchmarks/bench_payload.py --sizes 1000 10000 --limit 200
+"""
+
+import argparse
+
+from common import auth_headers, create_user, load_app, measure, own_board, seed_tickets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--limit', type=int, default=200, help='Cards per column')
+    parser.add_argument('--description-bytes', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app_module = load_app()
+    app, db, Ticket = app_module.app, app_module.db, app_module.Ticket
+    client = app.test_client()
+    from compression import available_codings
+    codings = ('identity',) + available_codings()
+    views = (('full', ''), ('summary', '&view=summary'), ('title', '&fields=title'))
+
+    print(f"{'tickets':>8} {'view':>8} {'encoding':>9} {'bytes':>10} {'vs full':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for size in args.sizes:
+        user_id = create_user(app_module, f'bench_payload_{size}')
+        board_id = own_board(app_module, user_id)
+        seed_tickets(app_module, board_id, size)
+        with app.app_context():
+            db.session.execute(db.update(Ticket).where(Ticket.board_id == board_id).values(
+                description=('Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 20)[:args.description_bytes]))
+            db.session.commit()
+        headers = auth_headers(app_module, user_id)
+
+        baseline = None
+        for view, query in views:
+            for coding in codings:
+                url = f'/api/board/summary?limit={args.limit}{query}'
+                request_headers = dict(headers, **{'Accept-Encoding': coding})
+
+                def load():
+                    response = client.get(url, headers=request_headers)
+                    assert response.status_code == 200, response.get_data(as_text=True)
+                    return response
+
+                length = len(load().get_data())
+                baseline = baseline or length
+                stats = measure(load, args.repeat)
+                print(f"{size:>8} {view:>8} {coding:>9} {length:>10} {baseline / length:>7.1f}x "
+                      f"{stats['p50']:>8.1f} {stats['p95']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark GET /api/tickets/search latency for selective and broad queries.
+
+Each size adds --users users sharing that many tickets, and queries run as
+one of them. The index holds every size seeded so far, while each search
+only ranks one board's matches.
+
+    python benchmarks/bench_search.py --sizes 100000 1000000 --users 10
+"""
+
+import argparse
+import time
+
+from common import auth_headers, create_user, load_app, measure, own_board, seed_tickets
+
+QUERIES = [
+    ('exact word', 'number 4242'),
+    ('two words', 'ticket 4242'),
+    ('label', 'frontend'),
+    ('broad', 'benchmark'),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    app_module = load_app()
+    client = app_module.app.test_client()
+
+    print(f"{'tickets':>8} {'query':>11} {'results':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    indexed = 0
+    for size in args.sizes:
+        started = time.perf_counter()
+        user_ids = [create_user(app_module, f'bench_search_{size}_{index}') for index in range(args.users)]
+        for user_id in user_ids:
+            seed_tickets(app_module, own_board(app_module, user_id), size // args.users)
+        with app_module.app.app_context():
+            indexed = app_module.rebuild_search_index()
+        headers = auth_headers(app_module, user_ids[0])
+        print(f"seeded {size} tickets, index holds {indexed}, in {time.perf_counter() - started:.0f}s")
+
+        for name, query in QUERIES:
+            url = f'/api/tickets/search?q={query}&limit=50'
+
+            def search():
+                response = client.get(url, headers=headers)
+                assert response.status_code == 200, response.get_data(as_text=True)
+                return response
+
+            results = len(search().get_json()['tickets'])
+            stats = measure(search, args.repeat)
+            print(f"{size:>8} {name:>11} {results:>8} {stats['p50']:>8.1f} {stats['p95']:>8.1f} {stats['max']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark ticket list serialization: ORM + to_dict + stdlib json versus
+column projection + FastJSONProvider.
+
+Each path serializes a user's whole ticket list. Reports rows/sec from a
+plain run and peak Python memory from a separate run under tracemalloc, and
+checks that both paths produce identical bytes.
+
+    python benchmarks/bench_serialization.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from flask.json.provider import DefaultJSONProvider
+
+from common import create_user, load_app, own_board, seed_tickets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    app_module = load_app()
+    app, db, Ticket = app_module.app, app_module.db, app_module.Ticket
+    stdlib_provider = DefaultJSONProvider(app)
+    fast_provider = app_module.FastJSONProvider(app)
+    compact = {'separators': (',', ':')}
+
+    def orm_path(board_id):
+        tickets = Ticket.query.filter_by(board_id=board_id).order_by(Ticket.updated_at.desc(), Ticket.id.desc()).all()
+        return stdlib_provider.dumps({'tickets': [ticket.to_dict() for ticket in tickets]}, **compact)
+
+    def projection_path(board_id):
+        statement = app_module.select_ticket_rows(Ticket.board_id == board_id).order_by(
+            Ticket.updated_at.desc(), Ticket.id.desc())
+        rows = db.session.execute(statement).all()
+        return fast_provider.dumps({'tickets': app_module.serialize_ticket_rows(rows)}, **compact)
+
+    def run(path, board_id, trace=False):
+        with app.app_context():
+            if trace:
+                tracemalloc.start()
+            started = time.perf_counter()
+            output = path(board_id)
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1] if trace else 0
+            if trace:
+                tracemalloc.stop()
+            db.session.remove()
+        return output, elapsed, peak
+
+    print(f"JSON backend: {fast_provider.backend}")
+    print(f"{'rows':>8} {'path':>11} {'seconds':>9} {'rows/sec':>10} {'peak MiB':>9}")
+    for size in args.sizes:
+        board_id = own_board(app_module, create_user(app_module, f'bench_serialization_{size}'))
+        seed_tickets(app_module, board_id, size)
+        outputs = {}
+        for name, path in (('orm', orm_path), ('projection', projection_path)):
+            output, elapsed, _ = run(path, board_id)
+            _, _, peak = run(path, board_id, trace=True)
+            outputs[name] = output
+            print(f"{size:>8} {name:>11} {elapsed:>9.3f} {size / elapsed:>10.0f} {peak / 2 ** 20:>9.1f}")
+        assert outputs['orm'] == outputs['projection'], 'serialized output differs'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Compare ticket throughput under the WSGI and ASGI entry points while event streams are open.
+
+Both modes get the same number of threads. Under WSGI, as in a gthread
+worker, every open /api/events/stream holds one of them for as long as the
+client stays connected, leaving the rest for ticket requests; once streams
+reach the thread count, requests wait until a stream closes. Under ASGI the
+streams wait on the event loop and all threads stay free for the WSGI bridge.
+
+Each round opens --streams event streams for --hold seconds and sends
+--requests GET /api/tickets from --concurrency clients in the meantime. Both
+servers run in-process, so the numbers compare the serving models rather
+than a network stack.
+
+    python benchmarks/bench_serving.py --streams 0 8 32 --threads 8
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import auth_headers, create_user, load_app, own_board, percentile, seed_tickets
+
+
+def report(mode, streams, samples, elapsed, failures):
+    samples.sort()
+    ms = [sample * 1000 for sample in samples]
+    print(f"{mode:>5} {streams:>8} {len(samples):>9} {failures:>7} {len(samples) / elapsed:>9.0f} "
+          f"{percentile(ms, 0.5):>8.1f} {percentile(ms, 0.95):>8.1f} {percentile(ms, 0.99):>8.1f}")
+
+
+def run_wsgi(app, headers, streams, args):
+    client = app.test_client()
+    pool = ThreadPoolExecutor(max_workers=args.threads)
+    closed = threading.Event()
+
+    def hold_stream():
+        response = client.get('/api/events/stream', headers=headers, buffered=False)
+        try:
+            # Heartbeats return control every second to check for closing
+            for _ in response.response:
+                if closed.is_set():
+                    return
+        finally:
+            response.close()
+
+    def get_tickets():
+        response = client.get('/api/tickets?limit=50', headers=headers)
+        return response.status_code
+
+    for _ in range(streams):
+        pool.submit(hold_stream)
+    closer = threading.Timer(args.hold, closed.set)
+    closer.start()
+
+    samples, failures = [], [0]
+    per_client = args.requests // args.concurrency
+
+    def client_loop():
+        for _ in range(per_client):
+            started = time.perf_counter()
+            status = pool.submit(get_tickets).result()
+            samples.append(time.perf_counter() - started)
+            if status != 200:
+                failures[0] += 1
+
+    started = time.perf_counter()
+    clients = [threading.Thread(target=client_loop) for _ in range(args.concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    closed.set()
+    closer.cancel()
+    pool.shutdown(wait=True)
+    report('wsgi', streams, samples, elapsed, failures[0])
+
+
+async def call(application, scope, messages):
+    """Run one ASGI request; messages is a queue fed to receive()."""
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await application(scope, messages.get, send)
+    return sent
+
+
+def http_scope(path, query, token):
+    return {
+        'type': 'http', 'method': 'GET', 'path': path, 'raw_path': path.encode(),
+        'query_string': query.encode(), 'http_version': '1.1', 'scheme': 'http',
+        'headers': [(b'authorization', f'Bearer {token}'.encode())],
+        'server': ('bench', 80), 'client': ('127.0.0.1', 0),
+    }
+
+
+async def run_asgi_round(application, token, streams, args):
+    stream_inboxes = []
+    stream_tasks = []
+    for _ in range(streams):
+        inbox = asyncio.Queue()
+        inbox.put_nowait({'type': 'http.request', 'body': b'', 'more_body': False})
+        stream_inboxes.append(inbox)
+        stream_tasks.append(asyncio.ensure_future(
+            call(application, http_scope('/api/events/stream', '', token), inbox)))
+
+    async def close_streams():
+        await asyncio.sleep(args.hold)
+        for inbox in stream_inboxes:
+            inbox.put_nowait({'type': 'http.disconnect'})
+
+    closer = asyncio.ensure_future(close_streams())
+    samples, failures = [], [0]
+    per_client = args.requests // args.concurrency
+
+    async def client_loop():
+        for _ in range(per_client):
+            inbox = asyncio.Queue()
+            inbox.put_nowait({'type': 'http.request', 'body': b'', 'more_body': False})
+            started = time.perf_counter()
+            sent = await call(application, http_scope('/api/tickets', 'limit=50', token), inbox)
+            samples.append(time.perf_counter() - started)
+            if sent[0]['status'] != 200:
+                failures[0] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    closer.cancel()
+    for inbox in stream_inboxes:
+        inbox.put_nowait({'type': 'http.disconnect'})
+    await asyncio.gather(*stream_tasks)
+    report('asgi', streams, samples, elapsed, failures[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--streams', type=int, nargs='+', default=[0, 8, 32])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--hold', type=float, default=5.0,
+                        help='Seconds event streams stay open')
+    parser.add_argument('--tickets', type=int, default=1000)
+    args = parser.parse_args()
+
+    app_module = load_app()
+    app = app_module.app
+    # Idle streams wake up this often, which bounds how late a WSGI stream
+    # notices it should close
+    app.config['SSE_HEARTBEAT_SECONDS'] = 1
+    import asgi
+
+    user_id = create_user(app_module, 'bench_serving')
+    seed_tickets(app_module, own_board(app_module, user_id), args.tickets)
+    headers = auth_headers(app_module, user_id)
+    token = headers['Authorization'].split(' ', 1)[1]
+    application = asgi.KanbanASGI(app, app_module.event_bus, threads=args.threads)
+
+    print(f"{'mode':>5} {'streams':>8} {'requests':>9} {'errors':>7} {'req/s':>9} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for streams in args.streams:
+        run_wsgi(app, headers, streams, args)
+        asyncio.run(run_asgi_round(application, token, streams, args))
+
+
+if __name__ == '__main__':
+    main()
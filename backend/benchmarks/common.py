@@ -0,0 +1,187 @@
+"""
+Shared helpers for the backend benchmark scripts.
+
+Benchmarks run offline against a throwaway SQLite file by default. Set
+DATABASE_URL to point them at a local MySQL instance instead.
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_app(database_url=None, backend_dir=BACKEND_DIR):
+    """Import the Flask app bound to a benchmark database.
+
+    backend_dir can point at another checkout's backend, for example a git
+    worktree of an older commit, to benchmark that version of the app.
+    """
+    if database_url is None:
+        database_url = os.getenv('BENCH_DATABASE_URL')
+    if database_url is None:
+        handle, path = tempfile.mkstemp(prefix='kanban-bench-', suffix='.db')
+        os.close(handle)
+        database_url = f'sqlite:///{path}'
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-secret-key-with-enough-bytes')
+    # Every simulated user shares one address; measure the app, not the limiter
+    os.environ.setdefault('RATE_LIMIT_STORE', 'off')
+    backend_dir = os.path.abspath(backend_dir)
+    if backend_dir in sys.path:
+        sys.path.remove(backend_dir)
+    sys.path.insert(0, backend_dir)
+    import app as app_module
+    # Older checkouts set up the database on import
+    if hasattr(app_module, 'init_app'):
+        app_module.init_app()
+    return app_module
+
+
+def create_user(app_module, username):
+    """Insert a user and their own board directly (skipping bcrypt) and return the user's id."""
+    with app_module.app.app_context():
+        user = app_module.User(username=username, email=f'{username}@bench.local', password_hash='x')
+        app_module.db.session.add(user)
+        app_module.db.session.flush()
+        app_module.add_board(f"{username}'s board", user.id)
+        app_module.db.session.commit()
+        return user.id
+
+
+def create_users(app_module, prefix, count, password_hash='x', batch_size=5000):
+    """Bulk insert count users named prefix_0, prefix_1, ... with their own
+    boards and return the user ids in order."""
+    db, User, Board = app_module.db, app_module.User, app_module.Board
+    with app_module.app.app_context():
+        names = [f'{prefix}_{index}' for index in range(count)]
+        for start in range(0, count, batch_size):
+            db.session.execute(db.insert(User), [
+                {'username': name, 'email': f'{name}@bench.local', 'password_hash': password_hash}
+                for name in names[start:start + batch_size]
+            ])
+        db.session.commit()
+        ids = dict(db.session.execute(
+            db.select(User.username, User.id).where(User.username.startswith(f'{prefix}_', autoescape=True))
+        ).all())
+        user_ids = [ids[name] for name in names]
+        now = datetime.utcnow()
+        for start in range(0, count, batch_size):
+            chunk = user_ids[start:start + batch_size]
+            db.session.execute(db.insert(Board), [
+                {'name': f"{names[start + offset]}'s board", 'owner_id': user_id, 'created_at': now}
+                for offset, user_id in enumerate(chunk)
+            ])
+            boards = db.session.execute(
+                db.select(Board.id, Board.owner_id).where(Board.owner_id.in_(chunk))
+            ).all()
+            db.session.execute(db.insert(app_module.BoardMember), [
+                {'board_id': board_id, 'user_id': owner_id, 'role': 'owner', 'created_at': now}
+                for board_id, owner_id in boards
+            ])
+        db.session.commit()
+        return user_ids
+
+
+def own_board(app_module, user_id):
+    """The id of the board created with the user."""
+    with app_module.app.app_context():
+        return app_module.own_board_id(user_id)
+
+
+def auth_headers(app_module, user_id):
+    with app_module.app.app_context():
+        token = app_module.create_access_token(identity=str(user_id))
+    return {'Authorization': f'Bearer {token}'}
+
+
+def ticket_rows(board_id, count, start=None):
+    """Generate ticket rows spread across statuses, priorities and labels."""
+    start = start or datetime.utcnow() - timedelta(days=365)
+    statuses = ['todo', 'in-progress', 'done', 'done', 'done']
+    priorities = ['low', 'medium', 'high']
+    labels = [['backend'], ['frontend', 'ui'], ['bug'], []]
+    for i in range(count):
+        timestamp = start + timedelta(seconds=i)
+        yield {
+            'id': str(uuid.uuid4()),
+            'title': f'Ticket {i}',
+            'description': f'Benchmark ticket number {i}',
+            'priority': priorities[i % len(priorities)],
+            'status': statuses[i % len(statuses)],
+            'board_id': board_id,
+            'created_at': timestamp,
+            'updated_at': timestamp,
+        }, labels[i % len(labels)]
+
+
+def seed_tickets(app_module, board_id, count, batch_size=5000, rebuild_counts=True):
+    """Bulk insert benchmark tickets (and their labels and creation history) on a board.
+
+    When seeding many boards, pass rebuild_counts=False and call
+    rebuild_ticket_counts() once at the end. History rollups are not
+    updated; call rebuild_history_rollups() when a benchmark reads them.
+    """
+    db = app_module.db
+    with app_module.app.app_context():
+        label_ids = {}
+        tickets, links = [], []
+        # Each status's new tickets go below its existing ones, oldest first
+        ranks = {status: app_module.neighbour_rank(board_id, status, below=False)
+                 for status in app_module.VALID_STATUSES}
+
+        def flush():
+            db.session.execute(db.insert(app_module.Ticket), tickets)
+            # Creation transitions, so lead times of tickets moved later are recorded
+            db.session.execute(db.insert(app_module.TicketTransition), [
+                {'board_id': board_id, 'ticket_id': ticket['id'], 'field': 'status', 'old_value': None,
+                 'new_value': ticket['status'], 'occurred_at': ticket['created_at']}
+                for ticket in tickets
+            ])
+            if links:
+                db.session.execute(db.insert(app_module.TicketLabel), links)
+            tickets.clear()
+            links.clear()
+
+        for row, names in ticket_rows(board_id, count):
+            row['rank'] = ranks[row['status']] = app_module.key_between(ranks[row['status']], None)
+            tickets.append(row)
+            for position, name in enumerate(names):
+                if name not in label_ids:
+                    label = app_module.Label(board_id=board_id, name=name)
+                    db.session.add(label)
+                    db.session.flush()
+                    label_ids[name] = label.id
+                links.append({'ticket_id': row['id'], 'label_id': label_ids[name], 'position': position})
+            if len(tickets) >= batch_size:
+                flush()
+        if tickets:
+            flush()
+        if rebuild_counts:
+            app_module.rebuild_ticket_counts()
+        else:
+            db.session.commit()
+
+
+def percentile(sorted_samples, fraction):
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * fraction))]
+
+
+def measure(fn, repeat=20):
+    """Call fn repeatedly and return latency stats in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'p50': statistics.median(samples),
+        'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'max': samples[-1],
+    }
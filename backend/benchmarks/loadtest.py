@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Load-test the API with a reproducible mixed workload and compare runs.
+
+`run` seeds users and tickets, then drives a weighted mix of board loads,
+creates, drag-moves, deletes and logins from --concurrency threads. It
+reports throughput and p50/p95/p99 latency per endpoint and can save them as
+JSON. Requests go through Flask's test client in-process by default. With
+--url they go over HTTP to a server started with the same DATABASE_URL and
+JWT_SECRET_KEY, so different servers can be compared on the same data.
+`compare` prints the change between two saved runs, for example of two
+commits:
+
+    python benchmarks/loadtest.py run --users 100 --tickets-per-user 1000 --output new.json
+    git worktree add /tmp/kanban-base HEAD~1
+    python benchmarks/loadtest.py run --app-dir /tmp/kanban-base/backend --output base.json
+    python benchmarks/loadtest.py compare base.json new.json
+
+Runs with the same --seed, sizes and mix issue the same sequence of requests
+per thread. Everything runs offline against the benchmark database.
+"""
+
+import argparse
+import http.client
+import json
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from common import BACKEND_DIR, auth_headers, create_users, load_app, own_board, percentile, seed_tickets
+
+DEFAULT_MIX = 'board=40,move=25,create=15,delete=10,login=10'
+PASSWORD = 'loadtest-password'
+POOL_SIZE = 200  # known ticket ids kept per user for moves and deletes
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation {name!r}; use {', '.join(OPERATIONS)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+class InProcessClient:
+    """Sends requests through the app's WSGI test client."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None, headers=None):
+        response = self.client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, response.get_data()
+
+
+class HTTPClient:
+    """Sends requests to a running server over one keep-alive connection."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.connection = None
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            try:
+                self.connection.request(method, self.prefix + path, payload, headers)
+                response = self.connection.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, ConnectionError):
+                # The server closed an idle keep-alive connection: reconnect once
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    raise
+
+
+class Workload:
+    """The seeded users plus the ticket ids each one is known to own."""
+
+    def __init__(self, users, pools, seed):
+        self.users = users  # [(user_id, username, headers)]
+        self.pools = pools  # {user_id: [ticket ids]}
+        self.created = {user_id: [] for user_id, _, _ in users}
+        self.lock = threading.Lock()
+        self.seed = seed
+
+    def pick_ticket(self, rng, user_id, exclude=None):
+        with self.lock:
+            pool = self.pools[user_id]
+            if not pool:
+                return None
+            ticket_id = rng.choice(pool)
+            if ticket_id == exclude and len(pool) > 1:
+                ticket_id = pool[(pool.index(ticket_id) + 1) % len(pool)]
+            return ticket_id
+
+    def add_ticket(self, user_id, ticket_id):
+        with self.lock:
+            self.pools[user_id].append(ticket_id)
+            self.created[user_id].append(ticket_id)
+
+    def take_ticket_to_delete(self, rng, user_id):
+        """Prefer tickets this run created, so the board keeps its seeded size."""
+        with self.lock:
+            pool = self.created[user_id] or self.pools[user_id]
+            if not pool:
+                return None
+            ticket_id = pool.pop(rng.randrange(len(pool)))
+            for other in (self.created[user_id], self.pools[user_id]):
+                if ticket_id in other:
+                    other.remove(ticket_id)
+            return ticket_id
+
+
+def op_board(client, workload, rng, user):
+    user_id, _, headers = user
+    return client.request('GET', '/api/board/summary?sort=rank&limit=50', headers=headers)[0]
+
+
+def op_create(client, workload, rng, user):
+    user_id, _, headers = user
+    status, body = client.request('POST', '/api/tickets', {
+        'title': f'Load test ticket {rng.randrange(10 ** 6)}',
+        'description': 'Created by the load-test harness',
+        'priority': rng.choice(['low', 'medium', 'high']),
+        'labels': rng.choice([[], ['backend'], ['frontend', 'ui']]),
+    }, headers)
+    if status == 201:
+        workload.add_ticket(user_id, json.loads(body)['ticket']['id'])
+    return status
+
+
+def op_move(client, workload, rng, user):
+    user_id, _, headers = user
+    ticket_id = workload.pick_ticket(rng, user_id)
+    anchor = workload.pick_ticket(rng, user_id, exclude=ticket_id)
+    if ticket_id is None or anchor == ticket_id:
+        return None
+    # Dropping below the anchor moves the card into the anchor's column
+    return client.request('POST', f'/api/tickets/{ticket_id}/move', {'after_id': anchor}, headers)[0]
+
+
+def op_delete(client, workload, rng, user):
+    user_id, _, headers = user
+    ticket_id = workload.take_ticket_to_delete(rng, user_id)
+    if ticket_id is None:
+        return None
+    return client.request('DELETE', f'/api/tickets/{ticket_id}', headers=headers)[0]
+
+
+def op_login(client, workload, rng, user):
+    _, username, _ = user
+    return client.request('POST', '/api/login', {'username': username, 'password': PASSWORD})[0]
+
+
+OPERATIONS = {
+    'board': op_board,
+    'create': op_create,
+    'move': op_move,
+    'delete': op_delete,
+    'login': op_login,
+}
+
+
+def seed(app_module, args):
+    """Create the users and tickets, returning the Workload to drive."""
+    started = time.perf_counter()
+    with app_module.app.app_context():
+        password_hash = app_module.password_hasher.hash(PASSWORD)
+    user_ids = create_users(app_module, args.prefix, args.users, password_hash)
+    boards = {user_id: own_board(app_module, user_id) for user_id in user_ids}
+    for index, user_id in enumerate(user_ids, 1):
+        seed_tickets(app_module, boards[user_id], args.tickets_per_user, rebuild_counts=False)
+        if index % 100 == 0 or index == len(user_ids):
+            print(f"  seeded {index}/{len(user_ids)} users ({index * args.tickets_per_user} tickets)",
+                  file=sys.stderr)
+    db, Ticket = app_module.db, app_module.Ticket
+    with app_module.app.app_context():
+        app_module.rebuild_ticket_counts()
+        pools = {
+            user_id: db.session.execute(
+                db.select(Ticket.id).where(Ticket.board_id == boards[user_id]).order_by(Ticket.id).limit(POOL_SIZE)
+            ).scalars().all()
+            for user_id in user_ids
+        }
+    users = [(user_id, f'{args.prefix}_{index}', auth_headers(app_module, user_id))
+             for index, user_id in enumerate(user_ids)]
+    return Workload(users, pools, args.seed), time.perf_counter() - started
+
+
+def drive(make_client, workload, mix, args):
+    """Run the workload from args.concurrency threads.
+
+    Returns ({op: [(seconds, status)]}, elapsed seconds of the measured part).
+    Connection failures are recorded as status 599.
+    """
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    per_thread = -(-args.requests // args.concurrency)
+    warmup = -(-args.warmup // args.concurrency)
+    results = {name: [] for name in names}
+    results_lock = threading.Lock()
+    start_gate = threading.Barrier(args.concurrency + 1)
+
+    def worker(index):
+        rng = random.Random(f'{workload.seed}:{index}')
+        client = make_client()
+        samples = {name: [] for name in names}
+
+        def step(record):
+            name = rng.choices(names, weights)[0]
+            user = rng.choice(workload.users)
+            started = time.perf_counter()
+            try:
+                status = OPERATIONS[name](client, workload, rng, user)
+            except (OSError, http.client.HTTPException):
+                status = 599
+            if record and status is not None:
+                samples[name].append((time.perf_counter() - started, status))
+
+        for _ in range(warmup):
+            step(False)
+        start_gate.wait()
+        if args.duration:
+            deadline = time.perf_counter() + args.duration
+            while time.perf_counter() < deadline:
+                step(True)
+        else:
+            for _ in range(per_thread):
+                step(True)
+        with results_lock:
+            for name, values in samples.items():
+                results[name].extend(values)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    start_gate.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - started
+
+
+def summarize(results, elapsed):
+    summary = {}
+    every = []
+    for name, samples in results.items():
+        every.extend(samples)
+        summary[name] = summarize_samples(samples, elapsed)
+    summary['all'] = summarize_samples(every, elapsed)
+    return summary
+
+
+def summarize_samples(samples, elapsed):
+    latencies = sorted(seconds * 1000 for seconds, _ in samples)
+    statuses = {}
+    for _, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    if not latencies:
+        return {'requests': 0, 'errors': 0, 'throughput': 0.0, 'statuses': statuses}
+    return {
+        'requests': len(latencies),
+        'errors': sum(count for status, count in statuses.items() if int(status) >= 400),
+        'throughput': round(len(latencies) / elapsed, 2),
+        'p50': round(percentile(latencies, 0.50), 3),
+        'p95': round(percentile(latencies, 0.95), 3),
+        'p99': round(percentile(latencies, 0.99), 3),
+        'max': round(latencies[-1], 3),
+        'statuses': statuses,
+    }
+
+
+def git_revision(path):
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=path, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_summary(summary):
+    print(f"{'endpoint':>8} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8}")
+    for name, stats in summary.items():
+        if not stats['requests']:
+            continue
+        print(f"{name:>8} {stats['requests']:>9} {stats['errors']:>7} {stats['throughput']:>8.1f} "
+              f"{stats['p50']:>8.1f} {stats['p95']:>8.1f} {stats['p99']:>8.1f} {stats['max']:>8.1f}")
+
+
+def run(args):
+    app_module = load_app(backend_dir=args.app_dir)
+    database_url = app_module.app.config['SQLALCHEMY_DATABASE_URI']
+    print(f"seeding {args.users} users x {args.tickets_per_user} tickets into {database_url}", file=sys.stderr)
+    workload, seed_seconds = seed(app_module, args)
+
+    if args.url:
+        make_client = lambda: HTTPClient(args.url)
+        target = args.url
+    else:
+        make_client = lambda: InProcessClient(app_module.app)
+        target = 'in-process'
+    mix = parse_mix(args.mix)
+    print(f"seeded in {seed_seconds:.1f}s; driving {target} with {args.concurrency} threads, mix {args.mix}",
+          file=sys.stderr)
+    results, elapsed = drive(make_client, workload, mix, args)
+    summary = summarize(results, elapsed)
+    print_summary(summary)
+
+    if args.output:
+        report = {
+            'label': args.label or git_revision(args.app_dir),
+            'revision': git_revision(args.app_dir),
+            'recorded_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'database': database_url.split(':', 1)[0],
+            'target': target,
+            'settings': {key: value for key, value in vars(args).items() if key not in ('func', 'output')},
+            'seconds': round(elapsed, 3),
+            'seed_seconds': round(seed_seconds, 3),
+            'endpoints': summary,
+        }
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+        print(f"saved {args.output}", file=sys.stderr)
+
+
+def change(old, new):
+    if not old:
+        return '      n/a'
+    return f'{(new - old) / old * 100:>+8.1f}%'
+
+
+def compare(args):
+    with open(args.baseline, encoding='utf-8') as baseline_file, open(args.candidate, encoding='utf-8') as candidate_file:
+        baseline, candidate = json.load(baseline_file), json.load(candidate_file)
+    print(f"baseline:  {baseline['label']} ({baseline['recorded_at']})")
+    print(f"candidate: {candidate['label']} ({candidate['recorded_at']})")
+    if baseline['settings'].get('users') != candidate['settings'].get('users') \
+            or baseline['settings'].get('tickets_per_user') != candidate['settings'].get('tickets_per_user') \
+            or baseline['settings'].get('mix') != candidate['settings'].get('mix'):
+        print("warning: the runs used different sizes or mixes", file=sys.stderr)
+    print(f"{'endpoint':>8} {'metric':>7} {'baseline':>9} {'candidate':>10} {'change':>9}")
+    for name, old in baseline['endpoints'].items():
+        new = candidate['endpoints'].get(name)
+        if not new or not old['requests'] or not new['requests']:
+            continue
+        for metric in ('throughput', 'p50', 'p95', 'p99'):
+            print(f"{name:>8} {metric:>7} {old[metric]:>9.1f} {new[metric]:>10.1f} {change(old[metric], new[metric])}")
+        if old['errors'] or new['errors']:
+            print(f"{name:>8} {'errors':>7} {old['errors']:>9} {new['errors']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='seed a database and drive the workload')
+    run_parser.add_argument('--users', type=int, default=100)
+    run_parser.add_argument('--tickets-per-user', type=int, default=1000)
+    run_parser.add_argument('--requests', type=int, default=2000, help='measured requests across all threads')
+    run_parser.add_argument('--duration', type=float, help='run for this many seconds instead of --requests')
+    run_parser.add_argument('--warmup', type=int, default=100, help='unmeasured requests before timing starts')
+    run_parser.add_argument('--concurrency', type=int, default=8)
+    run_parser.add_argument('--mix', default=DEFAULT_MIX, help=f'operation weights (default {DEFAULT_MIX})')
+    run_parser.add_argument('--seed', type=int, default=1)
+    run_parser.add_argument('--prefix', default='load', help='username prefix for seeded users')
+    run_parser.add_argument('--url', help='drive a running server instead of the in-process app')
+    run_parser.add_argument('--app-dir', default=BACKEND_DIR, help='backend directory of the app to test')
+    run_parser.add_argument('--label', help='name for this run in saved results (default: git revision)')
+    run_parser.add_argument('--output', help='save results as JSON')
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser('compare', help='compare two saved runs')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        parse_mix(args.mix)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
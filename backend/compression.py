@@ -0,0 +1,61 @@
+"""
+Negotiated response compression.
+
+Responses at least min_size bytes long are compressed with the best coding
+the client accepts: brotli when the brotli package is installed, gzip
+otherwise. Streamed responses are left alone; they either compress
+themselves (the export) or must reach the client unbuffered (event streams).
+
+Compressing changes the bytes but not the content, so a strong ETag is
+marked weak, as nginx does. If-None-Match revalidation compares weakly and
+keeps working; callers checking If-Match should accept the weak form too.
+"""
+
+import gzip
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+SKIPPED_STATUSES = (204, 206, 304)
+
+
+def available_codings():
+    """Codings this process can produce, most preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+class ResponseCompressor:
+
+    def __init__(self, min_size=1024, gzip_level=6, brotli_quality=4):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        # Dynamic content: brotli's default quality (11) costs ~50x the CPU of 4
+        self.brotli_quality = brotli_quality
+
+    def encode(self, data, coding):
+        if coding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+    def compress(self, request, response):
+        """Compress response in place when worthwhile; returns the response."""
+        if (response.is_streamed or response.direct_passthrough
+                or response.status_code < 200 or response.status_code in SKIPPED_STATUSES
+                or 'Content-Encoding' in response.headers or request.method == 'HEAD'):
+            return response
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+        # Caches must keep encodings apart even when this client gets identity
+        response.vary.add('Accept-Encoding')
+        coding = request.accept_encodings.best_match(available_codings())
+        if coding is None:
+            return response
+        response.set_data(self.encode(data, coding))
+        response.headers['Content-Encoding'] = coding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
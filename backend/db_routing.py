@@ -0,0 +1,70 @@
+"""
+Engine pool settings and read-replica routing for Flask-SQLAlchemy.
+
+Replicas are configured as extra binds named replica_0, replica_1, ...
+RoutingSession sends a session's queries to one of them once the session is
+marked with session.info['replica'] = True, as long as it has no pending
+writes. Everything else, including every flush, goes to the primary.
+"""
+
+import random
+
+from flask_sqlalchemy.session import Session
+from sqlalchemy.engine import make_url
+
+REPLICA_PREFIX = 'replica_'
+
+
+def engine_options(url, pool_size=10, max_overflow=20, pool_recycle=1800, pool_pre_ping=True,
+                   pool_timeout=30, statement_timeout_ms=0):
+    """Build create_engine() keyword arguments suited to the database behind url.
+
+    SQLite gets no pool sizing (Flask-SQLAlchemy picks its pool) and has no
+    statement timeout. The timeout uses max_execution_time on MySQL, which
+    only limits SELECTs, and statement_timeout on PostgreSQL.
+    """
+    url = make_url(url)
+    backend, _, driver = url.drivername.partition('+')
+    if backend == 'sqlite':
+        return {}
+
+    options = {
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_recycle': pool_recycle,
+        'pool_pre_ping': pool_pre_ping,
+        'pool_timeout': pool_timeout,
+    }
+    if statement_timeout_ms:
+        if backend == 'mysql' and driver in ('', 'pymysql', 'mysqldb'):
+            options['connect_args'] = {'init_command': f'SET SESSION max_execution_time={int(statement_timeout_ms)}'}
+        elif backend == 'postgresql':
+            options['connect_args'] = {'options': f'-c statement_timeout={int(statement_timeout_ms)}'}
+    return options
+
+
+def replica_binds(urls, **pool_options):
+    """Return SQLALCHEMY_BINDS entries for a list of replica URLs."""
+    return {
+        f'{REPLICA_PREFIX}{index}': dict(engine_options(url, **pool_options), url=url)
+        for index, url in enumerate(urls)
+    }
+
+
+class RoutingSession(Session):
+
+    def replica_engines(self):
+        return [engine for key, engine in self._db.engines.items()
+                if key is not None and key.startswith(REPLICA_PREFIX)]
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get('replica') and not self._flushing \
+                and not (self.new or self.dirty or self.deleted):
+            # Stay on one replica for the whole session so its reads are consistent
+            engine = self.info.get('replica_engine')
+            if engine is None:
+                replicas = self.replica_engines()
+                engine = self.info['replica_engine'] = random.choice(replicas) if replicas else False
+            if engine:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -0,0 +1,241 @@
+"""
+Publish/subscribe bus for real-time board events.
+
+InProcessEventBus fans events out to subscribers in the same process, which
+is all a single worker needs. RedisEventBus relays events through Redis
+pub/sub so every worker sees every event, and fans them out locally with an
+InProcessEventBus. FakeRedisPubSub implements the small part of the redis-py
+API the bus uses, so multi-worker behaviour can be exercised without a server.
+
+Each subscriber gets a bounded queue. A subscriber that falls a full queue
+behind is dropped rather than allowed to hold events in memory; it is
+expected to reconnect and catch up through delta sync.
+"""
+
+import asyncio
+import fnmatch
+import json
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 100
+
+
+class SlowConsumerError(Exception):
+    """Raised to a subscriber that was dropped for letting its queue fill up."""
+
+
+class Subscription:
+
+    def __init__(self, bus, channel, max_queue):
+        self.bus = bus
+        self.channel = channel
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = False
+
+    def get(self, timeout=None):
+        """Return the next event, or None if none arrives within timeout."""
+        if self.dropped:
+            raise SlowConsumerError(self.channel)
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            if self.dropped:
+                raise SlowConsumerError(self.channel)
+            return None
+
+    def deliver(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped = True
+            self.close()
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class AsyncSubscription(Subscription):
+    """A subscription read from an asyncio event loop instead of a thread.
+
+    Publishers call deliver() from any thread; events are handed to the loop
+    that created the subscription, so a waiting stream holds no thread.
+    """
+
+    def __init__(self, bus, channel, max_queue):
+        self.bus = bus
+        self.channel = channel
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = False
+        self.loop = asyncio.get_running_loop()
+
+    async def get(self, timeout=None):
+        """Return the next event, or None if none arrives within timeout."""
+        if self.dropped:
+            raise SlowConsumerError(self.channel)
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            if self.dropped:
+                raise SlowConsumerError(self.channel)
+            return None
+
+    def deliver(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:  # the loop has shut down
+            self.close()
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped = True
+            self.close()
+
+
+class InProcessEventBus:
+
+    def __init__(self, max_queue=DEFAULT_QUEUE_SIZE):
+        self.max_queue = max_queue
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel, subscription_class=Subscription):
+        subscription = subscription_class(self, channel, self.max_queue)
+        with self._lock:
+            self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._channels.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._channels[subscription.channel]
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._channels.get(channel, ()))
+            return sum(len(subscribers) for subscribers in self._channels.values())
+
+
+class RedisEventBus:
+    """Relay events between workers over Redis pub/sub.
+
+    A single background thread per worker listens on the key prefix and
+    hands messages to the local bus, so idle SSE clients cost no Redis
+    connections of their own. It starts with the first subscription, so a
+    bus built before a server forks its workers leaves each its own thread.
+    """
+
+    def __init__(self, client, prefix='kanban:', max_queue=DEFAULT_QUEUE_SIZE, reconnect_delay=1.0):
+        self.client = client
+        self.prefix = prefix
+        self.local = InProcessEventBus(max_queue)
+        self.reconnect_delay = reconnect_delay
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    def subscribe(self, channel, subscription_class=Subscription):
+        if self._listener is None:
+            with self._listener_lock:
+                if self._listener is None:
+                    self._listener = threading.Thread(target=self._listen, name='event-bus-listener', daemon=True)
+                    self._listener.start()
+        return self.local.subscribe(channel, subscription_class)
+
+    def unsubscribe(self, subscription):
+        self.local.unsubscribe(subscription)
+
+    def publish(self, channel, event):
+        self.client.publish(self.prefix + channel, json.dumps(event))
+
+    def subscriber_count(self, channel=None):
+        return self.local.subscriber_count(channel)
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(self.prefix + '*')
+                for message in pubsub.listen():
+                    if message['type'] not in ('message', 'pmessage'):
+                        continue
+                    channel = _text(message['channel'])[len(self.prefix):]
+                    self.local.publish(channel, json.loads(_text(message['data'])))
+            except Exception:
+                logger.exception('Event bus listener failed; reconnecting')
+                time.sleep(self.reconnect_delay)
+
+
+class FakeRedisPubSub:
+    """In-memory stand-in for the redis-py client's publish/pubsub API."""
+
+    def __init__(self):
+        self._pubsubs = []
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        with self._lock:
+            pubsubs = list(self._pubsubs)
+        receivers = 0
+        for pubsub in pubsubs:
+            receivers += pubsub._receive(channel, message)
+        return receivers
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        pubsub = _FakeSubscription()
+        with self._lock:
+            self._pubsubs.append(pubsub)
+        return pubsub
+
+
+class _FakeSubscription:
+
+    def __init__(self):
+        self._patterns = []
+        self._messages = queue.Queue()
+
+    def psubscribe(self, *patterns):
+        self._patterns.extend(patterns)
+
+    def _receive(self, channel, message):
+        for pattern in self._patterns:
+            if fnmatch.fnmatchcase(channel, pattern):
+                self._messages.put({'type': 'pmessage', 'pattern': pattern.encode(),
+                                    'channel': channel.encode(), 'data': message.encode()})
+                return 1
+        return 0
+
+    def listen(self):
+        while True:
+            yield self._messages.get()
+
+
+def create_event_bus(kind='memory', redis_url=None, max_queue=DEFAULT_QUEUE_SIZE):
+    """Build the bus named by kind: memory, redis, or fake-redis."""
+    if kind == 'memory':
+        return InProcessEventBus(max_queue)
+    if kind == 'fake-redis':
+        return RedisEventBus(FakeRedisPubSub(), max_queue=max_queue)
+    if kind == 'redis':
+        import redis  # optional dependency, only needed for multi-worker deployments
+        return RedisEventBus(redis.Redis.from_url(redis_url), max_queue=max_queue)
+    raise ValueError(f'Unknown event bus: {kind}')
+
+
+def _text(value):
+    return value.decode('utf-8') if isinstance(value, bytes) else value
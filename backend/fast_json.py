@@ -0,0 +1,54 @@
+"""
+Drop-in Flask JSON provider that encodes responses with orjson when it is
+installed, falling back to the standard library otherwise.
+
+Responses stay byte-for-byte identical to Flask's default provider: orjson
+is only used for compact, key-sorted output, and its result is discarded in
+favour of json.dumps whenever the two could differ (non-ASCII text, which
+the stdlib escapes, or types orjson refuses). Floats are not part of this
+API's payloads; orjson writes exponents as "1e16" where the stdlib writes
+"1e+16".
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+COMPACT_SEPARATORS = (',', ':')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+
+    @property
+    def backend(self):
+        return 'orjson' if orjson is not None else 'stdlib'
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and self._matches_orjson(kwargs):
+            try:
+                encoded = orjson.dumps(
+                    obj,
+                    default=self.default,
+                    option=orjson.OPT_SORT_KEYS
+                    | orjson.OPT_PASSTHROUGH_DATETIME
+                    | orjson.OPT_PASSTHROUGH_DATACLASS,
+                )
+            except TypeError:
+                pass
+            else:
+                # The stdlib escapes everything outside printable ASCII, DEL included
+                if encoded.isascii() and b'\x7f' not in encoded:
+                    return encoded.decode('ascii')
+        return super().dumps(obj, **kwargs)
+
+    def _matches_orjson(self, kwargs):
+        """orjson can only reproduce compact, sorted, ASCII-escaped output."""
+        return (
+            kwargs.keys() == {'separators'}
+            and tuple(kwargs['separators']) == COMPACT_SEPARATORS
+            and self.sort_keys
+            and self.ensure_ascii
+        )
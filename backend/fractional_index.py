@@ -0,0 +1,153 @@
+"""
+Lexicographic fractional indexing for manual card order.
+
+A key is an integer part followed by an optional fraction. The first
+character of the integer part says how many digits follow it, so keys
+compare correctly as plain strings while the integer part still grows in
+length only logarithmically as cards are added to either end. Moving a card
+between two neighbours takes the midpoint of their keys, which only grows
+when the same gap is split again and again; those columns get rebalanced.
+
+Keys use the lower-case base-36 digits 0-9a-z, which sort the same under
+binary and case-insensitive collations. Keys never end in '0', so there is
+always room for another key between any two.
+"""
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+# Heads from 'i' up hold non-negative integers of 1, 2, 3... digits; heads
+# from 'h' down hold negative ones, so 'h' + 'z' sorts just below 'i' + '0'
+POSITIVE_HEAD = DIGITS.index('i')
+INTEGER_ZERO = 'i0'
+SMALLEST_INTEGER = '0' * (POSITIVE_HEAD + 1)
+
+
+def integer_length(head):
+    index = DIGITS.index(head)
+    return index - POSITIVE_HEAD + 2 if index >= POSITIVE_HEAD else POSITIVE_HEAD - index + 1
+
+
+def split_key(key):
+    """Return (integer part, fraction) of a key, or raise ValueError."""
+    if not key or any(char not in DIGITS for char in key):
+        raise ValueError(f'Invalid order key: {key!r}')
+    length = integer_length(key[0])
+    integer, fraction = key[:length], key[length:]
+    if len(integer) < length or integer == SMALLEST_INTEGER and not fraction or fraction.endswith('0'):
+        raise ValueError(f'Invalid order key: {key!r}')
+    return integer, fraction
+
+
+def increment_integer(integer):
+    head, digits = integer[0], list(integer[1:])
+    for index in range(len(digits) - 1, -1, -1):
+        value = DIGITS.index(digits[index]) + 1
+        if value < BASE:
+            digits[index] = DIGITS[value]
+            return head + ''.join(digits)
+        digits[index] = DIGITS[0]
+    # Every digit carried: move to the next head
+    if head == DIGITS[-1]:
+        return None
+    if head == DIGITS[POSITIVE_HEAD - 1]:
+        return INTEGER_ZERO
+    head = DIGITS[DIGITS.index(head) + 1]
+    if DIGITS.index(head) > POSITIVE_HEAD:
+        digits.append(DIGITS[0])
+    else:
+        digits.pop()
+    return head + ''.join(digits)
+
+
+def decrement_integer(integer):
+    head, digits = integer[0], list(integer[1:])
+    for index in range(len(digits) - 1, -1, -1):
+        value = DIGITS.index(digits[index]) - 1
+        if value >= 0:
+            digits[index] = DIGITS[value]
+            return head + ''.join(digits)
+        digits[index] = DIGITS[-1]
+    # Every digit borrowed: move to the previous head
+    if head == DIGITS[0]:
+        return None
+    if head == DIGITS[POSITIVE_HEAD]:
+        return DIGITS[POSITIVE_HEAD - 1] + DIGITS[-1]
+    head = DIGITS[DIGITS.index(head) - 1]
+    if DIGITS.index(head) < POSITIVE_HEAD - 1:
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return head + ''.join(digits)
+
+
+def midpoint(low, high):
+    """Return a fraction strictly between low and high (None means 1)."""
+    if high is not None:
+        # Keep the shared prefix; the 0 padding of low is implied
+        shared = 0
+        while shared < len(high) and (low[shared] if shared < len(low) else DIGITS[0]) == high[shared]:
+            shared += 1
+        if shared:
+            return high[:shared] + midpoint(low[shared:], high[shared:])
+    low_digit = DIGITS.index(low[0]) if low else 0
+    high_digit = DIGITS.index(high[0]) if high is not None else BASE
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit + 1) // 2]
+    # Adjacent digits: go one digit deeper
+    if high is not None and len(high) > 1:
+        return high[0]
+    return DIGITS[low_digit] + midpoint(low[1:], None)
+
+
+def key_between(low, high):
+    """Return a key that sorts strictly between low and high.
+
+    Either bound may be None, meaning the start or end of the list. Raises
+    ValueError for invalid keys or when low does not sort before high.
+    """
+    if low is not None:
+        low_integer, low_fraction = split_key(low)
+    if high is not None:
+        high_integer, high_fraction = split_key(high)
+    if low is not None and high is not None and low >= high:
+        raise ValueError(f'{low!r} does not sort before {high!r}')
+
+    if low is None and high is None:
+        return INTEGER_ZERO
+    if low is None:
+        if high_integer == SMALLEST_INTEGER:
+            return high_integer + midpoint('', high_fraction)
+        if high_fraction:
+            return high_integer
+        return decrement_integer(high_integer)
+    if high is None:
+        integer = increment_integer(low_integer)
+        return integer if integer is not None else low_integer + midpoint(low_fraction, None)
+    if low_integer == high_integer:
+        return low_integer + midpoint(low_fraction, high_fraction)
+    integer = increment_integer(low_integer)
+    if integer < high:
+        return integer
+    return low_integer + midpoint(low_fraction, None)
+
+
+def keys_between(low, high, count):
+    """Return count ascending keys between low and high, spread out evenly."""
+    if count <= 0:
+        return []
+    if count == 1:
+        return [key_between(low, high)]
+    if high is None:
+        keys = [key_between(low, None)]
+        while len(keys) < count:
+            keys.append(key_between(keys[-1], None))
+        return keys
+    if low is None:
+        keys = [key_between(None, high)]
+        while len(keys) < count:
+            keys.append(key_between(None, keys[-1]))
+        return keys[::-1]
+    middle = count // 2
+    key = key_between(low, high)
+    return keys_between(low, key, middle) + [key] + keys_between(key, high, count - middle - 1)
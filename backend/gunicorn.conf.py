@@ -0,0 +1,60 @@
+"""
+Gunicorn settings for production serving.
+
+SERVER_MODE=asgi (the default) runs asgi:application under uvicorn workers:
+event streams are held on each worker's event loop and the other routes run
+on a bridge pool of ASGI_THREADS threads. SERVER_MODE=wsgi runs the plain
+Flask app on gthread workers, where every open event stream holds one of
+GUNICORN_THREADS threads.
+
+With more than one worker, set EVENT_BUS=redis so a change made through one
+worker reaches streams held by the others.
+
+    pip install -r requirements-server.txt
+    gunicorn -c gunicorn.conf.py
+"""
+
+import logging
+import multiprocessing
+import os
+
+SERVER_MODE = os.getenv('SERVER_MODE', 'asgi')
+
+bind = os.getenv('BIND', '0.0.0.0:5001')
+workers = int(os.getenv('WEB_CONCURRENCY', str(min(multiprocessing.cpu_count() * 2 + 1, 8))))
+# Event streams stay open indefinitely; heartbeats keep them under this
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = 30
+keepalive = 5
+accesslog = '-'
+# Leave query strings out of the access log: event stream URLs carry a
+# stream ticket. This format is gthread's; uvicorn's is filtered below.
+access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(m)s %(U)s %(H)s" %(s)s %(b)s "%(f)s" "%(a)s"'
+# Import the app once in the master and fork the workers from it. Importing
+# connects to nothing and starts no threads; each worker checks the schema
+# and starts its job workers itself, on startup (asgi) or first request (wsgi).
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+
+class StripQueryString(logging.Filter):
+    """Drop the query string from uvicorn's access log lines, whose arguments
+    are client, method, path with query string, HTTP version and status."""
+
+    def filter(self, record):
+        if isinstance(record.args, tuple) and len(record.args) == 5 and isinstance(record.args[2], str):
+            record.args = record.args[:2] + (record.args[2].split('?', 1)[0],) + record.args[3:]
+        return True
+
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'asgi:application'
+    worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'uvicorn.workers.UvicornWorker')
+
+    def post_worker_init(worker):
+        logging.getLogger('uvicorn.access').addFilter(StripQueryString())
+elif SERVER_MODE == 'wsgi':
+    wsgi_app = 'wsgi:application'
+    worker_class = 'gthread'
+    threads = int(os.getenv('GUNICORN_THREADS', '32'))
+else:
+    raise ValueError("SERVER_MODE must be 'asgi' or 'wsgi'")
@@ -0,0 +1,255 @@
+"""
+Database-backed job queue for work that should not hold up a request.
+
+Handlers enqueue a job in their own transaction, so a job exists exactly
+when the write that asked for it commits, and return. Workers claim due jobs
+in batches: with SELECT ... FOR UPDATE SKIP LOCKED where the database
+supports it (MySQL 8, PostgreSQL), so workers in any number of processes
+never wait on each other's rows; on SQLite with a single UPDATE ... RETURNING,
+which the database write lock makes atomic.
+
+Delivery is at least once. While a job runs, its worker renews the lease
+every third of the lease period. A worker that dies mid-job stops renewing,
+so the lease expires and another worker runs the job again; tasks must be
+safe to repeat. A failed job is retried with exponential backoff and jitter
+until it runs out of attempts, then kept with status 'failed' and its error.
+Finished jobs are deleted.
+"""
+
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+FAILED = 'failed'
+
+
+def retry_delay(attempts, base, cap):
+    """Seconds to wait before retrying a job that has failed attempts times."""
+    return min(cap, base * 2 ** (attempts - 1)) * random.uniform(0.5, 1.0)
+
+
+class JobQueue:
+    """Enqueues, claims and settles rows of a job model.
+
+    The model needs the columns of app.Job. Tasks are registered by name
+    with the task decorator and called with the job's JSON payload as
+    keyword arguments, inside a fresh app context.
+    """
+
+    def __init__(self, db, model, app, max_attempts=5, retry_base=2.0, retry_max=300.0, lease=300.0):
+        self.db = db
+        self.model = model
+        self.app = app
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease = timedelta(seconds=lease)
+        self.tasks = {}
+        self.on_finish = None  # called with (name, outcome, seconds)
+        # Set after a commit that enqueued jobs, so local workers skip their poll wait
+        self.wake = threading.Event()
+        event.listen(db.session, 'after_commit', self._after_commit)
+
+    def task(self, name):
+        def register(function):
+            self.tasks[name] = function
+            return function
+        return register
+
+    def _after_commit(self, session):
+        if session.info.pop('jobs_enqueued', False):
+            self.wake.set()
+
+    def enqueue(self, name, delay=0, key=None, max_attempts=None, **payload):
+        """Add a job to the current transaction; it runs once that commits.
+
+        With a key, nothing is added while a job with the same key is
+        still waiting to run.
+        """
+        if name not in self.tasks:
+            raise ValueError(f'Unknown task: {name}')
+        Job = self.model
+        session = self.db.session
+        if key is not None and session.execute(
+            self.db.select(Job.id).where(Job.key == key, Job.status == QUEUED).limit(1)
+        ).first() is not None:
+            return None
+        now = datetime.utcnow()
+        job = Job(name=name, key=key, payload=json.dumps(payload), status=QUEUED, attempts=0,
+                  max_attempts=max_attempts or self.max_attempts, run_at=now + timedelta(seconds=delay),
+                  created_at=now)
+        session.add(job)
+        session.info['jobs_enqueued'] = True
+        return job
+
+    def claim(self, worker_id, limit):
+        """Mark up to limit due jobs as running for worker_id and return them."""
+        Job, db = self.model, self.db
+        session = db.session
+        now = datetime.utcnow()
+        due = (Job.status == QUEUED) & (Job.run_at <= now)
+        claimed = {'status': RUNNING, 'locked_by': worker_id, 'locked_at': now, 'attempts': Job.attempts + 1}
+        # Cheap check first, so idle workers never take a write lock
+        if session.execute(db.select(Job.id).where(due).limit(1)).first() is None:
+            session.rollback()
+            return []
+        candidates = db.select(Job.id).where(due).order_by(Job.run_at, Job.id).limit(limit)
+        if db.engine.dialect.name == 'sqlite':
+            ids = session.execute(
+                db.update(Job).where(Job.id.in_(candidates.scalar_subquery()), due).values(claimed)
+                .returning(Job.id)
+            ).scalars().all()
+        else:
+            ids = session.execute(candidates.with_for_update(skip_locked=True)).scalars().all()
+            if ids:
+                session.execute(db.update(Job).where(Job.id.in_(ids)).values(claimed))
+        jobs = session.execute(
+            db.select(Job.id, Job.name, Job.payload, Job.attempts, Job.max_attempts).where(Job.id.in_(ids))
+            .order_by(Job.run_at, Job.id)
+        ).all() if ids else []
+        session.commit()
+        return jobs
+
+    def release_expired(self):
+        """Requeue running jobs whose lease ran out; returns how many."""
+        Job, db = self.model, self.db
+        cutoff = datetime.utcnow() - self.lease
+        expired = (Job.status == RUNNING) & (Job.locked_at < cutoff)
+        result = db.session.execute(
+            db.update(Job).where(expired, Job.attempts < Job.max_attempts)
+            .values(status=QUEUED, locked_by=None, locked_at=None, last_error='Lease expired')
+        )
+        db.session.execute(
+            db.update(Job).where(expired, Job.attempts >= Job.max_attempts)
+            .values(status=FAILED, locked_by=None, last_error='Lease expired')
+        )
+        db.session.commit()
+        return result.rowcount
+
+    def renew(self, job_id, worker_id):
+        """Push back the lease of a job worker_id is running; False once it lost the job."""
+        Job, db = self.model, self.db
+        result = db.session.execute(
+            db.update(Job).where(Job.id == job_id, Job.locked_by == worker_id, Job.status == RUNNING)
+            .values(locked_at=datetime.utcnow())
+        )
+        db.session.commit()
+        return result.rowcount > 0
+
+    def _keep_leased(self, job_id, worker_id, finished):
+        # Runs beside the task, in its own app context and so its own session
+        while not finished.wait(self.lease.total_seconds() / 3):
+            try:
+                with self.app.app_context():
+                    if not self.renew(job_id, worker_id):
+                        return
+            except Exception:
+                logger.exception('Could not renew the lease of job %s', job_id)
+
+    def run(self, job, worker_id):
+        """Run one claimed job and record the outcome; returns 'done', 'retry' or 'failed'."""
+        Job, db = self.model, self.db
+        started = time.perf_counter()
+        finished = threading.Event()
+        renewer = threading.Thread(target=self._keep_leased, args=(job.id, worker_id, finished),
+                                   name=f'job-lease-{job.id}', daemon=True)
+        renewer.start()
+        try:
+            try:
+                with self.app.app_context():
+                    self.tasks[job.name](**json.loads(job.payload))
+            finally:
+                finished.set()
+                renewer.join()
+            outcome = 'done'
+            db.session.execute(db.delete(Job).where(Job.id == job.id, Job.locked_by == worker_id))
+        except Exception:
+            db.session.rollback()
+            error = traceback.format_exc(limit=5)
+            logger.warning('Job %s (%s) failed on attempt %d:\n%s', job.id, job.name, job.attempts, error)
+            if job.attempts >= job.max_attempts:
+                outcome = 'failed'
+                values = {'status': FAILED}
+            else:
+                outcome = 'retry'
+                delay = retry_delay(job.attempts, self.retry_base, self.retry_max)
+                values = {'status': QUEUED, 'run_at': datetime.utcnow() + timedelta(seconds=delay)}
+            db.session.execute(
+                db.update(Job).where(Job.id == job.id, Job.locked_by == worker_id)
+                .values(values | {'locked_by': None, 'locked_at': None, 'last_error': error[-4000:]})
+            )
+        db.session.commit()
+        if self.on_finish is not None:
+            self.on_finish(job.name, outcome, time.perf_counter() - started)
+        return outcome
+
+    def run_pending(self, worker_id='inline', batch_size=100):
+        """Claim and run due jobs until none are left; returns how many ran."""
+        ran = 0
+        with self.app.app_context():
+            while True:
+                jobs = self.claim(worker_id, batch_size)
+                if not jobs:
+                    return ran
+                for job in jobs:
+                    self.run(job, worker_id)
+                ran += len(jobs)
+
+
+class WorkerPool:
+    """Threads that poll a JobQueue and run what they claim."""
+
+    def __init__(self, queue, concurrency=1, poll_interval=1.0, batch_size=10, name=None):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self._stopping = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for index in range(self.concurrency):
+            thread = threading.Thread(target=self._work, args=(f'{self.name}:{index}',),
+                                      name=f'job-worker-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout=None):
+        """Stop claiming new jobs and wait for the current ones to finish."""
+        self._stopping.set()
+        self.queue.wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _work(self, worker_id):
+        polls = 0
+        while not self._stopping.is_set():
+            ran = 0
+            try:
+                with self.queue.app.app_context():
+                    # One worker per pool also recovers jobs from dead workers
+                    if worker_id.endswith(':0') and polls % 60 == 0:
+                        self.queue.release_expired()
+                    for job in self.queue.claim(worker_id, self.batch_size):
+                        self.queue.run(job, worker_id)
+                        ran += 1
+            except Exception:
+                logger.exception('Job worker %s failed to poll', worker_id)
+            polls += 1
+            if not ran:
+                self.queue.wake.wait(self.poll_interval)
+                self.queue.wake.clear()
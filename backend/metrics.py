@@ -0,0 +1,215 @@
+"""
+Per-request instrumentation and Prometheus text exposition.
+
+RequestStats collects what one request spent on SQL (through SQLAlchemy
+engine events, so every engine and bind is covered) and on serialization.
+It lives in a context variable, so statements run by background threads or
+by streamed response bodies after the request finished are not counted.
+
+Metrics are kept per worker process; scrape each worker, or run one worker
+per container, when serving with several.
+"""
+
+import collections
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+current_stats = ContextVar('current_stats', default=None)
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(names, values, extra=()):
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A monotonically increasing count per label combination."""
+
+    kind = 'counter'
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(labels[name] for name in self.labelnames), 0)
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f'{self.name}_total{format_labels(self.labelnames, key)} {format_value(value)}'
+
+
+class Histogram:
+    """Cumulative buckets plus sum and count per label combination."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels):
+        series = self._series.get(tuple(labels[name] for name in self.labelnames))
+        return series[2] if series else 0
+
+    def samples(self):
+        with self._lock:
+            series = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._series.items())
+        for key, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = format_labels(self.labelnames, key, [('le', format_value(float(bound)))])
+                yield f'{self.name}_bucket{labels} {cumulative}'
+            labels = format_labels(self.labelnames, key, [('le', '+Inf')])
+            yield f'{self.name}_bucket{labels} {count}'
+            yield f'{self.name}_sum{format_labels(self.labelnames, key)} {format_value(total)}'
+            yield f'{self.name}_count{format_labels(self.labelnames, key)} {count}'
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name, help, labelnames=()):
+        metric = Counter(name, help, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        metric = Histogram(name, help, labelnames, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+class RequestStats:
+    """What one request spent on SQL and serialization."""
+
+    __slots__ = ('started', 'sql_count', 'sql_time', 'serialization_time', 'statements')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.serialization_time = 0.0
+        self.statements = collections.Counter()
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def repeated_statements(self, threshold):
+        """Statements run at least threshold times, the usual sign of an N+1 query."""
+        return [(statement, count) for statement, count in self.statements.most_common()
+                if count >= threshold]
+
+
+def start_request():
+    stats = RequestStats()
+    return stats, current_stats.set(stats)
+
+
+def finish_request(token):
+    current_stats.reset(token)
+
+
+class timed_serialization:
+    """Context manager adding the time spent in its block to the current request."""
+
+    __slots__ = ('started',)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        stats = current_stats.get()
+        if stats is not None:
+            stats.serialization_time += time.perf_counter() - self.started
+
+
+def time_json_provider(provider):
+    """Count a JSON provider's dumps() as serialization time."""
+    dumps = provider.dumps
+
+    def timed_dumps(obj, **kwargs):
+        with timed_serialization():
+            return dumps(obj, **kwargs)
+
+    provider.dumps = timed_dumps
+    return provider
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and current_stats.get() is not None:
+        context.query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_stats.get()
+    started = getattr(context, 'query_started', None)
+    if stats is not None and started is not None:
+        stats.sql_time += time.perf_counter() - started
+        stats.sql_count += 1
+        stats.statements[statement] += 1
+
+
+def install_sql_listeners():
+    """Time every statement on every engine; safe to call more than once."""
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
@@ -0,0 +1,320 @@
+"""
+Versioned schema migrations.
+
+Each migration is a function registered under an increasing version number.
+The versions applied so far are recorded in the schema_migration table, so
+checking whether a database is current costs one query. Migrations run in
+version order, each recorded as soon as it finishes, so an interrupted
+upgrade resumes where it stopped. Every migration must also be safe to run
+against a database that already has its changes: databases created from
+database/schema.sql or by older releases arrive in many shapes.
+
+Only one process migrates at a time: on MySQL under a named lock
+(GET_LOCK), on SQLite under a lock file next to the database. Whoever
+waited re-reads the version afterwards and finds nothing left to do.
+
+The helpers below change the schema online where the database allows it.
+On MySQL, columns are added with ALGORITHM=INSTANT where possible, and
+indexes are built with ALGORITHM=INPLACE, LOCK=NONE, so the table keeps
+taking reads and writes meanwhile.
+"""
+
+import contextlib
+import logging
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+try:
+    import fcntl
+except ImportError:  # Windows; SQLite migrations are then not serialized between processes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = 'kanban_schema_migration'
+LOCK_TIMEOUT_SECONDS = 600
+
+metadata = sa.MetaData()
+schema_migration = sa.Table(
+    'schema_migration', metadata,
+    sa.Column('version', sa.Integer, primary_key=True, autoincrement=False),
+    sa.Column('description', sa.String(200), nullable=False),
+    sa.Column('applied_at', sa.DateTime, nullable=False),
+)
+
+
+class SchemaOutOfDate(Exception):
+    """Raised when the database is behind the code and may not be migrated here."""
+
+
+class Migrations:
+    """The registered migrations of one application and how to apply them."""
+
+    def __init__(self, db):
+        self.db = db
+        self.steps = {}
+        self.deferrals = {}  # version: condition
+
+    def migration(self, version, description):
+        def register(function):
+            if version in self.steps:
+                raise ValueError(f'Migration {version} is already registered')
+            self.steps[version] = (description, function)
+            return function
+        return register
+
+    def defer(self, versions, condition):
+        """Skip the given migrations while condition() is true.
+
+        For released migrations that call today's code when that code needs
+        a later migration's change first. A skipped migration is recorded as
+        applied, so versions stay in order, and the later migration has to
+        run it itself with run_deferred. The condition has to stay true
+        until then, so that one knows whether it has to.
+        """
+        for version in versions:
+            self.deferrals[version] = condition
+
+    def run_deferred(self, versions):
+        for version in versions:
+            self.steps[version][1]()
+            self.db.session.commit()
+
+    @property
+    def head(self):
+        return max(self.steps, default=0)
+
+    def current_version(self):
+        """The newest applied version, 0 for an empty database; one query."""
+        try:
+            with self.db.engine.connect() as connection:
+                return connection.execute(sa.select(sa.func.max(schema_migration.c.version))).scalar() or 0
+        except (OperationalError, ProgrammingError):  # MySQL reports a missing table as the latter
+            if sa.inspect(self.db.engine).has_table('schema_migration'):
+                raise
+            return 0
+
+    def pending(self, current=None):
+        current = self.current_version() if current is None else current
+        return [(version, self.steps[version][0]) for version in sorted(self.steps) if version > current]
+
+    def upgrade(self, target=None, report=print):
+        """Apply pending migrations up to target (default: all); returns how many ran."""
+        target = self.head if target is None else target
+        with self.lock():
+            metadata.create_all(self.db.engine)
+            applied = 0
+            for version, description in self.pending():
+                if version > target:
+                    break
+                condition = self.deferrals.get(version)
+                if condition is not None and condition():
+                    report(f"⏭️  Migration {version}: {description} (deferred)")
+                else:
+                    report(f"⏳ Migration {version}: {description}")
+                    self.steps[version][1]()
+                self.db.session.commit()
+                with self.db.engine.begin() as connection:
+                    connection.execute(sa.insert(schema_migration).values(
+                        version=version, description=description, applied_at=datetime.utcnow()))
+                applied += 1
+            return applied
+
+    def ensure_current(self, migrate=True):
+        """Check the schema version and, when migrate is set, bring it up to date.
+
+        Raises SchemaOutOfDate when the database is behind and migrate is not
+        set, and when it is ahead: an older release must not write to a
+        schema it doesn't know.
+        """
+        current = self.current_version()
+        if current > self.head:
+            raise SchemaOutOfDate(f'The database is at schema version {current}, newer than this '
+                                  f'release knows ({self.head}); deploy the newer release')
+        if current < self.head:
+            if not migrate:
+                raise SchemaOutOfDate(f'The database is at schema version {current}, this release '
+                                      f'needs {self.head}; run `flask --app app migrate`')
+            self.upgrade()
+        return self.head
+
+    @contextlib.contextmanager
+    def lock(self):
+        engine = self.db.engine
+        if engine.dialect.name == 'mysql':
+            with engine.connect() as connection:
+                if connection.execute(sa.text('SELECT GET_LOCK(:name, :timeout)'),
+                                      {'name': LOCK_NAME, 'timeout': LOCK_TIMEOUT_SECONDS}).scalar() != 1:
+                    raise RuntimeError('Timed out waiting for another process to finish migrating')
+                try:
+                    yield
+                finally:
+                    connection.execute(sa.text('SELECT RELEASE_LOCK(:name)'), {'name': LOCK_NAME})
+        elif engine.dialect.name == 'sqlite' and engine.url.database not in (None, '', ':memory:') \
+                and fcntl is not None:
+            with open(f'{engine.url.database}.migrate.lock', 'w') as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+        else:
+            yield
+
+
+# Online schema change helpers; each takes the engine and is a no-op when the
+# change is already there
+
+def quote(engine, name):
+    return engine.dialect.identifier_preparer.quote(name)
+
+
+def table_names(engine):
+    return set(sa.inspect(engine).get_table_names())
+
+
+def column_names(engine, table):
+    return {column['name'] for column in sa.inspect(engine).get_columns(table)}
+
+
+def index_columns(engine, table):
+    """{index name: (column names, unique)} for the table's indexes."""
+    return {index['name']: (tuple(index['column_names']), bool(index['unique']))
+            for index in sa.inspect(engine).get_indexes(table)}
+
+
+def rename_tables(engine, renames):
+    """Rename tables {old: new}; on MySQL in one atomic statement."""
+    renames = {old: new for old, new in renames.items() if old != new}
+    if not renames:
+        return
+    with engine.begin() as connection:
+        if engine.dialect.name == 'mysql':
+            connection.exec_driver_sql('RENAME TABLE ' + ', '.join(
+                f'{quote(engine, old)} TO {quote(engine, new)}' for old, new in renames.items()))
+        else:
+            for old, new in renames.items():
+                connection.exec_driver_sql(f'ALTER TABLE {quote(engine, old)} RENAME TO {quote(engine, new)}')
+
+
+def rename_column(engine, table, old, new, references=None):
+    """Rename a column, keeping its definition, unless it is renamed already.
+
+    With references ('table.column'), the column's foreign key is pointed
+    there instead of where it pointed before. MySQL swaps it in the same
+    in-place ALTER; SQLite only renames, as it doesn't enforce foreign keys
+    unless asked to and can't change them without rebuilding the table.
+    """
+    columns = column_names(engine, table)
+    if old not in columns or new in columns:
+        return False
+    changes = [f'RENAME COLUMN {quote(engine, old)} TO {quote(engine, new)}']
+    with engine.begin() as connection:
+        if engine.dialect.name == 'mysql':
+            if references is not None:
+                target_table, target_column = references.split('.')
+                changes = [f'DROP FOREIGN KEY {quote(engine, key["name"])}'
+                           for key in sa.inspect(engine).get_foreign_keys(table)
+                           if key['constrained_columns'] == [old]] + changes
+                changes.append(f'ADD CONSTRAINT {quote(engine, f"fk_{table}_{new}")} FOREIGN KEY '
+                               f'({quote(engine, new)}) REFERENCES {quote(engine, target_table)} '
+                               f'({quote(engine, target_column)})')
+            # Unchecked, InnoDB adds the key in place instead of copying the table
+            connection.exec_driver_sql('SET foreign_key_checks = 0')
+            try:
+                connection.exec_driver_sql(f'ALTER TABLE {quote(engine, table)} {", ".join(changes)}, '
+                                           f'ALGORITHM=INPLACE, LOCK=NONE')
+            finally:
+                connection.exec_driver_sql('SET foreign_key_checks = 1')
+        else:
+            connection.exec_driver_sql(f'ALTER TABLE {quote(engine, table)} {changes[0]}')
+    return True
+
+
+def add_column(engine, table, column):
+    """Add a sqlalchemy Column to an existing table, unless it has one by that name."""
+    if column.name in column_names(engine, table):
+        return False
+    ddl = f'ALTER TABLE {quote(engine, table)} ADD COLUMN {quote(engine, column.name)} ' \
+          f'{column.type.compile(engine.dialect)}'
+    if column.server_default is not None:
+        ddl += f' DEFAULT {column.server_default.arg}'
+    with engine.begin() as connection:
+        if engine.dialect.name == 'mysql':
+            try:
+                connection.exec_driver_sql(f'{ddl}, ALGORITHM=INSTANT')
+                return True
+            except OperationalError:  # before MySQL 8.0.12, or a column INSTANT can't add
+                ddl += ', ALGORITHM=INPLACE, LOCK=NONE'
+        connection.exec_driver_sql(ddl)
+    return True
+
+
+def create_index(engine, index):
+    """Build a sqlalchemy Index on its table, unless one by that name exists."""
+    if index.name in index_columns(engine, index.table.name):
+        return False
+    if engine.dialect.name == 'mysql':
+        columns = ', '.join(quote(engine, column.name) for column in index.columns)
+        kind = 'UNIQUE INDEX' if index.unique else 'INDEX'
+        with engine.begin() as connection:
+            connection.exec_driver_sql(f'ALTER TABLE {quote(engine, index.table.name)} ADD {kind} '
+                                       f'{quote(engine, index.name)} ({columns}), ALGORITHM=INPLACE, LOCK=NONE')
+    else:
+        index.create(engine)
+    return True
+
+
+def rename_index(engine, table, old, new):
+    """Rename an index; MySQL does it in place, SQLite rebuilds it under the new name."""
+    existing = index_columns(engine, table)
+    if old not in existing or new in existing:
+        return False
+    columns, unique = existing[old]
+    with engine.begin() as connection:
+        if engine.dialect.name == 'mysql':
+            connection.exec_driver_sql(
+                f'ALTER TABLE {quote(engine, table)} RENAME INDEX {quote(engine, old)} TO {quote(engine, new)}')
+        else:
+            connection.exec_driver_sql(
+                f"CREATE {'UNIQUE ' if unique else ''}INDEX {quote(engine, new)} ON {quote(engine, table)} "
+                f"({', '.join(quote(engine, column) for column in columns)})")
+            connection.exec_driver_sql(f'DROP INDEX {quote(engine, old)}')
+    return True
+
+
+def drop_index(engine, table, name):
+    if name not in index_columns(engine, table):
+        return False
+    with engine.begin() as connection:
+        if engine.dialect.name == 'mysql':
+            connection.exec_driver_sql(f'ALTER TABLE {quote(engine, table)} DROP INDEX {quote(engine, name)}, '
+                                       f'ALGORITHM=INPLACE, LOCK=NONE')
+        else:
+            connection.exec_driver_sql(f'DROP INDEX {quote(engine, name)}')
+    return True
+
+
+def reconcile_indexes(engine, table):
+    """Give the table every index declared on it.
+
+    An undeclared index over the same columns, left by an older schema under
+    another name, is renamed rather than duplicated. Returns the names of
+    the undeclared indexes that remain.
+    """
+    existing = index_columns(engine, table.name)
+    declared = {index.name for index in table.indexes}
+    for index in sorted(table.indexes, key=lambda index: index.name):
+        if index.name in existing or index.dialect_options['mysql'].get('prefix'):
+            continue  # FULLTEXT indexes are only created with their table
+        shape = (tuple(column.name for column in index.columns), bool(index.unique))
+        twin = next((name for name, columns in existing.items()
+                     if name not in declared and columns == shape), None)
+        if twin is not None:
+            rename_index(engine, table.name, twin, index.name)
+        else:
+            create_index(engine, index)
+        existing = index_columns(engine, table.name)
+    return [name for name in existing if name not in declared]
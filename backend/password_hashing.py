@@ -0,0 +1,99 @@
+"""
+Bounded bcrypt hashing off the request path.
+
+Hashing a password takes hundreds of milliseconds by design. PasswordHasher
+runs it on a small dedicated thread pool (bcrypt releases the GIL, so the
+threads hash in parallel) and caps how many hashes may be queued or running
+at once. Requests beyond the cap fail fast with PasswordHasherBusy instead of
+occupying every web worker, so a login burst can't starve ticket traffic.
+
+Hashes are standard bcrypt strings, compatible with Flask-Bcrypt's.
+"""
+
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import bcrypt
+
+DEFAULT_ROUNDS = 12
+# bcrypt reads at most this many bytes of a password and rejects longer ones
+MAX_PASSWORD_BYTES = 72
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full; retry_after is in seconds."""
+
+    def __init__(self, retry_after):
+        super().__init__('Password hashing is at capacity')
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+
+    def __init__(self, rounds=DEFAULT_ROUNDS, workers=None, max_pending=None, timeout=10.0):
+        self.rounds = rounds
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 4
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='password-hash')
+        self._lock = threading.Lock()
+        self._pending = 0
+        # Seconds per hash, smoothed, for the Retry-After estimate
+        self._average_seconds = 0.25
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def hash(self, password):
+        salt = bcrypt.gensalt(self.rounds)
+        return self._run(bcrypt.hashpw, _encode(password), salt).decode('utf-8')
+
+    def verify(self, password, password_hash):
+        try:
+            return self._run(bcrypt.checkpw, _encode(password), _encode(password_hash))
+        except ValueError:  # not a bcrypt hash
+            return False
+
+    def needs_rehash(self, password_hash):
+        """True if the hash was made with a different work factor than configured."""
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def retry_after(self):
+        """Estimate in whole seconds until the current backlog has drained."""
+        backlog = self._pending / self.workers * self._average_seconds
+        return max(1, math.ceil(backlog))
+
+    def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PasswordHasherBusy(self.retry_after())
+            self._pending += 1
+        future = self._executor.submit(self._timed, fn, *args)
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise PasswordHasherBusy(self.retry_after())
+
+    def _timed(self, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self._average_seconds = 0.8 * self._average_seconds + 0.2 * (time.perf_counter() - started)
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+
+
+def _encode(value):
+    return value.encode('utf-8') if isinstance(value, str) else value
@@ -0,0 +1,233 @@
+"""
+Per-client rate limiting and global admission control.
+
+RateLimiter keeps a token bucket per client and rule: a bucket holds up to
+`count` tokens, refills at count per period and each request takes one, so
+a client can burst up to count requests and then sustain the refill rate.
+Buckets live in a MemoryRateLimitStore, per process, or in Redis through
+RedisRateLimitStore, so every worker draws from the same bucket.
+FakeRedisTokenBucket stands in for Redis locally. A store that fails lets requests through:
+losing the limiter must not take the API down with it.
+
+AdmissionController caps how many requests run at once, so a burst queues
+briefly and is then shed with a 503 instead of waiting on an exhausted
+database pool until it times out.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+DEFAULT_RULE = '*'
+
+# KEYS[1] is the bucket; ARGV is rate (tokens/second), burst and cost.
+# Redis' own clock keeps workers on different hosts in agreement.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000))
+return {allowed, tostring(wait)}
+"""
+
+
+def parse_rate(text):
+    """'100/minute' -> (100, 60)."""
+    count, _, period = text.strip().partition('/')
+    if not count.strip().isdigit() or int(count) < 1 or period.strip() not in PERIODS:
+        raise ValueError(f'Invalid rate {text!r}; expected <count>/<second|minute|hour|day>')
+    return int(count), PERIODS[period.strip()]
+
+
+def parse_rules(text):
+    """'*=100/second,login=10/minute' -> {'*': (100, 1), 'login': (10, 60)}.
+
+    Names are Flask endpoints (view function names); '*' covers every
+    endpoint without a rule of its own, with one bucket shared between them.
+    """
+    rules = {}
+    for item in text.split(','):
+        if not item.strip():
+            continue
+        name, separator, rate = item.partition('=')
+        if not separator:
+            raise ValueError(f'Invalid rate limit {item!r}; expected <endpoint>=<count>/<period>')
+        rules[name.strip()] = parse_rate(rate)
+    return rules
+
+
+def take_token(tokens, updated, now, rate, burst, cost=1):
+    """One token bucket step; returns (tokens left, allowed, seconds to wait)."""
+    if tokens is None:
+        tokens, updated = burst, now
+    tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+    if tokens >= cost:
+        return tokens - cost, True, 0.0
+    return tokens, False, (cost - tokens) / rate
+
+
+class RateLimited(Exception):
+    """Raised when a client is over a limit; retry_after is in whole seconds."""
+
+    def __init__(self, rule, retry_after):
+        super().__init__(f'Rate limit exceeded for {rule}')
+        self.rule = rule
+        self.retry_after = retry_after
+
+
+class MemoryRateLimitStore:
+    """Buckets in a dict, for a single worker process.
+
+    Only the max_keys most recently used buckets are kept. An evicted
+    bucket comes back full, which costs at most one extra burst.
+    """
+
+    def __init__(self, max_keys=100000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst, cost=1):
+        """Take cost tokens from the bucket at key; returns (allowed, seconds to wait)."""
+        with self._lock:
+            now = self.clock()
+            tokens, updated = self._buckets.pop(key, (None, None))
+            tokens, allowed, wait = take_token(tokens, updated, now, rate, burst, cost)
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, wait
+
+
+class RedisRateLimitStore:
+    """Buckets in Redis hashes, updated atomically by TOKEN_BUCKET_SCRIPT (Redis 5+)."""
+
+    def __init__(self, client, prefix='ratelimit:'):
+        self.prefix = prefix
+        self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def take(self, key, rate, burst, cost=1):
+        allowed, wait = self._script(keys=[self.prefix + key], args=[rate, burst, cost])
+        return bool(int(allowed)), float(wait)
+
+
+class FakeRedisTokenBucket:
+    """In-memory stand-in for the part of the redis-py API RedisRateLimitStore uses.
+
+    It only knows TOKEN_BUCKET_SCRIPT, which it runs in Python under a lock.
+    """
+
+    def __init__(self, clock=time.time):
+        self._store = MemoryRateLimitStore(max_keys=math.inf, clock=clock)
+
+    def register_script(self, source):
+        if source != TOKEN_BUCKET_SCRIPT:
+            raise NotImplementedError('FakeRedisTokenBucket only runs the token bucket script')
+
+        def run(keys, args):
+            allowed, wait = self._store.take(keys[0], *(float(arg) for arg in args))
+            return [int(allowed), repr(wait).encode()]
+        return run
+
+
+def create_rate_limit_store(kind='memory', redis_url=None):
+    """Build the store named by kind: memory, redis, or fake-redis."""
+    if kind == 'memory':
+        return MemoryRateLimitStore()
+    if kind == 'fake-redis':
+        return RedisRateLimitStore(FakeRedisTokenBucket())
+    if kind == 'redis':
+        import redis  # optional dependency, only needed for multi-worker deployments
+        return RedisRateLimitStore(redis.Redis.from_url(redis_url))
+    raise ValueError(f'Unknown rate limit store: {kind}')
+
+
+class RateLimiter:
+    """Applies per-IP and per-user rules to requests."""
+
+    def __init__(self, store, ip_rules=None, user_rules=None):
+        self.store = store
+        self.ip_rules = ip_rules or {}
+        self.user_rules = user_rules or {}
+
+    def _take(self, scope, rules, endpoint, client):
+        name = endpoint if endpoint in rules else DEFAULT_RULE
+        if name not in rules:
+            return
+        count, period = rules[name]
+        try:
+            allowed, wait = self.store.take(f'{scope}:{name}:{client}', count / period, count)
+        except Exception:
+            logger.exception('Rate limit store failed; letting the request through')
+            return
+        if not allowed:
+            raise RateLimited(f'{scope} {name}', max(1, math.ceil(wait)))
+
+    def check(self, endpoint, ip, user_id=None):
+        """Take a token from each bucket the request falls under, or raise RateLimited.
+
+        Every request counts against its IP; authenticated ones also against
+        their user, so one account can't spread a flood over many addresses.
+        """
+        self._take('ip', self.ip_rules, endpoint, ip)
+        if user_id is not None:
+            self._take('user', self.user_rules, endpoint, user_id)
+
+
+class Overloaded(Exception):
+    """Raised when no request slot frees up in time; retry_after is in seconds."""
+
+    def __init__(self, retry_after=1):
+        super().__init__('Server is at capacity')
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """A counting semaphore over in-flight requests.
+
+    A request that finds every slot taken waits up to timeout seconds for
+    one before it is refused, so short bursts are smoothed rather than shed.
+    """
+
+    def __init__(self, limit, timeout=1.0):
+        self.limit = limit
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def acquire(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise Overloaded()
+        with self._lock:
+            self._in_flight += 1
+
+    def release(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
@@ -0,0 +1,70 @@
+"""
+Relevance ranking for full-text search candidates.
+
+SQLite's bm25() needs every query word's frequency across the whole index,
+which means reading the complete posting list of a common word on every
+search. Instead the FTS5 index hands over a bounded window of the newest
+matches, which it can produce in index order almost for free, and
+rank_documents() scores them with BM25 using statistics from that window.
+"""
+
+import math
+import re
+import unicodedata
+
+# Runs of letters and digits, the same tokens FTS5's unicode61 tokenizer produces
+WORD = re.compile(r'[^\W_]+')
+
+
+def fold(text):
+    """Lower-case text and strip diacritics, like unicode61 remove_diacritics."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def search_words(query):
+    return WORD.findall(query)
+
+
+def rank_documents(query_words, documents, weights, k1=1.2, b=0.75):
+    """Return the keys of documents, best match first.
+
+    Each document is a sequence (key, text, text, ...) with one text per
+    entry in weights, and documents come in tie-break order. Statistics are
+    kept in flat lists of numbers so ranking a large window creates few
+    objects for the garbage collector to track.
+    """
+    query_words = [fold(word) for word in query_words]
+    total = len(documents)
+    if not total:
+        return []
+    fields = range(len(weights))
+    lengths = [[0] * total for _ in fields]
+    # frequencies[field][word][document]
+    frequencies = [[[0] * total for _ in query_words] for _ in fields]
+    for position, document in enumerate(documents):
+        for field in fields:
+            tokens = WORD.findall(fold(document[field + 1] or ''))
+            lengths[field][position] = len(tokens)
+            for index, word in enumerate(query_words):
+                frequencies[field][index][position] = tokens.count(word)
+
+    scores = [0.0] * total
+    for index in range(len(query_words)):
+        matching = sum(1 for position in range(total)
+                       if any(frequencies[field][index][position] for field in fields))
+        idf = math.log(1 + (total - matching + 0.5) / (matching + 0.5))
+        for field, weight in enumerate(weights):
+            average_length = max(1.0, sum(lengths[field]) / total)
+            column = frequencies[field][index]
+            for position in range(total):
+                tf = column[position]
+                if tf:
+                    norm = k1 * (1 - b + b * lengths[field][position] / average_length)
+                    scores[position] += weight * idf * tf * (k1 + 1) / (tf + norm)
+
+    # A stable sort, even reversed, keeps equal scores in the caller's order
+    order = sorted(range(total), key=scores.__getitem__, reverse=True)
+    return [documents[position][0] for position in order]
@@ -3,6 +3,9 @@
 import pymysql
 import sys
 
+# The tables are created and kept up to date by the backend's migrations
+TABLES_HINT = "📝 Create the tables with: flask --app app migrate (or just start the backend)"
+
 def create_database():
     try:
         # Try to connect to MySQL server (without specifying database)
@@ -19,45 +22,9 @@ def create_database():
             cursor.execute("CREATE DATABASE IF NOT EXISTS auth_db")
             cursor.execute("USE auth_db")
             
-            # Create the users table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    username VARCHAR(80) UNIQUE NOT NULL,
-                    email VARCHAR(120) UNIQUE NOT NULL,
-                    password_hash VARCHAR(128) NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Create the tickets table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS tickets (
-                    id VARCHAR(36) PRIMARY KEY,
-                    title VARCHAR(200) NOT NULL,
-                    description TEXT NOT NULL,
-                    priority VARCHAR(20) NOT NULL DEFAULT 'medium',
-                    status VARCHAR(20) NOT NULL DEFAULT 'todo',
-                    labels TEXT,
-                    user_id INT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-                )
-            """)
-            
-            # Create indexes
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tickets_user_id ON tickets(user_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets(status)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets(priority)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tickets_created_at ON tickets(created_at)")
-            
         connection.commit()
         print("✅ Database 'auth_db' created successfully!")
-        print("✅ Users table created with indexes!")
-        print("✅ Tickets table created with indexes!")
+        print(TABLES_HINT)
         
     except pymysql.Error as e:
         print(f"❌ Error connecting to MySQL: {e}")
@@ -79,40 +46,9 @@ def create_database():
                     cursor.execute("CREATE DATABASE IF NOT EXISTS auth_db")
                     cursor.execute("USE auth_db")
                     
-                    cursor.execute("""
-                        CREATE TABLE IF NOT EXISTS users (
-                            id INT AUTO_INCREMENT PRIMARY KEY,
-                            username VARCHAR(80) UNIQUE NOT NULL,
-                            email VARCHAR(120) UNIQUE NOT NULL,
-                            password_hash VARCHAR(128) NOT NULL,
-                            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                        )
-                    """)
-                    
-                    cursor.execute("""
-                        CREATE TABLE IF NOT EXISTS tickets (
-                            id VARCHAR(36) PRIMARY KEY,
-                            title VARCHAR(200) NOT NULL,
-                            description TEXT NOT NULL,
-                            priority VARCHAR(20) NOT NULL DEFAULT 'medium',
-                            status VARCHAR(20) NOT NULL DEFAULT 'todo',
-                            labels TEXT,
-                            user_id INT NOT NULL,
-                            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-                        )
-                    """)
-                    
-                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)")
-                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)")
-                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tickets_user_id ON tickets(user_id)")
-                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets(status)")
-                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets(priority)")
-                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tickets_created_at ON tickets(created_at)")
-                    
                 connection.commit()
                 print(f"✅ Database created with password: {pwd}")
+                print(TABLES_HINT)
                 
                 # Update .env file with the correct password
                 with open('.env', 'r') as f:
@@ -0,0 +1,69 @@
+"""
+Shared fixtures: one app bound to a throwaway SQLite database for the session.
+
+Every test registers its own users, and each user gets a board of their own,
+so tests don't see each other's tickets.
+"""
+
+import itertools
+import os
+import tempfile
+
+import pytest
+
+handle, DATABASE_PATH = tempfile.mkstemp(prefix='kanban-test-', suffix='.db')
+os.close(handle)
+os.environ.update({
+    'DATABASE_URL': f'sqlite:///{DATABASE_PATH}',
+    'JWT_SECRET_KEY': 'test-secret-key-with-enough-bytes-for-hs256',
+    'BCRYPT_LOG_ROUNDS': '4',
+    'RATE_LIMIT_STORE': 'off',
+    # Tests run jobs themselves with job_queue.run_pending()
+    'JOB_WORKERS': '0',
+    'COMPACT_CHANGES_INTERVAL_SECONDS': '0',
+})
+
+import app as kanban  # noqa: E402
+
+user_numbers = itertools.count(1)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def database():
+    kanban.init_app()
+    yield
+    os.remove(DATABASE_PATH)
+
+
+@pytest.fixture
+def client():
+    return kanban.app.test_client()
+
+
+@pytest.fixture
+def register(client):
+    """Register a new user; returns their auth headers."""
+    def register(name='user', password='password'):
+        username = f'{name}{next(user_numbers)}'
+        response = client.post('/api/register', json={
+            'username': username, 'email': f'{username}@example.com', 'password': password})
+        assert response.status_code == 201, response.get_json()
+        return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+    return register
+
+
+@pytest.fixture
+def headers(register):
+    return register()
+
+
+@pytest.fixture
+def create_ticket(client):
+    """Create a ticket on the user's own board, or board_id's; returns its JSON."""
+    def create_ticket(headers, title='Ticket', board_id=None, **fields):
+        url = f'/api/boards/{board_id}/tickets' if board_id else '/api/tickets'
+        response = client.post(url, json={'title': title, 'description': 'Description', **fields},
+                               headers=headers)
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()['ticket']
+    return create_ticket
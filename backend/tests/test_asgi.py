@@ -0,0 +1,168 @@
+import asyncio
+import io
+import json
+
+import pytest
+
+import app as kanban
+from asgi import KanbanASGI, build_environ
+
+
+def http_scope(path, query=b'', method='GET', headers=()):
+    return {
+        'type': 'http', 'method': method, 'path': path, 'raw_path': path.encode(), 'query_string': query,
+        'http_version': '1.1', 'scheme': 'http', 'server': ('testserver', 80), 'client': ('127.0.0.1', 5000),
+        'headers': [(name.lower().encode(), value.encode()) for name, value in headers],
+    }
+
+
+def auth(headers):
+    return [('Authorization', headers['Authorization'])]
+
+
+@pytest.fixture
+def application():
+    application = KanbanASGI(kanban.app, kanban.event_bus, threads=2)
+    yield application
+    application.executor.shutdown(wait=True)
+
+
+def call(application, scope, chunks=(b'',)):
+    """Run one request to completion; returns (status, headers, body)."""
+    async def run():
+        inbox = asyncio.Queue()
+        for index, chunk in enumerate(chunks):
+            inbox.put_nowait({'type': 'http.request', 'body': chunk, 'more_body': index < len(chunks) - 1})
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await application(scope, inbox.get, send)
+        return sent
+
+    start, *bodies = asyncio.run(run())
+    assert start['type'] == 'http.response.start' and not bodies[-1].get('more_body', False)
+    return start['status'], dict(start['headers']), b''.join(body['body'] for body in bodies)
+
+
+def test_environ_follows_wsgi_conventions():
+    body = io.BytesIO()
+    environ = build_environ({
+        **http_scope('/app/api/tickets', b'limit=5', headers=[
+            ('Content-Type', 'application/json'), ('Accept', 'text/html'), ('Accept', 'application/json')]),
+        'raw_path': b'/app/api/caf%C3%A9?x=1', 'root_path': '/app',
+    }, body)
+
+    assert environ['SCRIPT_NAME'] == '/app' and environ['PATH_INFO'] == '/api/caf%C3%A9'
+    assert environ['QUERY_STRING'] == 'limit=5'
+    assert environ['CONTENT_TYPE'] == 'application/json' and 'HTTP_CONTENT_TYPE' not in environ
+    # Repeated headers are joined, as a WSGI server would
+    assert environ['HTTP_ACCEPT'] == 'text/html,application/json'
+    assert environ['wsgi.input'] is body and environ['REMOTE_ADDR'] == '127.0.0.1'
+
+
+def test_routes_run_through_the_bridge(application, headers, create_ticket):
+    create_ticket(headers, 'bridged')
+
+    status, response_headers, body = call(application, http_scope('/api/tickets', headers=auth(headers)))
+
+    assert status == 200 and response_headers[b'content-type'] == b'application/json'
+    assert [ticket['title'] for ticket in json.loads(body)['tickets']] == ['bridged']
+
+
+def test_request_bodies_arrive_in_chunks(application, headers):
+    payload = json.dumps({'title': 'chunked', 'description': 'Sent in pieces'}).encode()
+    scope = http_scope('/api/tickets', method='POST',
+                       headers=[*auth(headers), ('Content-Type', 'application/json')])
+
+    status, _, body = call(application, scope, chunks=(payload[:10], payload[10:20], payload[20:]))
+
+    assert status == 201 and json.loads(body)['ticket']['title'] == 'chunked'
+
+
+def test_streams_are_refused_without_a_token(application):
+    status, _, body = call(application, http_scope('/api/events/stream'))
+
+    assert status == 401 and b'retry' not in body
+
+
+def test_streams_to_other_boards_are_not_found(application, register, headers):
+    boards = kanban.app.test_client().get('/api/boards', headers=register()).get_json()['boards']
+
+    status, _, _ = call(application, http_scope(f"/api/boards/{boards[0]['id']}/events/stream", headers=auth(headers)))
+
+    assert status == 404
+
+
+def test_streams_are_served_on_the_event_loop(application, headers, create_ticket):
+    async def run():
+        inbox = asyncio.Queue()
+        inbox.put_nowait({'type': 'http.request', 'body': b'', 'more_body': False})
+        sent = asyncio.Queue()
+        stream = asyncio.ensure_future(
+            application(http_scope('/api/events/stream', headers=auth(headers)), inbox.get, sent.put))
+
+        start = await asyncio.wait_for(sent.get(), 5)
+        first = await asyncio.wait_for(sent.get(), 5)
+        await asyncio.get_running_loop().run_in_executor(None, create_ticket, headers, 'streamed')
+        event = await asyncio.wait_for(sent.get(), 5)
+        subscribed = kanban.event_bus.subscriber_count()
+
+        inbox.put_nowait({'type': 'http.disconnect'})
+        await asyncio.wait_for(stream, 5)
+        return start, first, event, subscribed
+
+    before = kanban.event_bus.subscriber_count()
+    start, first, event, subscribed = asyncio.run(run())
+
+    assert start['status'] == 200 and b'content-length' not in dict(start['headers'])
+    assert dict(start['headers'])[b'content-type'].startswith(b'text/event-stream')
+    assert first['body'] == b'retry: 3000\n\n'
+    assert b'event: ticket.created' in event['body'] and b'streamed' in event['body']
+    assert subscribed == before + 1
+    assert kanban.event_bus.subscriber_count() == before
+
+
+def test_lifespan_runs_startup_on_the_bridge():
+    started = []
+    application = KanbanASGI(kanban.app, kanban.event_bus, threads=1, startup=lambda: started.append(True))
+
+    async def run():
+        inbox = asyncio.Queue()
+        for message in ('lifespan.startup', 'lifespan.shutdown'):
+            inbox.put_nowait({'type': message})
+        sent = []
+
+        async def send(message):
+            sent.append(message['type'])
+
+        await application({'type': 'lifespan'}, inbox.get, send)
+        return sent
+
+    assert asyncio.run(run()) == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+    assert started == [True]
+
+
+def test_removal_ends_the_members_native_stream(application, client, register):
+    owner, member = register('owner'), register('member')
+    board_id = client.post('/api/boards', json={'name': 'Shared'}, headers=owner).get_json()['board']['id']
+    member_user = client.get('/api/profile', headers=member).get_json()['user']
+    client.post(f'/api/boards/{board_id}/members', json={'username': member_user['username']}, headers=owner)
+
+    async def run():
+        inbox = asyncio.Queue()
+        inbox.put_nowait({'type': 'http.request', 'body': b'', 'more_body': False})
+        sent = asyncio.Queue()
+        stream = asyncio.ensure_future(application(
+            http_scope(f'/api/boards/{board_id}/events/stream', headers=auth(member)), inbox.get, sent.put))
+        for _ in range(2):  # response start and the retry frame
+            await asyncio.wait_for(sent.get(), 5)
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: client.delete(f"/api/boards/{board_id}/members/{member_user['id']}", headers=owner))
+        await asyncio.wait_for(stream, 5)
+        return sent.get_nowait()
+
+    last = asyncio.run(run())
+
+    assert last == {'type': 'http.response.body', 'body': b'event: revoked\ndata: {}\n\n', 'more_body': False}
@@ -0,0 +1,85 @@
+from sqlalchemy import event
+
+import app as kanban
+
+
+def batch(client, headers, *operations):
+    return client.post('/api/tickets/batch', json={'operations': list(operations)}, headers=headers)
+
+
+def board(client, headers):
+    return {ticket['title']: ticket for ticket in client.get('/api/tickets', headers=headers).get_json()['tickets']}
+
+
+def test_operations_apply_in_order(client, headers, create_ticket):
+    existing = create_ticket(headers, 'existing')
+    doomed = create_ticket(headers, 'doomed')
+
+    response = batch(client, headers,
+                     {'op': 'create', 'title': 'new', 'description': 'D', 'labels': ['x']},
+                     {'op': 'update', 'id': existing['id'], 'title': 'renamed', 'priority': 'high'},
+                     {'op': 'move', 'id': existing['id'], 'status': 'done'},
+                     {'op': 'delete', 'id': doomed['id']})
+
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [(result['index'], result['op']) for result in results] == [
+        (0, 'create'), (1, 'update'), (2, 'move'), (3, 'delete')]
+    tickets = board(client, headers)
+    assert set(tickets) == {'new', 'renamed'}
+    assert tickets['new']['id'] == results[0]['id'] and tickets['new']['labels'] == ['x']
+    assert (tickets['renamed']['priority'], tickets['renamed']['status']) == ('high', 'done')
+
+
+def test_one_invalid_operation_writes_nothing(client, headers, create_ticket):
+    ticket = create_ticket(headers, 'untouched')
+
+    response = batch(client, headers,
+                     {'op': 'update', 'id': ticket['id'], 'title': 'changed'},
+                     {'op': 'update', 'id': 'missing', 'title': 'x'},
+                     {'op': 'create', 'title': 'no description'},
+                     {'op': 'explode'})
+
+    assert response.status_code == 400
+    assert [error['index'] for error in response.get_json()['errors']] == [1, 2, 3]
+    assert set(board(client, headers)) == {'untouched'}
+
+
+def test_operations_on_other_boards_fail_as_missing(client, register, create_ticket):
+    alice, bob = register('alice'), register('bob')
+    ticket = create_ticket(alice, 'alice ticket')
+
+    response = batch(client, bob, {'op': 'delete', 'id': ticket['id']})
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [{'index': 0, 'error': 'Ticket not found'}]
+    assert set(board(client, alice)) == {'alice ticket'}
+
+
+def test_empty_and_oversized_batches_are_rejected(client, headers):
+    assert client.post('/api/tickets/batch', json={'operations': []}, headers=headers).status_code == 400
+    assert client.post('/api/tickets/batch', json={}, headers=headers).status_code == 400
+    operations = [{'op': 'create', 'title': 'T', 'description': 'D'}] * 10001
+    assert batch(client, headers, *operations).status_code == 400
+
+
+def test_new_labels_are_inserted_together(client, headers, create_ticket):
+    create_ticket(headers, labels=['known'])
+    statements = []
+
+    def record(connection, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with kanban.app.app_context():
+        engine = kanban.db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = batch(client, headers, *(
+            {'op': 'create', 'title': f'T{index}', 'description': 'D', 'labels': ['known', f'new{index}']}
+            for index in range(20)))
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+    assert response.status_code == 200
+    assert sum(statement.startswith('INSERT INTO label') for statement in statements) == 1
+    assert {tuple(ticket['labels']) for ticket in board(client, headers).values()} >= {('known', 'new0'), ('known', 'new19')}
@@ -0,0 +1,56 @@
+import app as kanban
+
+
+def summary(client, headers, query=''):
+    response = client.get(f'/api/board/summary?{query}', headers=headers)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_counts_follow_creates_updates_moves_and_deletes(client, headers, create_ticket):
+    first = create_ticket(headers, priority='high')
+    second = create_ticket(headers, priority='low')
+    create_ticket(headers, priority='low')
+    client.put(f"/api/tickets/{first['id']}", json={'status': 'done', 'priority': 'medium'}, headers=headers)
+    client.post(f"/api/tickets/{second['id']}/move", json={'status': 'in-progress'}, headers=headers)
+    client.post('/api/tickets/batch', json={'operations': [
+        {'op': 'create', 'title': 'Batched', 'description': 'Description', 'priority': 'high'},
+        {'op': 'delete', 'id': second['id']},
+    ]}, headers=headers)
+
+    counts = summary(client, headers)['counts']
+
+    assert counts == {
+        'total': 3,
+        'status': {'todo': 2, 'in-progress': 0, 'done': 1},
+        'priority': {'low': 1, 'medium': 1, 'high': 1},
+    }
+
+
+def test_columns_hold_the_first_page_of_each_status(client, headers, create_ticket):
+    for index in range(3):
+        create_ticket(headers, f'todo {index}')
+    done = create_ticket(headers, 'done')
+    client.put(f"/api/tickets/{done['id']}", json={'status': 'done'}, headers=headers)
+
+    columns = summary(client, headers, 'limit=2')['columns']
+
+    assert [ticket['title'] for ticket in columns['todo']['tickets']] == ['todo 2', 'todo 1']
+    assert columns['todo']['next_cursor'] is not None
+    assert [ticket['title'] for ticket in columns['done']['tickets']] == ['done']
+    assert columns['done']['next_cursor'] is None
+    assert columns['in-progress'] == {'tickets': [], 'next_cursor': None}
+
+
+def test_counter_rows_are_created_and_incremented_by_one_statement(client, headers):
+    board_id = client.get('/api/boards', headers=headers).get_json()['boards'][0]['id']
+    with kanban.app.app_context():
+        kanban.adjust_ticket_count(board_id, 'todo', 'high', 2)
+        kanban.adjust_ticket_count(board_id, 'todo', 'high', 3)
+        first = kanban.bump_board_version(board_id)
+        second = kanban.bump_board_version(board_id)
+        kanban.db.session.commit()
+        count = kanban.db.session.get(kanban.TicketCount, (board_id, 'todo', 'high')).count
+
+    assert count == 5
+    assert second == first + 1
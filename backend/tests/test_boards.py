@@ -0,0 +1,125 @@
+import pytest
+
+
+def profile(client, headers):
+    return client.get('/api/profile', headers=headers).get_json()['user']
+
+
+def own_board(client, headers):
+    [board] = client.get('/api/boards', headers=headers).get_json()['boards']
+    return board
+
+
+@pytest.fixture
+def shared_board(client, register):
+    """A board with an owner and one member; returns (board id, owner headers, member headers)."""
+    owner, member = register('owner'), register('member')
+    board = client.post('/api/boards', json={'name': 'Shared'}, headers=owner).get_json()['board']
+    response = client.post(f"/api/boards/{board['id']}/members",
+                           json={'username': profile(client, member)['username']}, headers=owner)
+    assert response.status_code == 201, response.get_json()
+    return board['id'], owner, member
+
+
+def test_every_user_starts_with_a_board_they_own(client, headers):
+    board = own_board(client, headers)
+
+    assert board['role'] == 'owner' and board['owner_id'] == profile(client, headers)['id']
+
+
+def test_members_work_on_the_shared_board(client, shared_board, create_ticket):
+    board_id, owner, member = shared_board
+
+    ticket = create_ticket(member, 'From the member', board_id=board_id)
+    client.put(f"/api/tickets/{ticket['id']}", json={'status': 'done'}, headers=owner)
+
+    tickets = client.get(f'/api/boards/{board_id}/tickets', headers=owner).get_json()['tickets']
+    assert [(t['title'], t['status']) for t in tickets] == [('From the member', 'done')]
+    roles = {m['role'] for m in client.get(f'/api/boards/{board_id}/members', headers=member).get_json()['members']}
+    assert roles == {'owner', 'member'}
+    # The shared board stays off each user's own board
+    assert client.get('/api/tickets', headers=member).get_json()['tickets'] == []
+
+
+@pytest.mark.parametrize('method, path', [
+    ('GET', '/tickets'), ('POST', '/tickets'), ('GET', '/summary'), ('GET', '/labels'),
+    ('GET', '/tickets/search?q=x'), ('GET', '/tickets/changes'), ('GET', '/tickets/export'),
+    ('POST', '/tickets/batch'), ('GET', '/members'), ('POST', '/members'),
+    ('GET', '/analytics/cumulative-flow'), ('GET', '/analytics/lead-time'), ('GET', '/events/stream'),
+])
+def test_non_members_see_boards_as_missing(client, register, headers, method, path):
+    board_id = own_board(client, register())['id']
+
+    response = client.open(f'/api/boards/{board_id}{path}', method=method, json={}, headers=headers)
+
+    assert response.status_code == 404
+    # The same as for a board that doesn't exist
+    assert response.get_json() == client.open(f'/api/boards/999999{path}', method=method, json={},
+                                              headers=headers).get_json()
+
+
+def test_non_members_cannot_reach_tickets_by_id(client, register, headers, create_ticket):
+    ticket = create_ticket(register())
+    url = f"/api/tickets/{ticket['id']}"
+
+    for method, path, body in (('GET', url, None), ('PUT', url, {'title': 'x'}),
+                               ('POST', f'{url}/move', {'status': 'done'}), ('DELETE', url, None)):
+        assert client.open(path, method=method, json=body, headers=headers).status_code == 404, method
+
+
+def test_removed_members_lose_access(client, shared_board, create_ticket):
+    board_id, owner, member = shared_board
+    ticket = create_ticket(owner, board_id=board_id)
+
+    response = client.delete(f"/api/boards/{board_id}/members/{profile(client, member)['id']}", headers=owner)
+
+    assert response.status_code == 200
+    assert client.get(f'/api/boards/{board_id}/tickets', headers=member).status_code == 404
+    assert client.get(f"/api/tickets/{ticket['id']}", headers=member).status_code == 404
+
+
+def test_members_may_leave_but_not_remove_others(client, shared_board):
+    board_id, owner, member = shared_board
+    owner_id, member_id = profile(client, owner)['id'], profile(client, member)['id']
+
+    assert client.delete(f'/api/boards/{board_id}/members/{owner_id}', headers=member).status_code == 403
+    assert client.delete(f'/api/boards/{board_id}/members/{owner_id}', headers=owner).status_code == 400
+    assert client.delete(f'/api/boards/{board_id}/members/{member_id}', headers=member).status_code == 200
+    assert client.delete(f'/api/boards/{board_id}/members/{member_id}', headers=owner).status_code == 404
+
+
+def test_only_owners_add_members(client, register, shared_board):
+    board_id, owner, member = shared_board
+    outsider = profile(client, register())
+    url = f'/api/boards/{board_id}/members'
+
+    assert client.post(url, json={'username': outsider['username']}, headers=member).status_code == 403
+    assert client.post(url, json={'username': outsider['email']}, headers=owner).status_code == 201
+    assert client.post(url, json={'username': outsider['username']}, headers=owner).status_code == 409
+    assert client.post(url, json={'username': 'nobody-by-this-name'}, headers=owner).status_code == 404
+    assert client.post(url, json={}, headers=owner).status_code == 400
+
+
+def test_boards_need_a_name(client, headers):
+    assert client.post('/api/boards', json={'name': '  '}, headers=headers).status_code == 400
+    assert client.post('/api/boards', json={}, headers=headers).status_code == 400
+
+
+def test_removal_ends_the_members_open_streams(client, shared_board):
+    board_id, owner, member = shared_board
+    member_id = profile(client, member)['id']
+    streams = [client.get(f'/api/boards/{board_id}/events/stream', headers=headers, buffered=False)
+               for headers in (owner, member)]
+    owner_frames, member_frames = (iter(stream.response) for stream in streams)
+    try:
+        assert next(owner_frames) == next(member_frames) == b'retry: 3000\n\n'
+
+        client.delete(f'/api/boards/{board_id}/members/{member_id}', headers=owner)
+
+        assert next(member_frames) == b'event: revoked\ndata: {}\n\n'
+        assert list(member_frames) == []
+        # Everyone else is told who left
+        assert b'event: member.removed' in next(owner_frames)
+    finally:
+        for stream in streams:
+            stream.close()
@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+import app as kanban
+from fractional_index import key_between, keys_between
+
+
+def column(client, headers, status='todo'):
+    body = client.get(f'/api/tickets?sort=rank&status={status}', headers=headers).get_json()
+    return [ticket['title'] for ticket in body['tickets']]
+
+
+def move(client, headers, ticket, **position):
+    return client.post(f"/api/tickets/{ticket['id']}/move", json=position, headers=headers)
+
+
+def test_key_between_sorts_strictly_between_its_bounds():
+    random.seed(7)
+    keys = [key_between(None, None)]
+    for _ in range(500):
+        index = random.randrange(len(keys) + 1)
+        low = keys[index - 1] if index else None
+        high = keys[index] if index < len(keys) else None
+        key = key_between(low, high)
+        assert (low is None or low < key) and (high is None or key < high)
+        assert not key.endswith('0') or len(key) == 2
+        keys.insert(index, key)
+    assert keys == sorted(keys)
+
+
+def test_keys_between_spreads_keys_in_order():
+    keys = keys_between('i1', 'i2', 10)
+
+    assert len(set(keys)) == 10
+    assert ['i1', *keys, 'i2'] == sorted(['i1', *keys, 'i2'])
+    assert keys_between(None, None, 3) == sorted(keys_between(None, None, 3))
+
+
+def test_invalid_bounds_are_rejected():
+    with pytest.raises(ValueError):
+        key_between('i2', 'i1')
+    with pytest.raises(ValueError):
+        key_between('not a key', None)
+
+
+def test_new_cards_go_on_top_and_moves_land_between_neighbours(client, headers, create_ticket):
+    a, b, c = (create_ticket(headers, title) for title in 'abc')
+    assert column(client, headers) == ['c', 'b', 'a']
+
+    assert move(client, headers, a, after_id=c['id'], before_id=b['id']).status_code == 200
+    assert column(client, headers) == ['c', 'a', 'b']
+    move(client, headers, c, after_id=b['id'])
+    assert column(client, headers) == ['a', 'b', 'c']
+    move(client, headers, c, before_id=a['id'])
+    assert column(client, headers) == ['c', 'a', 'b']
+
+
+def test_moving_to_another_column_updates_status_and_counts(client, headers, create_ticket):
+    a, b = create_ticket(headers, 'a'), create_ticket(headers, 'b')
+    move(client, headers, a, status='done')
+
+    response = move(client, headers, b, after_id=a['id'])
+
+    assert response.get_json()['ticket']['status'] == 'done'
+    assert column(client, headers, 'done') == ['a', 'b']
+    assert client.get('/api/board/summary', headers=headers).get_json()['counts']['status']['done'] == 2
+
+
+def test_invalid_moves_are_rejected(client, headers, create_ticket):
+    a, b, c = (create_ticket(headers, title) for title in 'abc')
+    done = create_ticket(headers, 'done')
+    move(client, headers, done, status='done')
+
+    for position in ({'after_id': a['id']}, {'after_id': 'missing'}, {'status': 'blocked'},
+                     {'after_id': b['id'], 'before_id': done['id']},
+                     # b sits below c, so nothing fits after b and before c
+                     {'after_id': b['id'], 'before_id': c['id']}):
+        assert move(client, headers, a, **position).status_code == 400, position
+    assert column(client, headers) == ['c', 'b', 'a']
+
+
+def test_keys_that_grow_too_long_get_the_column_rebalanced(client, headers, create_ticket, monkeypatch):
+    monkeypatch.setattr(kanban, 'RANK_REBALANCE_LENGTH', 4)
+    pair = [create_ticket(headers, 'first'), create_ticket(headers, 'second')]
+    top = create_ticket(headers, 'top')
+    # Splitting the same gap again and again lengthens the key
+    for index in range(20):
+        move(client, headers, pair[index % 2], after_id=top['id'], before_id=pair[(index + 1) % 2]['id'])
+
+    tickets = client.get('/api/tickets?sort=rank&status=todo', headers=headers).get_json()['tickets']
+    assert max(len(ticket['rank']) for ticket in tickets) > 4
+    before = [ticket['title'] for ticket in tickets]
+
+    kanban.job_queue.run_pending()
+
+    tickets = client.get('/api/tickets?sort=rank&status=todo', headers=headers).get_json()['tickets']
+    assert [ticket['title'] for ticket in tickets] == before
+    assert max(len(ticket['rank']) for ticket in tickets) <= 4
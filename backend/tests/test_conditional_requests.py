@@ -0,0 +1,62 @@
+def test_ticket_get_revalidates_with_its_etag(client, headers, create_ticket):
+    ticket = create_ticket(headers)
+    url = f"/api/tickets/{ticket['id']}"
+    etag = client.get(url, headers=headers).headers['ETag']
+
+    assert client.get(url, headers={**headers, 'If-None-Match': etag}).status_code == 304
+    client.put(url, json={'title': 'changed'}, headers=headers)
+    assert client.get(url, headers={**headers, 'If-None-Match': etag}).status_code == 200
+
+
+def test_writes_return_the_etag_a_read_would(client, headers, create_ticket):
+    ticket = create_ticket(headers)
+    url = f"/api/tickets/{ticket['id']}"
+
+    updated = client.put(url, json={'priority': 'high'}, headers=headers)
+
+    assert updated.headers['ETag'] == client.get(url, headers=headers).headers['ETag']
+
+
+def test_if_match_with_a_stale_etag_fails_with_412(client, headers, create_ticket):
+    ticket = create_ticket(headers)
+    url = f"/api/tickets/{ticket['id']}"
+    stale = client.get(url, headers=headers).headers['ETag']
+    current = client.put(url, json={'title': 'first writer'}, headers=headers).headers['ETag']
+
+    for method, path, body in (('PUT', url, {'title': 'second writer'}),
+                               ('POST', f'{url}/move', {'status': 'done'}),
+                               ('DELETE', url, None)):
+        response = client.open(path, method=method, json=body, headers={**headers, 'If-Match': stale})
+        assert response.status_code == 412, method
+    assert client.get(url, headers=headers).get_json()['ticket']['title'] == 'first writer'
+
+    response = client.put(url, json={'title': 'second writer'}, headers={**headers, 'If-Match': current})
+    assert response.status_code == 200
+
+
+def test_weak_etags_match_for_if_match(client, headers, create_ticket):
+    ticket = create_ticket(headers)
+    url = f"/api/tickets/{ticket['id']}"
+    etag = client.get(url, headers=headers).headers['ETag']
+
+    response = client.put(url, json={'title': 'changed'}, headers={**headers, 'If-Match': f'W/{etag}'})
+
+    assert response.status_code == 200
+
+
+def test_board_lists_revalidate_until_the_board_changes(client, headers, create_ticket):
+    create_ticket(headers)
+    first = client.get('/api/tickets?limit=10', headers=headers)
+    etag = first.headers['ETag']
+
+    assert client.get('/api/tickets?limit=10', headers={**headers, 'If-None-Match': etag}).status_code == 304
+    # Each query validates separately
+    assert client.get('/api/tickets?limit=5', headers={**headers, 'If-None-Match': etag}).status_code == 200
+    create_ticket(headers)
+    assert client.get('/api/tickets?limit=10', headers={**headers, 'If-None-Match': etag}).status_code == 200
+
+
+def test_profile_revalidates(client, headers):
+    etag = client.get('/api/profile', headers=headers).headers['ETag']
+
+    assert client.get('/api/profile', headers={**headers, 'If-None-Match': etag}).status_code == 304
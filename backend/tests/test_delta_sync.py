@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+import app as kanban
+
+
+def sync(client, headers, token=None, limit=100):
+    query = f'?since={token}&limit={limit}' if token else ''
+    response = client.get(f'/api/tickets/changes{query}', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_changes_since_a_token_include_updates_and_tombstones(client, headers, create_ticket):
+    kept = create_ticket(headers, 'kept')
+    deleted = create_ticket(headers, 'deleted')
+    token = sync(client, headers)['next_token']
+
+    created = create_ticket(headers, 'created')
+    client.put(f"/api/tickets/{kept['id']}", json={'title': 'kept, renamed'}, headers=headers)
+    client.delete(f"/api/tickets/{deleted['id']}", headers=headers)
+    changes = sync(client, headers, token)
+
+    assert sorted(ticket['title'] for ticket in changes['tickets']) == ['created', 'kept, renamed']
+    assert changes['deleted'] == [deleted['id']]
+    assert changes['has_more'] is False
+    assert created['id'] in {ticket['id'] for ticket in changes['tickets']}
+
+    # Caught up: nothing new until the next write
+    assert sync(client, headers, changes['next_token'])['tickets'] == []
+
+
+def test_paging_through_changes_misses_nothing(client, headers, create_ticket):
+    token = sync(client, headers)['next_token']
+    created = {create_ticket(headers, f't{index}')['id'] for index in range(5)}
+
+    seen = []
+    while True:
+        changes = sync(client, headers, token, limit=2)
+        seen.extend(ticket['id'] for ticket in changes['tickets'])
+        token = changes['next_token']
+        if not changes['has_more']:
+            break
+
+    assert sorted(seen) == sorted(created)
+
+
+def test_tokens_older_than_the_tombstones_are_gone(client, headers):
+    expired = kanban.encode_sync_token(0, '', datetime.utcnow() - kanban.TOMBSTONE_RETENTION - timedelta(days=1))
+
+    response = client.get(f'/api/tickets/changes?since={expired}', headers=headers)
+
+    assert response.status_code == 410
+    assert client.get('/api/tickets/changes?since=garbage', headers=headers).status_code == 400
+
+
+def test_compaction_job_drops_expired_tombstones_and_reschedules_itself(client, headers, create_ticket,
+                                                                         monkeypatch):
+    monkeypatch.setitem(kanban.app.config, 'COMPACT_CHANGES_INTERVAL_SECONDS', 3600)
+    old, recent = create_ticket(headers, 'old'), create_ticket(headers, 'recent')
+    for ticket in (old, recent):
+        client.delete(f"/api/tickets/{ticket['id']}", headers=headers)
+    Job, TicketChange, db = kanban.Job, kanban.TicketChange, kanban.db
+    with kanban.app.app_context():
+        db.session.execute(db.update(TicketChange).where(TicketChange.ticket_id == old['id'])
+                           .values(changed_at=datetime.utcnow() - kanban.TOMBSTONE_RETENTION - timedelta(days=1)))
+        kanban.job_queue.enqueue('compact-changes', key='compact-changes')
+        db.session.commit()
+
+    kanban.job_queue.run_pending()
+
+    with kanban.app.app_context():
+        remaining = set(db.session.execute(db.select(TicketChange.ticket_id).where(
+            TicketChange.ticket_id.in_([old['id'], recent['id']]))).scalars())
+        next_runs = db.session.execute(db.select(Job).where(Job.key == 'compact-changes')).scalars().all()
+        assert remaining == {recent['id']}
+        assert [job.status for job in next_runs] == ['queued']
+        assert next_runs[0].run_at > datetime.utcnow()
+        db.session.execute(db.delete(Job).where(Job.key == 'compact-changes'))
+        db.session.commit()
@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+import app as kanban
+from events import FakeRedisPubSub, InProcessEventBus, RedisEventBus, SlowConsumerError
+
+
+def stream_ticket(client, headers):
+    response = client.post('/api/events/ticket', headers=headers)
+    assert response.status_code == 200
+    return response.get_json()['ticket']
+
+
+def parse_frame(frame):
+    fields = dict(line.split(': ', 1) for line in frame.decode('utf-8').strip().splitlines())
+    return fields['event'], json.loads(fields['data'])
+
+
+@pytest.fixture
+def open_stream(client):
+    """Open an event stream; returns an iterator over its frames."""
+    responses = []
+
+    def open_stream(url):
+        response = client.get(url, buffered=False)
+        assert response.status_code == 200, response.get_json()
+        responses.append(response)
+        frames = iter(response.response)
+        assert next(frames) == b'retry: 3000\n\n'
+        return frames
+
+    yield open_stream
+    for response in responses:
+        response.close()
+
+
+def test_stream_delivers_the_boards_changes(client, headers, create_ticket, open_stream):
+    frames = open_stream(f'/api/events/stream?ticket={stream_ticket(client, headers)}')
+
+    ticket = create_ticket(headers, 'streamed')
+    client.put(f"/api/tickets/{ticket['id']}", json={'priority': 'high'}, headers=headers)
+    client.delete(f"/api/tickets/{ticket['id']}", headers=headers)
+
+    created, updated, deleted = (parse_frame(next(frames)) for _ in range(3))
+    assert created[0] == 'ticket.created' and created[1]['ticket']['title'] == 'streamed'
+    # Updates carry only what changed
+    assert updated[0] == 'ticket.updated' and set(updated[1]['ticket']) == {'id', 'priority', 'updatedAt'}
+    assert deleted[0] == 'ticket.deleted' and deleted[1]['id'] == ticket['id']
+    assert created[1]['seq'] < updated[1]['seq'] < deleted[1]['seq']
+
+
+def test_closing_the_stream_unsubscribes(client, headers):
+    before = kanban.event_bus.subscriber_count()
+    response = client.get('/api/events/stream', headers=headers, buffered=False)
+    next(iter(response.response))
+    assert kanban.event_bus.subscriber_count() == before + 1
+
+    response.close()
+
+    assert kanban.event_bus.subscriber_count() == before
+
+
+def test_streams_are_for_board_members_only(client, register):
+    alice, bob = register('alice'), register('bob')
+    board_id = client.get('/api/boards', headers=alice).get_json()['boards'][0]['id']
+
+    response = client.get(f'/api/boards/{board_id}/events/stream?ticket={stream_ticket(client, bob)}')
+
+    assert response.status_code == 404
+
+
+def test_access_tokens_are_refused_in_the_url(client, headers):
+    access_token = headers['Authorization'].split(' ', 1)[1]
+
+    response = client.get(f'/api/events/stream?ticket={access_token}')
+
+    assert response.status_code == 401
+
+
+def test_stream_tickets_only_open_streams(client, headers):
+    ticket = stream_ticket(client, headers)
+
+    response = client.get('/api/tickets', headers={'Authorization': f'Bearer {ticket}'})
+
+    assert response.status_code == 401
+
+
+def test_a_subscriber_that_falls_behind_is_dropped():
+    bus = InProcessEventBus(max_queue=2)
+    subscription = bus.subscribe('board:1')
+
+    for seq in range(3):
+        bus.publish('board:1', {'type': 'ticket.created', 'seq': seq})
+
+    assert bus.subscriber_count('board:1') == 0
+    with pytest.raises(SlowConsumerError):
+        subscription.get(timeout=0)
+
+
+def test_redis_bus_delivers_across_workers():
+    redis = FakeRedisPubSub()
+    publisher, listener = RedisEventBus(redis), RedisEventBus(redis)
+    subscription = listener.subscribe('board:7')
+
+    publisher.publish('board:8', {'type': 'elsewhere', 'seq': 1})
+    publisher.publish('board:7', {'type': 'ticket.created', 'seq': 2})
+
+    assert subscription.get(timeout=1) == {'type': 'ticket.created', 'seq': 2}
+    assert subscription.get(timeout=0.1) is None
@@ -0,0 +1,52 @@
+import csv
+import gzip
+import io
+import json
+
+
+def export(client, headers, query=''):
+    response = client.get(f'/api/tickets/export?{query}', headers=headers)
+    assert response.status_code == 200
+    return response
+
+
+def test_ndjson_export_has_every_ticket_in_id_order(client, headers, create_ticket):
+    created = [create_ticket(headers, f't{index}', labels=['b', 'a'][:index]) for index in range(3)]
+
+    lines = export(client, headers).get_data(as_text=True).splitlines()
+
+    records = [json.loads(line) for line in lines]
+    assert [record['id'] for record in records] == sorted(ticket['id'] for ticket in created)
+    assert {record['title']: record['labels'] for record in records} == {
+        't0': [], 't1': ['b'], 't2': ['b', 'a']}
+
+
+def test_csv_export_has_a_header_and_json_labels(client, headers, create_ticket):
+    create_ticket(headers, 'Comma, "quoted"', labels=['x'])
+
+    response = export(client, headers, 'format=csv')
+
+    assert response.mimetype == 'text/csv'
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [(row['title'], json.loads(row['labels'])) for row in rows] == [('Comma, "quoted"', ['x'])]
+
+
+def test_cursor_resumes_after_the_last_ticket_received(client, headers, create_ticket):
+    ids = sorted(create_ticket(headers, f't{index}')['id'] for index in range(4))
+
+    lines = export(client, headers, f'cursor={ids[1]}').get_data(as_text=True).splitlines()
+
+    assert [json.loads(line)['id'] for line in lines] == ids[2:]
+
+
+def test_gzip_is_used_when_accepted(client, headers, create_ticket):
+    create_ticket(headers, 'zipped')
+
+    response = client.get('/api/tickets/export', headers={**headers, 'Accept-Encoding': 'gzip'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(response.get_data()))['title'] == 'zipped'
+
+
+def test_unknown_format_is_rejected(client, headers):
+    assert client.get('/api/tickets/export?format=xml', headers=headers).status_code == 400
@@ -0,0 +1,110 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as kanban
+
+
+def transitions(ticket_id):
+    with kanban.app.app_context():
+        return [
+            (row.field, row.old_value, row.new_value)
+            for row in kanban.db.session.execute(
+                kanban.db.select(kanban.TicketTransition)
+                .where(kanban.TicketTransition.ticket_id == ticket_id)
+                .order_by(kanban.TicketTransition.id)
+            ).scalars()
+        ]
+
+
+def flow(client, headers, day):
+    response = client.get(f'/api/analytics/cumulative-flow?from={day}&to={day}', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    [counts] = response.get_json()['days']
+    return {status: counts[status] for status in kanban.VALID_STATUSES}
+
+
+def today():
+    return datetime.utcnow().date().isoformat()
+
+
+def test_every_write_appends_its_transitions(client, headers, create_ticket):
+    ticket = create_ticket(headers, priority='low')
+    url = f"/api/tickets/{ticket['id']}"
+
+    client.put(url, json={'priority': 'high', 'labels': ['bug'], 'title': 'not tracked'}, headers=headers)
+    client.post(f'{url}/move', json={'status': 'done'}, headers=headers)
+    client.delete(url, headers=headers)
+
+    assert transitions(ticket['id']) == [
+        ('status', None, 'todo'),
+        ('priority', 'low', 'high'),
+        ('labels', '[]', json.dumps(['bug'])),
+        ('status', 'todo', 'done'),
+        ('status', 'done', None),
+    ]
+
+
+def test_cumulative_flow_follows_the_columns(client, headers, create_ticket):
+    first, second = create_ticket(headers), create_ticket(headers)
+    assert flow(client, headers, today()) == {'todo': 2, 'in-progress': 0, 'done': 0}
+
+    client.put(f"/api/tickets/{first['id']}", json={'status': 'in-progress'}, headers=headers)
+    client.delete(f"/api/tickets/{second['id']}", headers=headers)
+
+    assert flow(client, headers, today()) == {'todo': 0, 'in-progress': 1, 'done': 0}
+
+
+def test_cumulative_flow_carries_earlier_days_forward(client, headers):
+    created = (datetime.utcnow() - timedelta(days=10)).replace(microsecond=0)
+    client.post('/api/tickets/import', data=json.dumps({
+        'title': 'imported', 'description': 'D', 'createdAt': created.isoformat() + '+00:00'}),
+        content_type='application/x-ndjson', headers=headers)
+
+    response = client.get(f"/api/analytics/cumulative-flow?from={(created - timedelta(days=1)).date()}"
+                          f"&to={today()}", headers=headers).get_json()
+
+    assert [day['todo'] for day in response['days']] == [0] + [1] * 11
+    assert response['days'][0]['date'] == (created - timedelta(days=1)).date().isoformat()
+
+
+def test_lead_and_cycle_time_are_measured_from_creation_and_start(client, headers):
+    created = datetime.utcnow() - timedelta(days=3)
+    client.post('/api/tickets/import', data=json.dumps({
+        'title': 'old', 'description': 'D', 'createdAt': created.isoformat() + '+00:00'}),
+        content_type='application/x-ndjson', headers=headers)
+    [ticket] = client.get('/api/tickets', headers=headers).get_json()['tickets']
+    client.put(f"/api/tickets/{ticket['id']}", json={'status': 'in-progress'}, headers=headers)
+    client.put(f"/api/tickets/{ticket['id']}", json={'status': 'done'}, headers=headers)
+
+    result = client.get('/api/analytics/lead-time', headers=headers).get_json()
+
+    assert result['lead_time']['count'] == 1 and result['lead_time']['p50_days'] == 3.0
+    assert result['lead_time']['average_days'] == pytest.approx(3, abs=0.01)
+    assert result['cycle_time']['count'] == 1 and result['cycle_time']['p50_days'] == pytest.approx(1 / 24, abs=0.001)
+    assert result['throughput'][-1] == {'date': today(), 'count': 1}
+    assert sum(day['count'] for day in result['throughput']) == 1
+
+
+def test_rebuilt_rollups_match_the_live_ones(client, headers, create_ticket):
+    ticket = create_ticket(headers)
+    client.put(f"/api/tickets/{ticket['id']}", json={'status': 'in-progress'}, headers=headers)
+    client.put(f"/api/tickets/{ticket['id']}", json={'status': 'done'}, headers=headers)
+    create_ticket(headers)
+    before = (client.get('/api/analytics/cumulative-flow', headers=headers).get_json(),
+              client.get('/api/analytics/lead-time', headers=headers).get_json())
+
+    with kanban.app.app_context():
+        kanban.rebuild_history_rollups()
+        kanban.db.session.commit()
+
+    assert (client.get('/api/analytics/cumulative-flow', headers=headers).get_json(),
+            client.get('/api/analytics/lead-time', headers=headers).get_json()) == before
+
+
+@pytest.mark.parametrize('query', ['from=yesterday', 'from=2024-02-01&to=2024-01-01',
+                                   'from=2022-01-01&to=2024-01-01'])
+def test_invalid_ranges_are_rejected(client, headers, query):
+    assert client.get(f'/api/analytics/cumulative-flow?{query}', headers=headers).status_code == 400
+    assert client.get(f'/api/analytics/lead-time?{query}', headers=headers).status_code == 400
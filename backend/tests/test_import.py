@@ -0,0 +1,74 @@
+import gzip
+import io
+import json
+
+
+def import_tickets(client, headers, body, query='', content_type='application/x-ndjson', **request_headers):
+    response = client.post(f'/api/tickets/import?{query}', data=body, content_type=content_type,
+                           headers={**headers, **request_headers})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def tickets(client, headers):
+    return client.get('/api/tickets?sort=rank', headers=headers).get_json()['tickets']
+
+
+def test_ndjson_import_reports_bad_lines_and_keeps_the_rest(client, headers):
+    body = '\n'.join([
+        json.dumps({'title': 'first', 'description': 'D', 'status': 'done', 'labels': ['x'],
+                    'createdAt': '2024-01-02T03:04:05+00:00'}),
+        '{not json',
+        json.dumps({'title': 'no description'}),
+        '',
+        json.dumps({'title': 'second', 'description': 'D', 'status': 'blocked'}),
+        json.dumps({'title': 'third', 'description': 'D', 'id': 'ignored'}),
+    ])
+
+    result = import_tickets(client, headers, body, 'chunk_size=1')
+
+    assert (result['imported'], result['failed']) == (2, 3)
+    assert [error['line'] for error in result['errors']] == [2, 3, 5]
+    imported = {ticket['title']: ticket for ticket in tickets(client, headers)}
+    assert set(imported) == {'first', 'third'}
+    assert imported['first']['status'] == 'done' and imported['first']['labels'] == ['x']
+    assert imported['first']['createdAt'].startswith('2024-01-02T03:04:05')
+    assert imported['third']['id'] != 'ignored'
+
+
+def test_csv_import_accepts_comma_separated_labels(client, headers):
+    body = 'title,description,priority,labels\nfrom csv,D,high,"a, b"\n'
+
+    result = import_tickets(client, headers, body, content_type='text/csv')
+
+    assert result['imported'] == 1
+    [ticket] = tickets(client, headers)
+    assert (ticket['title'], ticket['priority'], ticket['labels']) == ('from csv', 'high', ['a', 'b'])
+
+
+def test_export_round_trips_through_import(client, register, create_ticket):
+    source, target = register('source'), register('target')
+    create_ticket(source, 'one', labels=['x', 'y'], priority='low')
+    create_ticket(source, 'two')
+    exported = client.get('/api/tickets/export', headers=source).get_data()
+
+    import_tickets(client, target, gzip.compress(exported), **{'Content-Encoding': 'gzip'})
+
+    def comparable(ticket):
+        return {key: value for key, value in ticket.items() if key not in ('id', 'rank')}
+    assert sorted(map(comparable, tickets(client, target)), key=lambda t: t['title']) == \
+        sorted(map(comparable, tickets(client, source)), key=lambda t: t['title'])
+
+
+def test_multipart_upload_is_read_from_the_file_field(client, headers):
+    data = {'file': (io.BytesIO(b'{"title": "uploaded", "description": "D"}\n'), 'tickets.ndjson')}
+
+    result = import_tickets(client, headers, data, content_type='multipart/form-data')
+
+    assert result['imported'] == 1
+
+
+def test_invalid_arguments_are_rejected(client, headers):
+    for query in ('format=xml', 'chunk_size=0', 'chunk_size=x'):
+        response = client.post(f'/api/tickets/import?{query}', data='', headers=headers)
+        assert response.status_code == 400, query
@@ -0,0 +1,198 @@
+import itertools
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as kanban
+from jobs import FAILED, QUEUED, RUNNING, WorkerPool, retry_delay
+
+queue = kanban.job_queue
+task_numbers = itertools.count(1)
+
+
+@pytest.fixture
+def task(monkeypatch):
+    """Register a task under a fresh name; returns (name, calls)."""
+    def task(function=lambda **payload: None):
+        name = f'test-task-{next(task_numbers)}'
+        calls = []
+
+        def run(**payload):
+            calls.append(payload)
+            function(**payload)
+
+        monkeypatch.setitem(queue.tasks, name, run)
+        return name, calls
+    return task
+
+
+def enqueue(name, **kwargs):
+    with kanban.app.app_context():
+        job = queue.enqueue(name, **kwargs)
+        kanban.db.session.commit()
+        return job and job.id
+
+
+def jobs(name):
+    with kanban.app.app_context():
+        return kanban.db.session.execute(
+            kanban.db.select(kanban.Job).where(kanban.Job.name == name).order_by(kanban.Job.id)
+        ).scalars().all()
+
+
+def test_jobs_run_with_their_payload_and_are_deleted(task):
+    name, calls = task()
+    enqueue(name, board_id=7, status='done')
+
+    assert queue.run_pending() >= 1
+    assert calls == [{'board_id': 7, 'status': 'done'}]
+    assert jobs(name) == []
+
+
+def test_jobs_exist_only_if_their_transaction_commits(task):
+    name, calls = task()
+    with kanban.app.app_context():
+        queue.enqueue(name)
+        kanban.db.session.rollback()
+
+    queue.run_pending()
+
+    assert calls == [] and jobs(name) == []
+
+
+def test_delayed_jobs_wait_for_their_time(task):
+    name, calls = task()
+    enqueue(name, delay=60)
+
+    queue.run_pending()
+
+    assert calls == [] and [job.status for job in jobs(name)] == [QUEUED]
+
+
+def test_keyed_jobs_are_queued_once(task):
+    name, calls = task()
+
+    assert enqueue(name, key='rebalance:1', n=1) is not None
+    assert enqueue(name, key='rebalance:1', n=2) is None
+    queue.run_pending()
+    # Once the first has run, the key is free again
+    assert enqueue(name, key='rebalance:1', n=3) is not None
+    queue.run_pending()
+
+    assert calls == [{'n': 1}, {'n': 3}]
+
+
+def test_unknown_tasks_are_refused():
+    with kanban.app.app_context(), pytest.raises(ValueError):
+        queue.enqueue('no-such-task')
+
+
+def test_failing_jobs_are_retried_then_kept_as_failed(task, monkeypatch):
+    def fail(**payload):
+        raise RuntimeError('boom')
+
+    name, calls = task(fail)
+    monkeypatch.setattr(queue, 'retry_base', 0)
+    before = kanban.jobs_finished.value(task=name, outcome='retry')
+    enqueue(name, max_attempts=3)
+
+    queue.run_pending()
+
+    [job] = jobs(name)
+    assert len(calls) == 3
+    assert (job.status, job.attempts, job.locked_by) == (FAILED, 3, None)
+    assert 'RuntimeError: boom' in job.last_error
+    assert kanban.jobs_finished.value(task=name, outcome='retry') == before + 2
+    assert kanban.jobs_finished.value(task=name, outcome='failed') == 1
+
+
+def test_retries_back_off(task):
+    def fail_once(**payload):
+        if len(calls) == 1:
+            raise RuntimeError('try again')
+
+    name, calls = task(fail_once)
+    enqueue(name)
+
+    queue.run_pending()
+    [job] = jobs(name)
+    assert job.status == QUEUED and job.attempts == 1 and job.run_at > datetime.utcnow()
+
+    with kanban.app.app_context():
+        kanban.db.session.execute(kanban.db.update(kanban.Job).where(kanban.Job.id == job.id)
+                                  .values(run_at=datetime.utcnow()))
+        kanban.db.session.commit()
+    queue.run_pending()
+    assert len(calls) == 2 and jobs(name) == []
+
+
+def test_retry_delays_grow_up_to_the_cap():
+    for attempts in range(1, 10):
+        assert 0.5 * min(60, 2 ** attempts) <= retry_delay(attempts, 2, 60) <= min(60, 2 ** attempts)
+
+
+def test_expired_leases_are_requeued(task):
+    name, calls = task()
+    requeued, exhausted = enqueue(name), enqueue(name, max_attempts=1)
+    stale = datetime.utcnow() - queue.lease - timedelta(seconds=1)
+    with kanban.app.app_context():
+        kanban.db.session.execute(
+            kanban.db.update(kanban.Job).where(kanban.Job.name == name)
+            .values(status=RUNNING, attempts=1, locked_by='dead-worker', locked_at=stale))
+        kanban.db.session.commit()
+
+        assert queue.release_expired() == 1
+
+    statuses = {job.id: (job.status, job.last_error) for job in jobs(name)}
+    assert statuses == {requeued: (QUEUED, 'Lease expired'), exhausted: (FAILED, 'Lease expired')}
+    queue.run_pending()
+    assert len(calls) == 1
+
+
+def test_running_jobs_keep_their_lease(task, monkeypatch):
+    monkeypatch.setattr(queue, 'lease', timedelta(seconds=0.3))
+    released = []
+
+    def outlive_the_lease():
+        time.sleep(1)
+        released.append(queue.release_expired())
+
+    name, calls = task(outlive_the_lease)
+    enqueue(name)
+
+    queue.run_pending()
+    assert released == [0]
+    assert len(calls) == 1 and jobs(name) == []
+
+
+def test_lease_renewal_stops_once_the_job_is_lost(task):
+    name, _ = task()
+    job_id = enqueue(name)
+    with kanban.app.app_context():
+        kanban.db.session.execute(
+            kanban.db.update(kanban.Job).where(kanban.Job.id == job_id)
+            .values(status=RUNNING, attempts=1, locked_by='worker-a', locked_at=datetime.utcnow()))
+        kanban.db.session.commit()
+
+        assert queue.renew(job_id, 'worker-a')
+        assert not queue.renew(job_id, 'worker-b')
+        kanban.db.session.execute(
+            kanban.db.update(kanban.Job).where(kanban.Job.id == job_id).values(status=QUEUED, locked_by=None))
+        kanban.db.session.commit()
+        assert not queue.renew(job_id, 'worker-a')
+
+
+def test_worker_pool_runs_jobs_as_they_commit(task):
+    name, calls = task()
+    pool = WorkerPool(queue, concurrency=2, poll_interval=5, name='test-pool').start()
+    try:
+        enqueue(name)
+        deadline = time.monotonic() + 5
+        while not calls and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        pool.stop(timeout=10)
+
+    # The commit wakes the pool well before its next poll
+    assert calls == [{}]
@@ -0,0 +1,45 @@
+def titles(response):
+    return [ticket['title'] for ticket in response.get_json()['tickets']]
+
+
+def test_labels_keep_their_order_without_duplicates(client, headers, create_ticket):
+    ticket = create_ticket(headers, labels=['bug', 'ui', 'bug'])
+
+    assert ticket['labels'] == ['bug', 'ui']
+    fetched = client.get(f"/api/tickets/{ticket['id']}", headers=headers).get_json()['ticket']
+    assert fetched['labels'] == ['bug', 'ui']
+
+
+def test_every_label_filter_must_match(client, headers, create_ticket):
+    create_ticket(headers, 'bug', labels=['bug'])
+    create_ticket(headers, 'ui bug', labels=['ui', 'bug'])
+    create_ticket(headers, 'ui', labels=['ui'])
+
+    assert titles(client.get('/api/tickets?label=bug', headers=headers)) == ['ui bug', 'bug']
+    assert titles(client.get('/api/tickets?label=bug&label=ui', headers=headers)) == ['ui bug']
+    assert titles(client.get('/api/tickets?label=missing', headers=headers)) == []
+
+
+def test_label_counts_follow_relabelling(client, headers, create_ticket):
+    create_ticket(headers, labels=['bug'])
+    ticket = create_ticket(headers, labels=['bug', 'ui'])
+    client.put(f"/api/tickets/{ticket['id']}", json={'labels': ['ui', 'docs']}, headers=headers)
+
+    labels = client.get('/api/labels', headers=headers).get_json()['labels']
+
+    assert labels == [{'name': 'bug', 'count': 1}, {'name': 'docs', 'count': 1}, {'name': 'ui', 'count': 1}]
+
+
+def test_labels_are_per_board(client, register, create_ticket):
+    alice, bob = register('alice'), register('bob')
+    create_ticket(alice, labels=['private'])
+
+    assert client.get('/api/labels', headers=bob).get_json()['labels'] == []
+    assert titles(client.get('/api/tickets?label=private', headers=bob)) == []
+
+
+def test_invalid_labels_are_rejected(client, headers):
+    for labels in ('bug', [''], [1], ['x' * 101]):
+        response = client.post('/api/tickets', json={'title': 'T', 'description': 'D', 'labels': labels},
+                               headers=headers)
+        assert response.status_code == 400, labels
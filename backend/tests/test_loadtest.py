@@ -0,0 +1,79 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+
+import pytest
+
+import app as kanban
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+import loadtest  # noqa: E402
+
+prefixes = itertools.count(1)
+
+
+def run_args(**overrides):
+    settings = dict(users=2, tickets_per_user=20, requests=40, duration=None, warmup=0, concurrency=2,
+                    mix=loadtest.DEFAULT_MIX, seed=1, prefix=f'loadtest{next(prefixes)}')
+    settings.update(overrides)
+    return argparse.Namespace(**settings)
+
+
+def test_mix_weights_are_parsed():
+    assert loadtest.parse_mix('board=3,move') == {'board': 3.0, 'move': 1.0}
+    with pytest.raises(argparse.ArgumentTypeError):
+        loadtest.parse_mix('board=1,upload=2')
+
+
+def test_seeded_workload_drives_every_operation_in_process():
+    args = run_args()
+    workload, _ = loadtest.seed(kanban, args)
+
+    assert [username for _, username, _ in workload.users] == [f'{args.prefix}_0', f'{args.prefix}_1']
+    assert all(len(pool) == 20 for pool in workload.pools.values())
+
+    results, elapsed = loadtest.drive(lambda: loadtest.InProcessClient(kanban.app), workload,
+                                      loadtest.parse_mix(args.mix), args)
+    summary = loadtest.summarize(results, elapsed)
+
+    assert set(summary) == {'board', 'move', 'create', 'delete', 'login', 'all'}
+    assert summary['all']['requests'] == sum(len(samples) for samples in results.values())
+    assert summary['all']['errors'] == 0, {name: stats['statuses'] for name, stats in summary.items()}
+    assert summary['all']['p50'] <= summary['all']['p95'] <= summary['all']['p99'] <= summary['all']['max']
+
+
+def test_the_same_seed_replays_the_same_operations():
+    def operations(seed):
+        args = run_args(seed=seed, mix='board=1,login=1', requests=10, concurrency=1)
+        workload, _ = loadtest.seed(kanban, args)
+        results, _ = loadtest.drive(lambda: loadtest.InProcessClient(kanban.app), workload,
+                                    loadtest.parse_mix(args.mix), args)
+        return {name: len(samples) for name, samples in results.items()}
+
+    assert operations(7) == operations(7)
+
+
+def test_summaries_count_error_statuses():
+    summary = loadtest.summarize_samples([(0.010, 200), (0.020, 404), (0.030, 599)], elapsed=1.0)
+
+    assert summary['requests'] == 3 and summary['errors'] == 2
+    assert summary['statuses'] == {'200': 1, '404': 1, '599': 1}
+    assert loadtest.summarize_samples([], elapsed=1.0)['requests'] == 0
+
+
+def test_saved_runs_are_compared(tmp_path, capsys):
+    def save(name, throughput, p95):
+        stats = {'requests': 10, 'errors': 0, 'throughput': throughput, 'p50': 1.0, 'p95': p95, 'p99': 9.0}
+        path = tmp_path / f'{name}.json'
+        path.write_text(json.dumps({
+            'label': name, 'recorded_at': 'now', 'settings': {'users': 1, 'tickets_per_user': 1, 'mix': 'board=1'},
+            'endpoints': {'board': stats}}))
+        return str(path)
+
+    loadtest.compare(argparse.Namespace(baseline=save('old', 100.0, 4.0), candidate=save('new', 150.0, 2.0)))
+    output = capsys.readouterr().out
+
+    assert '   board throughput     100.0      150.0    +50.0%' in output
+    assert '   board     p95       4.0        2.0    -50.0%' in output
@@ -0,0 +1,72 @@
+import os
+
+import app as kanban
+from metrics import Histogram, MetricsRegistry
+
+
+def test_requests_are_counted_per_endpoint(client, headers):
+    latency = kanban.request_latency
+    before = latency.count(method='GET', endpoint='get_tickets', status=200)
+
+    client.get('/api/tickets', headers=headers)
+
+    assert latency.count(method='GET', endpoint='get_tickets', status=200) == before + 1
+    assert kanban.request_sql_queries.count(endpoint='get_tickets') >= 1
+
+
+def test_metrics_render_in_prometheus_format(client):
+    body = client.get('/api/metrics').get_data(as_text=True)
+
+    assert '# TYPE kanban_http_request_duration_seconds histogram' in body
+    assert 'kanban_http_request_duration_seconds_bucket{' in body
+
+
+def test_metrics_token_is_enforced_when_set(client, monkeypatch):
+    monkeypatch.setitem(kanban.app.config, 'METRICS_TOKEN', 'scrape-me')
+
+    assert client.get('/api/metrics').status_code == 401
+    assert client.get('/api/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert client.get('/api/metrics', headers={'Authorization': 'Bearer scrape-me'}).status_code == 200
+
+
+def test_server_timing_reports_sql_statements(client, headers, monkeypatch):
+    monkeypatch.setitem(kanban.app.config, 'SERVER_TIMING', True)
+
+    timing = client.get('/api/tickets', headers=headers).headers['Server-Timing']
+
+    assert timing.startswith('sql;dur=') and 'total;dur=' in timing
+
+
+def test_repeated_statements_are_flagged_as_n_plus_one(client, headers, create_ticket, monkeypatch):
+    monkeypatch.setitem(kanban.app.config, 'N_PLUS_ONE_THRESHOLD', 2)
+    before = kanban.n_plus_one_warnings.value(endpoint='create_ticket')
+
+    # Each label is looked up and linked with statements of the same shape
+    create_ticket(headers, labels=['a', 'b', 'c'])
+    create_ticket(headers)
+
+    assert kanban.n_plus_one_warnings.value(endpoint='create_ticket') > before
+
+
+def test_sampled_requests_write_a_profile(client, headers, monkeypatch, tmp_path):
+    monkeypatch.setitem(kanban.app.config, 'PROFILE_SAMPLE_RATE', 1.0)
+    monkeypatch.setitem(kanban.app.config, 'PROFILE_DIR', str(tmp_path))
+
+    client.get('/api/tickets', headers=headers)
+
+    [profile] = os.listdir(tmp_path)
+    assert '-get_tickets-' in profile and profile.endswith('.folded')
+
+
+def test_histograms_count_into_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('test_seconds', 'Test.', ('route',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value, route='r')
+
+    lines = registry.render().splitlines()
+
+    assert isinstance(histogram, Histogram) and histogram.count(route='r') == 3
+    assert 'test_seconds_bucket{route="r",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{route="r",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{route="r",le="+Inf"} 3' in lines
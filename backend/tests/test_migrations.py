@@ -0,0 +1,146 @@
+import threading
+
+import pytest
+import sqlalchemy as sa
+from flask import Flask
+
+import app as kanban
+from migrations import Migrations, SchemaOutOfDate, add_column, index_columns, reconcile_indexes, schema_migration
+
+# The two tables as the first release of the app created them
+ORIGINAL_SCHEMA = (
+    'CREATE TABLE user (id INTEGER PRIMARY KEY, username VARCHAR(80) UNIQUE NOT NULL, '
+    'email VARCHAR(120) UNIQUE NOT NULL, password_hash VARCHAR(128) NOT NULL, created_at DATETIME)',
+    'CREATE TABLE ticket (id VARCHAR(36) PRIMARY KEY, title VARCHAR(200) NOT NULL, description TEXT NOT NULL, '
+    'priority VARCHAR(20) NOT NULL, status VARCHAR(20) NOT NULL, labels TEXT, '
+    'user_id INTEGER NOT NULL REFERENCES user(id), created_at DATETIME, updated_at DATETIME)',
+)
+
+
+@pytest.fixture
+def other_app(tmp_path):
+    """A second app whose db is an empty SQLite file; returns (app, engine)."""
+    url = f"sqlite:///{tmp_path / 'other.db'}"
+    other = Flask('other')
+    other.config['SQLALCHEMY_DATABASE_URI'] = url
+    kanban.db.init_app(other)
+    engine = sa.create_engine(url)
+    yield other, engine
+    engine.dispose()
+    with other.app_context():
+        kanban.db.engine.dispose()
+
+
+def test_the_database_is_at_head():
+    with kanban.app.app_context():
+        migrations = kanban.schema_migrations
+        assert migrations.current_version() == migrations.head
+        assert migrations.pending() == []
+        with kanban.db.engine.connect() as connection:
+            versions = connection.execute(sa.select(schema_migration.c.version)).scalars().all()
+        assert sorted(versions) == list(range(1, migrations.head + 1))
+
+        # Nothing is left to run a second time
+        assert migrations.upgrade(report=lambda line: None) == 0
+        assert migrations.ensure_current(migrate=False) == migrations.head
+
+
+@pytest.mark.parametrize('stopped_at', [None, 1, 5], ids=['fresh', 'at-1', 'at-5'])
+def test_original_databases_are_migrated_in_place(other_app, stopped_at):
+    other, engine = other_app
+    with engine.begin() as connection:
+        for statement in ORIGINAL_SCHEMA:
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql("INSERT INTO user VALUES (1, 'old', 'old@example.com', 'x', '2024-01-01')")
+        connection.exec_driver_sql(
+            "INSERT INTO ticket VALUES ('t1', 'Old', 'D', 'high', 'done', '[\"bug\", \"ui\"]', 1, "
+            "'2024-01-02', '2024-01-03')")
+
+    with other.app_context():
+        migrations, db = kanban.schema_migrations, kanban.db
+        assert migrations.current_version() == 0
+        if stopped_at is not None:
+            # An upgrade interrupted before migration 9 has skipped the board-keyed steps
+            migrations.upgrade(target=stopped_at, report=lambda line: None)
+            assert kanban.boards_pending()
+        assert migrations.ensure_current() == migrations.head
+
+        ticket = db.session.get(kanban.Ticket, 't1')
+        assert ticket.board_id == 1 and ticket.rank and ticket.to_dict()['labels'] == ['bug', 'ui']
+        assert db.session.get(kanban.BoardMember, (1, 1)).role == 'owner'
+        assert db.session.execute(db.select(kanban.TicketCount.count)).scalars().all() == [1]
+        assert db.session.execute(db.select(kanban.TicketSearch.ticket_id)).scalars().all() == ['t1']
+        assert db.session.execute(db.select(kanban.TicketTransition.new_value)).scalars().all() == ['done']
+        assert 'user_id' not in {column['name'] for column in sa.inspect(db.engine).get_columns('ticket')}
+        assert migrations.upgrade(report=lambda line: None) == 0
+
+
+def test_upgrades_stop_at_the_target_and_resume(other_app):
+    other, _ = other_app
+    migrations = Migrations(kanban.db)
+    ran = []
+    for version in (1, 2, 3):
+        migrations.migration(version, f'Step {version}')(lambda version=version: ran.append(version))
+
+    with other.app_context():
+        assert migrations.upgrade(target=2, report=lambda line: None) == 2
+        assert migrations.current_version() == 2
+        assert migrations.pending() == [(3, 'Step 3')]
+        assert migrations.upgrade(report=lambda line: None) == 1
+    assert ran == [1, 2, 3]
+
+
+def test_schema_mismatches_are_refused(other_app):
+    other, _ = other_app
+    older, newer = Migrations(kanban.db), Migrations(kanban.db)
+    for migrations, versions in ((older, (1,)), (newer, (1, 2))):
+        for version in versions:
+            migrations.migration(version, f'Step {version}')(lambda: None)
+
+    with other.app_context():
+        with pytest.raises(SchemaOutOfDate, match='needs 2'):
+            newer.ensure_current(migrate=False)
+        assert newer.current_version() == 0
+
+        newer.upgrade(report=lambda line: None)
+        # An older release must not write to a schema it doesn't know
+        with pytest.raises(SchemaOutOfDate, match='newer than this release'):
+            older.ensure_current()
+
+
+def test_versions_are_registered_once():
+    migrations = Migrations(kanban.db)
+    migrations.migration(1, 'First')(lambda: None)
+
+    with pytest.raises(ValueError):
+        migrations.migration(1, 'Again')(lambda: None)
+
+
+def test_requests_get_503_until_the_schema_is_current(client, monkeypatch):
+    head = kanban.schema_migrations.head
+    monkeypatch.setitem(kanban.schema_migrations.steps, head + 1, ('Not applied yet', lambda: None))
+    monkeypatch.setitem(kanban.app.config, 'MIGRATE_ON_START', False)
+    monkeypatch.setattr(kanban, 'app_initialized', threading.Event())
+
+    response = client.get('/api/health')
+
+    assert response.status_code == 503
+    assert f'needs {head + 1}' in response.get_json()['error']
+
+
+def test_schema_helpers_skip_changes_already_made(other_app):
+    _, engine = other_app
+    metadata = sa.MetaData()
+    table = sa.Table('item', metadata, sa.Column('id', sa.Integer, primary_key=True),
+                     sa.Column('name', sa.String(50)), sa.Index('idx_item_name', 'name'))
+    with engine.begin() as connection:
+        connection.exec_driver_sql('CREATE TABLE item (id INTEGER PRIMARY KEY)')
+
+    assert add_column(engine, 'item', sa.Column('name', sa.String(50)))
+    assert not add_column(engine, 'item', sa.Column('name', sa.String(50)))
+    with engine.begin() as connection:
+        connection.exec_driver_sql('CREATE INDEX old_name_index ON item (name)')
+
+    # The undeclared twin is renamed rather than duplicated
+    assert reconcile_indexes(engine, table) == []
+    assert index_columns(engine, 'item') == {'idx_item_name': (('name',), False)}
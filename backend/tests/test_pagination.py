@@ -0,0 +1,51 @@
+def list_pages(client, headers, query=''):
+    """Follow next_cursor to the end; returns the pages' ticket titles."""
+    pages, cursor = [], None
+    while True:
+        url = f'/api/tickets?{query}' + (f'&cursor={cursor}' if cursor else '')
+        body = client.get(url, headers=headers).get_json()
+        pages.append([ticket['title'] for ticket in body['tickets']])
+        cursor = body['next_cursor']
+        if cursor is None:
+            return pages
+
+
+def test_pages_cover_every_ticket_once_newest_first(client, headers, create_ticket):
+    for index in range(7):
+        create_ticket(headers, f't{index}')
+
+    pages = list_pages(client, headers, 'limit=3')
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert sum(pages, []) == [f't{index}' for index in reversed(range(7))]
+
+
+def test_cursor_is_stable_when_tickets_are_added_ahead_of_it(client, headers, create_ticket):
+    for index in range(4):
+        create_ticket(headers, f't{index}')
+    first = client.get('/api/tickets?limit=2', headers=headers).get_json()
+
+    # Newer tickets land before the cursor, so the next page neither repeats nor skips
+    create_ticket(headers, 'newer')
+    second = client.get(f"/api/tickets?limit=2&cursor={first['next_cursor']}", headers=headers).get_json()
+
+    assert [ticket['title'] for ticket in first['tickets']] == ['t3', 't2']
+    assert [ticket['title'] for ticket in second['tickets']] == ['t1', 't0']
+    assert second['next_cursor'] is None
+
+
+def test_filters_combine(client, headers, create_ticket):
+    create_ticket(headers, 'high todo', priority='high')
+    create_ticket(headers, 'low todo', priority='low')
+    done = create_ticket(headers, 'high done', priority='high')
+    client.put(f"/api/tickets/{done['id']}", json={'status': 'done'}, headers=headers)
+
+    assert list_pages(client, headers, 'priority=high') == [['high done', 'high todo']]
+    assert list_pages(client, headers, 'priority=high&status=todo') == [['high todo']]
+    assert list_pages(client, headers, 'status=todo,done&priority=low') == [['low todo']]
+
+
+def test_invalid_arguments_are_rejected(client, headers):
+    for query in ('limit=0', 'limit=501', 'limit=x', 'status=blocked', 'cursor=not-a-cursor', 'sort=title'):
+        response = client.get(f'/api/tickets?{query}', headers=headers)
+        assert response.status_code == 400, query
@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+
+import app as kanban
+from password_hashing import PasswordHasher, PasswordHasherBusy
+
+
+def login(client, username, password):
+    return client.post('/api/login', json={'username': username, 'password': password})
+
+
+def stored_hash(username):
+    with kanban.app.app_context():
+        return kanban.User.query.filter_by(username=username).one().password_hash
+
+
+def test_passwords_over_72_bytes_are_refused(client):
+    # 37 two-byte characters: under 72 characters, over 72 bytes
+    for password in ('é' * 37, 'x' * 73):
+        response = client.post('/api/register', json={'username': 'long', 'email': 'long@example.com',
+                                                      'password': password})
+        assert response.status_code == 400
+        assert login(client, 'long', password).status_code == 400
+
+
+def test_a_72_byte_password_works(client):
+    password = 'x' * 72
+    client.post('/api/register', json={'username': 'exact72', 'email': 'exact72@example.com', 'password': password})
+
+    assert login(client, 'exact72', password).status_code == 200
+    assert login(client, 'exact72', password[:71]).status_code == 401
+
+
+def test_login_upgrades_hashes_made_with_other_rounds(client, monkeypatch):
+    client.post('/api/register', json={'username': 'rehash', 'email': 'rehash@example.com', 'password': 'secret'})
+    assert stored_hash('rehash').startswith('$2b$04$')
+
+    monkeypatch.setattr(kanban.password_hasher, 'rounds', 5)
+    assert login(client, 'rehash', 'secret').status_code == 200
+
+    assert stored_hash('rehash').startswith('$2b$05$')
+    assert login(client, 'rehash', 'secret').status_code == 200
+
+
+def test_a_busy_hasher_answers_503_with_retry_after(client, monkeypatch):
+    def busy(*args):
+        raise PasswordHasherBusy(7)
+    monkeypatch.setattr(kanban.password_hasher, '_run', busy)
+
+    response = client.post('/api/register', json={'username': 'busy', 'email': 'busy@example.com',
+                                                  'password': 'secret'})
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '7'
+
+
+def test_hasher_refuses_work_beyond_its_queue():
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=1)
+    release = threading.Event()
+    blocked = threading.Thread(target=hasher._run, args=(release.wait,))
+    blocked.start()
+    try:
+        while hasher.pending < 1:
+            pass
+        with pytest.raises(PasswordHasherBusy) as busy:
+            hasher.hash('secret')
+        assert busy.value.retry_after >= 1
+    finally:
+        release.set()
+        blocked.join()
+    assert hasher.verify('secret', hasher.hash('secret'))
+    assert not hasher.verify('secret', 'not a hash')
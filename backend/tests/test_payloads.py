@@ -0,0 +1,84 @@
+import gzip
+
+import pytest
+
+import app as kanban
+import compression
+
+
+@pytest.fixture
+def board(headers, create_ticket):
+    """Three tickets with descriptions long enough to compress."""
+    for index in range(3):
+        create_ticket(headers, f'Ticket {index}', description='A long description. ' * 40, labels=['bug'])
+    return headers
+
+
+def test_fields_pick_ticket_fields(client, board):
+    tickets = client.get('/api/tickets?fields=title,priority', headers=board).get_json()['tickets']
+
+    # id is always included
+    assert [set(ticket) for ticket in tickets] == [{'id', 'title', 'priority'}] * 3
+
+
+def test_summary_view_returns_card_fields(client, board):
+    tickets = client.get('/api/tickets?view=summary', headers=board).get_json()['tickets']
+    columns = client.get('/api/board/summary?view=summary', headers=board).get_json()['columns']
+
+    assert set(tickets[0]) == set(kanban.SUMMARY_FIELDS) and tickets[0]['labels'] == ['bug']
+    assert set(columns['todo']['tickets'][0]) == set(kanban.SUMMARY_FIELDS)
+
+
+@pytest.mark.parametrize('query', ['fields=title,secret', 'view=tiny', 'fields=title&view=summary'])
+def test_invalid_projections_are_rejected(client, headers, query):
+    assert client.get(f'/api/tickets?{query}', headers=headers).status_code == 400
+
+
+def test_projected_pages_keep_their_cursors(client, board):
+    first = client.get('/api/tickets?fields=title&limit=2', headers=board).get_json()
+    second = client.get(f"/api/tickets?fields=title&limit=2&cursor={first['next_cursor']}",
+                        headers=board).get_json()
+
+    titles = [ticket['title'] for ticket in first['tickets'] + second['tickets']]
+    assert titles == ['Ticket 2', 'Ticket 1', 'Ticket 0'] and second['next_cursor'] is None
+
+
+def test_large_responses_are_gzipped_when_accepted(client, board):
+    plain = client.get('/api/tickets', headers=board)
+    compressed = client.get('/api/tickets', headers={**board, 'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in plain.headers and plain.headers['Vary'] == 'Accept-Encoding'
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert len(compressed.get_data()) < len(plain.get_data())
+    assert gzip.decompress(compressed.get_data()) == plain.get_data()
+
+
+def test_small_responses_are_not_compressed(client, headers, create_ticket):
+    create_ticket(headers)
+
+    response = client.get('/api/tickets?fields=title', headers={**headers, 'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_compressed_responses_revalidate_with_weak_etags(client, board):
+    accept = {**board, 'Accept-Encoding': 'gzip'}
+    etag = client.get('/api/tickets', headers=accept).headers['ETag']
+
+    assert etag.startswith('W/')
+    assert client.get('/api/tickets', headers={**accept, 'If-None-Match': etag}).status_code == 304
+
+
+def test_brotli_is_preferred_when_installed(client, board, monkeypatch):
+    class FakeBrotli:
+        @staticmethod
+        def compress(data, quality):
+            return b'br:' + data[:10]
+
+    monkeypatch.setattr(compression, 'brotli', FakeBrotli)
+
+    response = client.get('/api/tickets', headers={**board, 'Accept-Encoding': 'gzip, br'})
+
+    assert response.headers['Content-Encoding'] == 'br' and response.get_data().startswith(b'br:')
+    response = client.get('/api/tickets', headers={**board, 'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
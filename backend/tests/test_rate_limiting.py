@@ -0,0 +1,138 @@
+import pytest
+
+import app as kanban
+from rate_limiting import (AdmissionController, FakeRedisTokenBucket, MemoryRateLimitStore, Overloaded,
+                           RateLimiter, RedisRateLimitStore, parse_rate, parse_rules, take_token)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def limit(monkeypatch, ip_rules='', user_rules='', store=None):
+    limiter = RateLimiter(store or MemoryRateLimitStore(), ip_rules=parse_rules(ip_rules),
+                          user_rules=parse_rules(user_rules))
+    monkeypatch.setattr(kanban, 'rate_limiter', limiter)
+    return limiter
+
+
+def test_rules_are_parsed():
+    assert parse_rules('*=100/second, login=10/minute,') == {'*': (100, 1), 'login': (10, 60)}
+    assert parse_rate('5/day') == (5, 86400)
+    for text in ('login', 'login=10', 'login=0/minute', 'login=10/fortnight'):
+        with pytest.raises(ValueError):
+            parse_rules(text)
+
+
+def test_buckets_refill_at_their_rate():
+    tokens, allowed, wait = take_token(None, None, 0.0, rate=1.0, burst=2)
+    assert (tokens, allowed, wait) == (1, True, 0.0)
+    tokens, allowed, wait = take_token(0.0, 0.0, 0.5, rate=1.0, burst=2)
+    assert (allowed, wait) == (False, 0.5)
+    # Refilling stops at the burst size
+    assert take_token(0.0, 0.0, 60.0, rate=1.0, burst=2) == (1, True, 0.0)
+
+
+@pytest.mark.parametrize('make_store', [
+    lambda clock: MemoryRateLimitStore(clock=clock),
+    lambda clock: RedisRateLimitStore(FakeRedisTokenBucket(clock=clock)),
+], ids=['memory', 'redis'])
+def test_stores_allow_a_burst_then_the_rate(make_store):
+    clock = Clock()
+    store = make_store(clock)
+
+    assert [store.take('k', 0.5, 2)[0] for _ in range(3)] == [True, True, False]
+    assert store.take('k', 0.5, 2) == (False, 2.0)
+    assert store.take('other', 0.5, 2)[0]
+    clock.now += 2
+    assert store.take('k', 0.5, 2) == (True, 0.0)
+
+
+def test_memory_store_keeps_the_most_recent_buckets():
+    store = MemoryRateLimitStore(max_keys=2, clock=Clock())
+    store.take('a', 1, 1)
+    store.take('b', 1, 1)
+    store.take('c', 1, 1)
+
+    # 'a' was evicted and comes back full
+    assert store.take('a', 1, 1)[0] and not store.take('c', 1, 1)[0]
+
+
+def test_requests_over_the_limit_get_429_with_retry_after(client, monkeypatch):
+    limit(monkeypatch, ip_rules='*=2/minute')
+    before = kanban.requests_refused.value(endpoint='login', reason='rate_limit')
+
+    responses = [client.post('/api/login', json={}) for _ in range(3)]
+
+    assert [response.status_code for response in responses[:2]] == [400, 400]
+    assert responses[2].status_code == 429 and responses[2].headers['Retry-After'] == '30'
+    assert kanban.requests_refused.value(endpoint='login', reason='rate_limit') == before + 1
+    # Limits are per address
+    assert client.post('/api/login', json={}, environ_base={'REMOTE_ADDR': '10.0.0.2'}).status_code == 400
+
+
+def test_health_and_metrics_are_never_limited(client, monkeypatch):
+    limit(monkeypatch, ip_rules='*=1/minute')
+
+    for _ in range(3):
+        assert client.get('/api/health').status_code == 200
+        assert client.get('/api/metrics').status_code == 200
+
+
+def test_endpoint_rules_have_their_own_buckets(client, monkeypatch):
+    limit(monkeypatch, ip_rules='*=2/minute,login=1/minute')
+
+    assert client.post('/api/login', json={}).status_code == 400
+    assert client.post('/api/login', json={}).status_code == 429
+    assert client.post('/api/register', json={}).status_code == 400
+
+
+def test_user_limits_follow_the_account_across_addresses(client, headers, monkeypatch):
+    limit(monkeypatch, ip_rules='*=100/minute', user_rules='*=2/minute')
+
+    statuses = [client.get('/api/tickets', headers=headers, environ_base={'REMOTE_ADDR': f'10.0.0.{index}'})
+                .status_code for index in range(3)]
+
+    assert statuses == [200, 200, 429]
+
+
+def test_store_failures_let_requests_through(client, monkeypatch):
+    class BrokenStore:
+        def take(self, key, rate, burst, cost=1):
+            raise ConnectionError('store unavailable')
+
+    limit(monkeypatch, ip_rules='*=1/minute', store=BrokenStore())
+
+    assert [client.post('/api/login', json={}).status_code for _ in range(2)] == [400, 400]
+
+
+def test_admission_waits_then_refuses():
+    controller = AdmissionController(1, timeout=0.01)
+    controller.acquire()
+    assert controller.in_flight == 1
+
+    with pytest.raises(Overloaded):
+        controller.acquire()
+    controller.release()
+    controller.acquire()
+    assert controller.in_flight == 1
+
+
+def test_requests_past_capacity_get_503_with_retry_after(client, headers, monkeypatch):
+    controller = AdmissionController(1, timeout=0.01)
+    monkeypatch.setattr(kanban, 'admission', controller)
+    controller.acquire()
+
+    response = client.get('/api/tickets', headers=headers)
+    assert response.status_code == 503 and response.headers['Retry-After'] == '1'
+    # Health checks still answer, and report the load
+    assert client.get('/api/health').get_json()['requests_in_flight'] == 1
+
+    controller.release()
+    assert client.get('/api/tickets', headers=headers).status_code == 200
+    # Admitted requests give their slot back when they finish
+    assert controller.in_flight == 0
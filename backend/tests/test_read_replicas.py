@@ -0,0 +1,72 @@
+import time
+
+import pytest
+from flask_jwt_extended import verify_jwt_in_request
+
+import app as kanban
+from db_routing import engine_options, replica_binds
+
+
+@pytest.fixture
+def with_replicas(monkeypatch):
+    """Make the app act as if replicas were configured; reads still reach the primary."""
+    monkeypatch.setitem(kanban.app.config, 'SQLALCHEMY_BINDS', {'replica_0': 'sqlite://'})
+    monkeypatch.setattr(kanban, 'recent_writers', kanban.TTLCache(100, kanban.app.config['REPLICA_STICKY_SECONDS']))
+
+
+def reads_from_replica(headers):
+    """Whether a read_replica view would be sent to a replica for this request."""
+    @kanban.read_replica
+    def view():
+        return kanban.db.session.info.get('replica', False)
+
+    with kanban.app.test_request_context('/api/tickets', headers=headers):
+        verify_jwt_in_request()
+        try:
+            return view()
+        finally:
+            kanban.db.session.remove()
+
+
+def test_writes_hand_the_client_their_time(client, headers, with_replicas):
+    response = client.post('/api/tickets', json={'title': 'T', 'description': 'D'}, headers=headers)
+
+    assert abs(float(response.headers['X-Last-Write']) - time.time()) < 5
+    assert 'X-Last-Write' not in client.get('/api/tickets', headers=headers).headers
+
+
+def test_an_echoed_write_time_keeps_reads_on_the_primary(headers, with_replicas):
+    sticky = kanban.app.config['REPLICA_STICKY_SECONDS']
+
+    assert reads_from_replica(headers) is True
+    assert reads_from_replica({**headers, 'X-Last-Write': str(time.time())}) is False
+    assert reads_from_replica({**headers, 'X-Last-Write': str(time.time() - sticky - 1)}) is True
+    for invalid in ('soon', 'nan', 'inf'):
+        assert reads_from_replica({**headers, 'X-Last-Write': invalid}) is True
+
+
+def test_the_worker_remembers_writers_that_do_not_echo(client, headers, with_replicas):
+    client.post('/api/tickets', json={'title': 'T', 'description': 'D'}, headers=headers)
+
+    assert reads_from_replica(headers) is False
+
+
+def test_without_replicas_writes_add_no_header(client, headers):
+    response = client.post('/api/tickets', json={'title': 'T', 'description': 'D'}, headers=headers)
+
+    assert 'X-Last-Write' not in response.headers
+
+
+def test_replica_binds_share_the_pool_options():
+    binds = replica_binds(['mysql+pymysql://u@replica-a/db', 'mysql+pymysql://u@replica-b/db'], pool_size=7)
+
+    assert sorted(binds) == ['replica_0', 'replica_1']
+    assert binds['replica_1']['url'] == 'mysql+pymysql://u@replica-b/db'
+    assert binds['replica_1']['pool_size'] == 7
+
+
+def test_statement_timeouts_use_the_dialects_setting():
+    options = engine_options('mysql+pymysql://u@h/db', statement_timeout_ms=2000)
+
+    assert options['connect_args'] == {'init_command': 'SET SESSION max_execution_time=2000'}
+    assert 'connect_args' not in engine_options('mysql+pymysql://u@h/db')
@@ -0,0 +1,75 @@
+from search import fold, rank_documents
+
+
+def search(client, headers, query):
+    response = client.get(f'/api/tickets/search?{query}', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def titles(body):
+    return [ticket['title'] for ticket in body['tickets']]
+
+
+def test_title_matches_outrank_description_matches(client, headers, create_ticket):
+    client.post('/api/tickets', json={'title': 'Unrelated', 'description': 'mentions the login page'},
+                headers=headers)
+    create_ticket(headers, 'Login page is slow')
+    create_ticket(headers, 'Nothing to see')
+
+    assert titles(search(client, headers, 'q=login')) == ['Login page is slow', 'Unrelated']
+
+
+def test_every_word_must_match_and_case_and_accents_fold(client, headers, create_ticket):
+    create_ticket(headers, 'Café menu crashes')
+    create_ticket(headers, 'Menu is fine')
+
+    assert titles(search(client, headers, 'q=CAFE menu')) == ['Café menu crashes']
+
+
+def test_labels_are_searched_and_operators_are_literal(client, headers, create_ticket):
+    create_ticket(headers, 'Labelled', labels=['backend'])
+
+    assert titles(search(client, headers, 'q=backend')) == ['Labelled']
+    assert titles(search(client, headers, 'q=backend OR NOT "x*"')) == []
+
+
+def test_results_page_through_a_cursor(client, headers, create_ticket):
+    for index in range(5):
+        create_ticket(headers, f'paged {index}')
+
+    first = search(client, headers, 'q=paged&limit=3')
+    second = search(client, headers, f"q=paged&limit=3&cursor={first['next_cursor']}")
+
+    assert len(titles(first)) == 3 and len(titles(second)) == 2
+    assert set(titles(first)).isdisjoint(titles(second))
+    assert second['next_cursor'] is None
+
+
+def test_other_boards_are_not_searched(client, register, create_ticket):
+    alice, bob = register('alice'), register('bob')
+    create_ticket(alice, 'Secret roadmap')
+
+    assert titles(search(client, bob, 'q=roadmap')) == []
+
+
+def test_edits_and_deletes_update_the_index(client, headers, create_ticket):
+    ticket = create_ticket(headers, 'Before edit')
+    client.put(f"/api/tickets/{ticket['id']}", json={'title': 'After edit'}, headers=headers)
+
+    assert titles(search(client, headers, 'q=before')) == []
+    assert titles(search(client, headers, 'q=after')) == ['After edit']
+    client.delete(f"/api/tickets/{ticket['id']}", headers=headers)
+    assert titles(search(client, headers, 'q=after')) == []
+
+
+def test_queries_without_words_are_rejected(client, headers):
+    for query in ('q=', 'q=%21%21', 'q=x&cursor=abc'):
+        assert client.get(f'/api/tickets/search?{query}', headers=headers).status_code == 400, query
+
+
+def test_rank_documents_weights_fields_and_keeps_ties_in_order():
+    documents = [('a', 'other', 'word'), ('b', 'word', 'other'), ('c', 'other', 'word')]
+
+    assert rank_documents(['word'], documents, [10.0, 1.0]) == ['b', 'a', 'c']
+    assert fold('Crème BRÛLÉE') == 'creme brulee'
@@ -0,0 +1,62 @@
+import json
+import uuid
+from datetime import date, datetime
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+import app as kanban
+
+
+def test_list_rows_serialize_like_ticket_to_dict(client, headers, create_ticket):
+    created = [create_ticket(headers, f't{index}', priority='high', labels=['b', 'a']) for index in range(3)]
+
+    listed = client.get('/api/tickets', headers=headers).get_json()['tickets']
+
+    with kanban.app.app_context():
+        expected = [kanban.db.session.get(kanban.Ticket, ticket['id']).to_dict() for ticket in reversed(created)]
+    assert listed == expected
+
+
+def test_fast_provider_matches_the_default_output():
+    payload = {
+        'tickets': [{'title': 'Café ☕', 'labels': ['ü', 'x'], 'count': 3, 'done': None}],
+        'at': datetime(2024, 1, 2, 3, 4, 5),
+        'nested': {'b': 1, 'a': [True, False]},
+    }
+    fast = kanban.FastJSONProvider(kanban.app)
+    default = DefaultJSONProvider(kanban.app)
+
+    assert fast.dumps(payload) == default.dumps(payload)
+    assert json.loads(fast.dumps(payload))['tickets'][0]['title'] == 'Café ☕'
+
+
+def test_fast_provider_matches_the_default_for_compact_responses(monkeypatch):
+    """jsonify's compact, sorted, ASCII case is the one orjson encodes."""
+    pytest.importorskip('orjson')
+    payload = {
+        'tickets': [{'title': 'Plain "quoted" \\ text\n', 'labels': ['b', 'a'], 'count': 3, 'done': None,
+                     'id': uuid.UUID('12345678-1234-5678-1234-567812345678')}],
+        'next_cursor': None,
+        'at': datetime(2024, 1, 2, 3, 4, 5),
+        'day': date(2024, 1, 2),
+        'nested': {'z': {'b': 1, 'a': [True, False, -7]}, 'a': {}},
+    }
+    expected = DefaultJSONProvider(kanban.app).dumps(payload, separators=(',', ':'))
+    fast = kanban.FastJSONProvider(kanban.app)
+
+    # With the fallback out of the way, only orjson can produce the output
+    def fallback(self, obj, **kwargs):
+        raise AssertionError('fell back to json.dumps')
+
+    monkeypatch.setattr(DefaultJSONProvider, 'dumps', fallback)
+    assert fast.dumps(payload, separators=(',', ':')) == expected
+
+
+def test_fast_provider_falls_back_for_non_ascii_compact_responses():
+    payload = {'title': 'Café ☕', 'b': 1, 'a': 2}
+
+    fast = kanban.FastJSONProvider(kanban.app).dumps(payload, separators=(',', ':'))
+
+    assert fast == DefaultJSONProvider(kanban.app).dumps(payload, separators=(',', ':'))
+    assert fast == '{"a":2,"b":1,"title":"Caf\\u00e9 \\u2615"}'
@@ -0,0 +1,65 @@
+import re
+
+import app as kanban
+from cache import TTLCache
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def sql_queries(response):
+    return int(re.search(r'"(\d+) queries"', response.headers['Server-Timing']).group(1))
+
+
+def test_entries_expire_after_their_ttl():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl=5, clock=clock)
+    cache.set('key', 'value')
+
+    clock.now = 4.9
+    assert cache.get('key') == 'value'
+    clock.now = 5.0
+    assert cache.get('key') is None
+    assert cache.expirations == 1
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+
+    cache.set('c', 3)
+
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)
+    assert cache.evictions == 1
+
+
+def test_profile_reads_are_served_from_the_cache(client, headers, monkeypatch):
+    monkeypatch.setitem(kanban.app.config, 'SERVER_TIMING', True)
+
+    response = client.get('/api/profile', headers=headers)
+
+    assert response.status_code == 200
+    assert sql_queries(response) == 0
+
+
+def test_duplicate_usernames_and_emails_are_refused(client):
+    def register(username, email):
+        return client.post('/api/register', json={'username': username, 'email': email, 'password': 'secret'})
+
+    assert register('taken', 'taken@example.com').status_code == 201
+    assert register('taken', 'other@example.com').status_code == 409
+    assert register('other', 'taken@example.com').status_code == 409
+
+    # Also when the cache has lost the user, through the unique constraints
+    kanban.user_cache.clear()
+    response = register('taken', 'third@example.com')
+    assert response.status_code == 409
+    assert response.get_json()['error'] == 'Username already exists'
@@ -0,0 +1,9 @@
+"""
+WSGI entry point for the API.
+
+    gunicorn -c gunicorn.conf.py                      # SERVER_MODE=wsgi
+"""
+
+from app import app
+
+application = app
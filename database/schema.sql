@@ -1,59 +1,220 @@
--- MySQL Database Schema for Authentication System
+-- MySQL schema for the Kanban backend
+--
+-- The backend creates and upgrades its schema itself with versioned
+-- migrations (`flask --app app migrate`, or on startup with MIGRATE_ON_START).
+-- This file is the same schema for bootstrapping a database by hand; it ends
+-- by recording the migration versions it already includes.
 
 -- Create database
 CREATE DATABASE IF NOT EXISTS auth_db;
 USE auth_db;
 
--- Create users table
-CREATE TABLE users (
+-- Users; the unique keys index username and email for login
+CREATE TABLE user (
     id INT AUTO_INCREMENT PRIMARY KEY,
     username VARCHAR(80) UNIQUE NOT NULL,
     email VARCHAR(120) UNIQUE NOT NULL,
     password_hash VARCHAR(128) NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
--- Create indexes for better performance
-CREATE INDEX idx_users_username ON users(username);
-CREATE INDEX idx_users_email ON users(email);
-CREATE INDEX idx_users_created_at ON users(created_at);
-
--- Optional: Create a sessions table for session management
-CREATE TABLE user_sessions (
+-- Boards, shared through their members; every ticket and its data belong to
+-- one board
+CREATE TABLE board (
     id INT AUTO_INCREMENT PRIMARY KEY,
-    user_id INT NOT NULL,
-    session_token VARCHAR(255) UNIQUE NOT NULL,
-    expires_at TIMESTAMP NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+    name VARCHAR(100) NOT NULL,
+    owner_id INT NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (owner_id) REFERENCES user(id),
+    INDEX idx_board_owner (owner_id, id)
 );
 
-CREATE INDEX idx_sessions_token ON user_sessions(session_token);
-CREATE INDEX idx_sessions_user_id ON user_sessions(user_id);
-CREATE INDEX idx_sessions_expires ON user_sessions(expires_at);
+-- Board membership (role owner or member); the primary key answers access
+-- checks, and (user_id, board_id) lists a user's boards
+CREATE TABLE board_member (
+    board_id INT NOT NULL,
+    user_id INT NOT NULL,
+    role VARCHAR(20) NOT NULL DEFAULT 'member',
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (board_id, user_id),
+    FOREIGN KEY (board_id) REFERENCES board(id),
+    FOREIGN KEY (user_id) REFERENCES user(id),
+    INDEX idx_board_member_user_board (user_id, board_id)
+);
 
--- Create tickets table for Kanban board
-CREATE TABLE tickets (
+-- Tickets for the Kanban board; the API sets updated_at itself, and
+-- rebalancing card order deliberately leaves it unchanged
+CREATE TABLE ticket (
     id VARCHAR(36) PRIMARY KEY,
     title VARCHAR(200) NOT NULL,
     description TEXT NOT NULL,
     priority VARCHAR(20) NOT NULL DEFAULT 'medium',
     status VARCHAR(20) NOT NULL DEFAULT 'todo',
-    labels TEXT,
-    user_id INT NOT NULL,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+    board_id INT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    `rank` VARCHAR(255) NOT NULL, -- fractional index key for manual order, top of the column first
+    FOREIGN KEY (board_id) REFERENCES board(id) ON DELETE CASCADE
+);
+
+-- Composite indexes for keyset pagination of ticket lists (newest first)
+CREATE INDEX idx_ticket_board_status_updated ON ticket(board_id, status, updated_at, id);
+CREATE INDEX idx_ticket_board_updated ON ticket(board_id, updated_at, id);
+CREATE INDEX idx_ticket_board_id ON ticket(board_id, id);
+
+-- Manual card order within each column; a move only rewrites the moved row
+CREATE INDEX idx_ticket_board_status_rank ON ticket(board_id, status, `rank`, id);
+
+-- Labels, one row per distinct name per board
+CREATE TABLE label (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    board_id INT NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    UNIQUE KEY uq_label_board_name (board_id, name),
+    FOREIGN KEY (board_id) REFERENCES board(id) ON DELETE CASCADE
+);
+
+-- Ticket/label join table; (label_id, ticket_id) answers label filters from the index
+CREATE TABLE ticket_label (
+    ticket_id VARCHAR(36) NOT NULL,
+    label_id INT NOT NULL,
+    position INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (ticket_id, label_id),
+    FOREIGN KEY (ticket_id) REFERENCES ticket(id) ON DELETE CASCADE,
+    FOREIGN KEY (label_id) REFERENCES label(id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_ticket_label_label_ticket ON ticket_label(label_id, ticket_id);
+
+-- Per-board ticket counters, maintained by the API on every ticket write
+CREATE TABLE ticket_count (
+    board_id INT NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    priority VARCHAR(20) NOT NULL,
+    count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (board_id, status, priority),
+    FOREIGN KEY (board_id) REFERENCES board(id) ON DELETE CASCADE
+);
+
+-- Board version, bumped on every ticket write; drives ETag/Last-Modified
+CREATE TABLE board_version (
+    board_id INT PRIMARY KEY,
+    version INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (board_id) REFERENCES board(id) ON DELETE CASCADE
+);
+
+-- Latest change sequence per ticket for delta sync; deletes stay as tombstones until compacted
+CREATE TABLE ticket_change (
+    ticket_id VARCHAR(36) PRIMARY KEY,
+    board_id INT NOT NULL,
+    seq INT NOT NULL,
+    deleted BOOLEAN NOT NULL DEFAULT FALSE,
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (board_id) REFERENCES board(id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_ticket_change_board_seq ON ticket_change(board_id, seq, ticket_id);
+CREATE INDEX idx_ticket_change_deleted_at ON ticket_change(deleted, changed_at);
+
+-- Full-text search documents, one per ticket, kept in step with ticket writes
+CREATE TABLE ticket_search (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    ticket_id VARCHAR(36) NOT NULL UNIQUE,
+    board_id INT NOT NULL,
+    title VARCHAR(200) NOT NULL,
+    description TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    FOREIGN KEY (board_id) REFERENCES board(id) ON DELETE CASCADE,
+    FULLTEXT INDEX ft_ticket_search (title, description, labels)
+);
+
+-- Append-only ticket history: status, priority and label changes, written in the
+-- same transaction as the change. Partitioned by month so old history can be
+-- archived with DROP PARTITION; the primary key has to include the partition
+-- column, and partitioned tables can't have foreign keys. Add partitions ahead
+-- of time by splitting the catch-all one:
+--   ALTER TABLE ticket_transition REORGANIZE PARTITION pmax INTO (
+--       PARTITION p2027_01 VALUES LESS THAN ('2027-02-01'),
+--       PARTITION pmax VALUES LESS THAN (MAXVALUE));
+CREATE TABLE ticket_transition (
+    id BIGINT AUTO_INCREMENT NOT NULL,
+    board_id INT NOT NULL,
+    ticket_id VARCHAR(36) NOT NULL,
+    field VARCHAR(20) NOT NULL,
+    old_value TEXT NULL, -- NULL when the ticket was created
+    new_value TEXT NULL, -- NULL when the ticket was deleted
+    occurred_at DATETIME NOT NULL,
+    PRIMARY KEY (id, occurred_at),
+    INDEX idx_ticket_transition_board_time (board_id, occurred_at, id),
+    INDEX idx_ticket_transition_ticket_time (ticket_id, occurred_at)
+)
+PARTITION BY RANGE COLUMNS (occurred_at) (
+    PARTITION p2026_10 VALUES LESS THAN ('2026-11-01'),
+    PARTITION p2026_11 VALUES LESS THAN ('2026-12-01'),
+    PARTITION p2026_12 VALUES LESS THAN ('2027-01-01'),
+    PARTITION pmax VALUES LESS THAN (MAXVALUE)
+);
+
+-- Daily rollups of the history for cumulative flow and lead/cycle time
+CREATE TABLE ticket_flow_daily (
+    board_id INT NOT NULL,
+    day DATE NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    entered INT NOT NULL DEFAULT 0,
+    exited INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (board_id, day, status),
+    FOREIGN KEY (board_id) REFERENCES board(id) ON DELETE CASCADE
+);
+
+CREATE TABLE ticket_lead_time_daily (
+    board_id INT NOT NULL,
+    day DATE NOT NULL,
+    metric VARCHAR(10) NOT NULL, -- lead or cycle
+    bucket INT NOT NULL,
+    count INT NOT NULL DEFAULT 0,
+    total_seconds BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (board_id, day, metric, bucket),
+    FOREIGN KEY (board_id) REFERENCES board(id) ON DELETE CASCADE
+);
+
+-- Background jobs; finished jobs are deleted, failed ones kept for inspection
+CREATE TABLE job (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    payload TEXT NOT NULL, -- JSON keyword arguments for the task
+    status VARCHAR(20) NOT NULL DEFAULT 'queued', -- queued, running or failed
+    attempts INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL,
+    run_at DATETIME NOT NULL,
+    locked_by VARCHAR(100) NULL,
+    locked_at DATETIME NULL,
+    last_error TEXT NULL,
+    `key` VARCHAR(255) NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_job_status_run_at (status, run_at, id),
+    INDEX idx_job_key (`key`)
+);
+
+-- Migration versions this file includes (see backend/migrations.py)
+CREATE TABLE schema_migration (
+    version INT PRIMARY KEY,
+    description VARCHAR(200) NOT NULL,
+    applied_at DATETIME NOT NULL
 );
 
--- Create indexes for tickets table
-CREATE INDEX idx_tickets_user_id ON tickets(user_id);
-CREATE INDEX idx_tickets_status ON tickets(status);
-CREATE INDEX idx_tickets_priority ON tickets(priority);
-CREATE INDEX idx_tickets_created_at ON tickets(created_at);
+INSERT INTO schema_migration (version, description, applied_at) VALUES
+(1, 'Rename the plural tables of database/schema.sql and setup_mysql.py', NOW()),
+(2, 'Create missing tables', NOW()),
+(3, 'Add ticket.rank and rank existing cards', NOW()),
+(4, 'Reconcile indexes with the models', NOW()),
+(5, 'Move labels from ticket.labels into label and ticket_label', NOW()),
+(6, 'Backfill ticket counters', NOW()),
+(7, 'Build the full-text search index', NOW()),
+(8, 'Backfill ticket history', NOW()),
+(9, 'Move tickets under boards with board membership', NOW());
 
 -- Sample data (optional)
--- INSERT INTO users (username, email, password_hash) VALUES 
+-- INSERT INTO user (username, email, password_hash) VALUES 
 -- ('testuser', 'test@example.com', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewfHGBGZQcqsRjkG');
 -- Note: The above password hash is for 'password123' - change this for production
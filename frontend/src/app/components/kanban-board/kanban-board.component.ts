@@ -81,6 +81,10 @@ export class KanbanBoardComponent implements OnInit, OnDestroy {
     this.kanbanService.deleteTicket(ticketId).subscribe();
   }
 
+  onLoadMore(status: 'todo' | 'in-progress' | 'done'): void {
+    this.kanbanService.loadMore(status);
+  }
+
   onTicketEdit(ticket: KanbanTicket): void {
     this.ticketToEdit = ticket;
     this.showEditModal = true;
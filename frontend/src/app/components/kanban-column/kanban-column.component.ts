@@ -15,6 +15,7 @@ export class KanbanColumnComponent {
   @Output() ticketMoved = new EventEmitter<{ ticketId: string, newStatus: 'todo' | 'in-progress' | 'done' }>();
   @Output() ticketDeleted = new EventEmitter<string>();
   @Output() ticketEdit = new EventEmitter<KanbanTicket>();
+  @Output() loadMore = new EventEmitter<'todo' | 'in-progress' | 'done'>();
 
   isDraggedOver = false;
 
@@ -30,6 +31,18 @@ export class KanbanColumnComponent {
     this.ticketEdit.emit(ticket);
   }
 
+  // Ask for the next page when the list is scrolled near its end
+  onScroll(event: Event): void {
+    const element = event.target as HTMLElement;
+    if (this.column.hasMore && element.scrollTop + element.clientHeight >= element.scrollHeight - 200) {
+      this.loadMore.emit(this.column.status);
+    }
+  }
+
+  onLoadMore(): void {
+    this.loadMore.emit(this.column.status);
+  }
+
   onDragOver(event: DragEvent): void {
     event.preventDefault();
     event.stopPropagation();
@@ -0,0 +1,26 @@
+import { Injectable } from '@angular/core';
+import { HttpEvent, HttpHandler, HttpInterceptor, HttpRequest, HttpResponse } from '@angular/common/http';
+import { Observable } from 'rxjs';
+import { tap } from 'rxjs/operators';
+
+// With read replicas, the API answers each change with X-Last-Write. Sending
+// it back keeps this client's reads on the primary for a few seconds, on
+// whichever server they land, so it always sees its own changes.
+@Injectable()
+export class LastWriteInterceptor implements HttpInterceptor {
+  private lastWrite: string | null = null;
+
+  intercept(req: HttpRequest<any>, next: HttpHandler): Observable<HttpEvent<any>> {
+    const request = this.lastWrite
+      ? req.clone({ setHeaders: { 'X-Last-Write': this.lastWrite } })
+      : req;
+    return next.handle(request).pipe(
+      tap(event => {
+        const lastWrite = event instanceof HttpResponse ? event.headers.get('X-Last-Write') : null;
+        if (lastWrite) {
+          this.lastWrite = lastWrite;
+        }
+      })
+    );
+  }
+}
@@ -0,0 +1,30 @@
+import { Injectable } from '@angular/core';
+import { HttpErrorResponse, HttpEvent, HttpHandler, HttpInterceptor, HttpRequest } from '@angular/common/http';
+import { Observable, throwError, timer } from 'rxjs';
+import { retry } from 'rxjs/operators';
+
+// The API refuses requests it is too busy for, or that are over a rate limit,
+// before doing any work: 429 or 503 with a Retry-After header in seconds.
+// Such requests are safe to send again once that time has passed.
+@Injectable()
+export class RetryAfterInterceptor implements HttpInterceptor {
+  private maxRetries = 3;
+  private maxDelaySeconds = 30;
+
+  intercept(req: HttpRequest<any>, next: HttpHandler): Observable<HttpEvent<any>> {
+    return next.handle(req).pipe(
+      retry({
+        count: this.maxRetries,
+        delay: error => {
+          const retryAfter = error instanceof HttpErrorResponse && (error.status === 429 || error.status === 503)
+            ? error.headers.get('Retry-After') : null;
+          const seconds = retryAfter === null ? NaN : Number(retryAfter);
+          if (!Number.isFinite(seconds)) {
+            return throwError(() => error);
+          }
+          return timer(Math.min(seconds, this.maxDelaySeconds) * 1000);
+        }
+      })
+    );
+  }
+}
@@ -5,15 +5,32 @@ export interface KanbanTicket {
   priority: 'low' | 'medium' | 'high';
   labels: string[];
   status: 'todo' | 'in-progress' | 'done';
+  rank: string;
   createdAt: Date;
   updatedAt: Date;
 }
 
+export interface TicketPage {
+  tickets: KanbanTicket[];
+  next_cursor: string | null;
+}
+
+export interface BoardSummary {
+  counts: {
+    total: number;
+    status: Record<'todo' | 'in-progress' | 'done', number>;
+    priority: Record<'low' | 'medium' | 'high', number>;
+  };
+  columns: Record<'todo' | 'in-progress' | 'done', TicketPage>;
+}
+
 export interface KanbanColumn {
   id: string;
   title: string;
   status: 'todo' | 'in-progress' | 'done';
   tickets: KanbanTicket[];
+  total: number;
+  hasMore: boolean;
 }
 
 export interface CreateTicketRequest {
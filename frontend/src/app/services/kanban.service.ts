@@ -1,32 +1,135 @@
 import { Injectable } from '@angular/core';
-import { HttpClient } from '@angular/common/http';
-import { BehaviorSubject, Observable } from 'rxjs';
+import { HttpClient, HttpParams } from '@angular/common/http';
+import { BehaviorSubject, Observable, combineLatest } from 'rxjs';
 import { map } from 'rxjs/operators';
-import { KanbanTicket, KanbanColumn, CreateTicketRequest, UpdateTicketRequest } from '../models/kanban.model';
+import { KanbanTicket, KanbanColumn, CreateTicketRequest, UpdateTicketRequest, TicketPage, BoardSummary } from '../models/kanban.model';
+
+type TicketStatus = KanbanTicket['status'];
+
+// How much of a column is loaded: its card count, and the cursor of its
+// next page (null once every card is loaded)
+interface ColumnPage {
+  total: number;
+  nextCursor: string | null;
+  loading: boolean;
+}
+
+const STATUSES: TicketStatus[] = ['todo', 'in-progress', 'done'];
+
+// Board order within a column, as the API sorts it
+function compareRank(a: KanbanTicket, b: KanbanTicket): number {
+  if (a.rank !== b.rank) {
+    return a.rank < b.rank ? -1 : 1;
+  }
+  return a.id < b.id ? -1 : a.id > b.id ? 1 : 0;
+}
+
+function emptyPages(): Record<TicketStatus, ColumnPage> {
+  const page = { total: 0, nextCursor: null, loading: false };
+  return { 'todo': { ...page }, 'in-progress': { ...page }, 'done': { ...page } };
+}
 
 @Injectable({
   providedIn: 'root'
 })
 export class KanbanService {
   private apiUrl = 'http://localhost:5001/api';
+  // The board shows the first page of each column and loads more as a column is scrolled
+  private pageSize = 100;
   private ticketsSubject = new BehaviorSubject<KanbanTicket[]>([]);
   public tickets$ = this.ticketsSubject.asObservable();
+  private pagesSubject = new BehaviorSubject<Record<TicketStatus, ColumnPage>>(emptyPages());
+  private events?: EventSource;
+  // Cards whose creation or deletion has been applied, so repeats are ignored
+  private countedIds = new Set<string>();
+  private deletedIds = new Set<string>();
 
   constructor(private http: HttpClient) {
     this.loadTickets();
+    this.listenForUpdates();
+  }
+
+  // Keep the board current with changes from other tabs and teammates.
+  // Events are applied to the loaded cards, and applying a change twice is a
+  // no-op, so the echo of this client's own writes changes nothing
+  private listenForUpdates(reconnecting = false): void {
+    if (!localStorage.getItem('token') || typeof EventSource === 'undefined') {
+      return;
+    }
+    // EventSource can't send headers, so the stream URL carries a short-lived
+    // stream ticket rather than the access token
+    this.http.post<{ticket: string}>(`${this.apiUrl}/events/ticket`, {}).subscribe({
+      next: response => this.openStream(response.ticket, reconnecting),
+      error: () => setTimeout(() => this.listenForUpdates(true), 5000)
+    });
+  }
+
+  private openStream(ticket: string, reconnecting: boolean): void {
+    const events = new EventSource(`${this.apiUrl}/events/stream?ticket=${encodeURIComponent(ticket)}`);
+    this.events = events;
+    if (reconnecting) {
+      // Catch up on changes made while disconnected
+      events.addEventListener('open', () => this.loadTickets(), { once: true });
+    }
+    // The browser retries dropped connections itself with the same URL, which
+    // fails once the ticket expires; then start over with a new ticket
+    events.addEventListener('error', () => {
+      if (events.readyState === EventSource.CLOSED) {
+        events.close();
+        setTimeout(() => this.listenForUpdates(true), 3000);
+      }
+    });
+    events.addEventListener('ticket.created', event => this.applyCreated(JSON.parse(event.data).ticket));
+    events.addEventListener('ticket.updated', event => this.applyUpdated(JSON.parse(event.data).ticket));
+    events.addEventListener('ticket.deleted', event => this.applyDeleted(JSON.parse(event.data).id));
+    // Batches and imports change many cards at once, and a dropped stream has missed events
+    for (const type of ['board.changed', 'dropped']) {
+      events.addEventListener(type, () => this.loadTickets());
+    }
+  }
+
+  // Get the card counts and the first page of each column, in board order
+  getBoardSummary(): Observable<BoardSummary> {
+    const params = new HttpParams().set('sort', 'rank').set('limit', this.pageSize);
+    return this.http.get<BoardSummary>(`${this.apiUrl}/board/summary`, { params });
   }
 
-  // Get all tickets
-  getTickets(): Observable<KanbanTicket[]> {
-    return this.http.get<{tickets: KanbanTicket[]}>(`${this.apiUrl}/tickets`)
-      .pipe(map(response => response.tickets));
+  // Get a single page of one column, in board order
+  getTicketPage(status: TicketStatus, cursor?: string | null): Observable<TicketPage> {
+    let params = new HttpParams().set('sort', 'rank').set('status', status).set('limit', this.pageSize);
+    if (cursor) {
+      params = params.set('cursor', cursor);
+    }
+    return this.http.get<TicketPage>(`${this.apiUrl}/tickets`, { params });
+  }
+
+  // Load the next page of a column, unless it is fully loaded or a page is on its way
+  loadMore(status: TicketStatus): void {
+    const page = this.pagesSubject.value[status];
+    if (!page.nextCursor || page.loading) {
+      return;
+    }
+    this.setPage(status, { loading: true });
+    this.getTicketPage(status, page.nextCursor).subscribe({
+      next: result => {
+        const loaded = new Set(this.ticketsSubject.value.map(ticket => ticket.id));
+        this.ticketsSubject.next(this.ticketsSubject.value.concat(result.tickets.filter(ticket => !loaded.has(ticket.id))));
+        this.setPage(status, { nextCursor: result.next_cursor, loading: false });
+      },
+      error: () => this.setPage(status, { loading: false })
+    });
+  }
+
+  private setPage(status: TicketStatus, changes: Partial<ColumnPage>): void {
+    const pages = this.pagesSubject.value;
+    this.pagesSubject.next({ ...pages, [status]: { ...pages[status], ...changes } });
   }
 
   // Create a new ticket
   createTicket(ticket: CreateTicketRequest): Observable<KanbanTicket> {
     return this.http.post<{ticket: KanbanTicket}>(`${this.apiUrl}/tickets`, ticket)
       .pipe(map(response => {
-        this.loadTickets(); // Refresh the tickets
+        this.applyCreated(response.ticket);
         return response.ticket;
       }));
   }
@@ -35,7 +138,7 @@ export class KanbanService {
   updateTicket(id: string, updates: UpdateTicketRequest): Observable<KanbanTicket> {
     return this.http.put<{ticket: KanbanTicket}>(`${this.apiUrl}/tickets/${id}`, updates)
       .pipe(map(response => {
-        this.loadTickets(); // Refresh the tickets
+        this.applyUpdated(response.ticket);
         return response.ticket;
       }));
   }
@@ -44,48 +147,109 @@ export class KanbanService {
   deleteTicket(id: string): Observable<void> {
     return this.http.delete<void>(`${this.apiUrl}/tickets/${id}`)
       .pipe(map(() => {
-        this.loadTickets(); // Refresh the tickets
+        this.applyDeleted(id);
+      }));
+  }
+
+  // Move ticket to a column; without neighbours it goes to the top
+  moveTicket(id: string, newStatus: 'todo' | 'in-progress' | 'done',
+             afterId?: string, beforeId?: string): Observable<KanbanTicket> {
+    const body = { status: newStatus, after_id: afterId, before_id: beforeId };
+    return this.http.post<{ticket: KanbanTicket}>(`${this.apiUrl}/tickets/${id}/move`, body)
+      .pipe(map(response => {
+        this.applyUpdated(response.ticket);
+        return response.ticket;
       }));
   }
 
-  // Move ticket to different column
-  moveTicket(id: string, newStatus: 'todo' | 'in-progress' | 'done'): Observable<KanbanTicket> {
-    return this.updateTicket(id, { status: newStatus });
+  // Add a new card, counting it once however many times it is applied
+  private applyCreated(ticket: KanbanTicket): void {
+    const others = this.ticketsSubject.value.filter(t => t.id !== ticket.id);
+    if (!this.countedIds.has(ticket.id)) {
+      this.countedIds.add(ticket.id);
+      this.adjustTotal(ticket.status, 1);
+    }
+    this.placeTicket(ticket, others);
   }
 
-  // Get columns with tickets organized by status
+  // Apply a ticket's changed fields; the id is always included
+  private applyUpdated(changes: Partial<KanbanTicket> & { id: string }): void {
+    const tickets = this.ticketsSubject.value;
+    const existing = tickets.find(t => t.id === changes.id);
+    if (!existing) {
+      if (changes.status !== undefined) {
+        // A card from an unloaded page changed column, and its old column is unknown
+        this.loadTickets();
+      } else if (changes.rank !== undefined) {
+        // It may have moved up into the loaded cards
+        this.http.get<{ticket: KanbanTicket}>(`${this.apiUrl}/tickets/${changes.id}`)
+          .subscribe(response => this.placeTicket(response.ticket, this.ticketsSubject.value.filter(t => t.id !== changes.id)));
+      }
+      return;
+    }
+    const ticket: KanbanTicket = { ...existing, ...changes };
+    if (ticket.status !== existing.status) {
+      this.adjustTotal(existing.status, -1);
+      this.adjustTotal(ticket.status, 1);
+    }
+    this.placeTicket(ticket, tickets.filter(t => t.id !== ticket.id));
+  }
+
+  private applyDeleted(id: string): void {
+    const tickets = this.ticketsSubject.value;
+    const existing = tickets.find(t => t.id === id);
+    if (existing) {
+      this.deletedIds.add(id);
+      this.adjustTotal(existing.status, -1);
+      this.ticketsSubject.next(tickets.filter(t => t.id !== id));
+    } else if (!this.deletedIds.has(id)) {
+      // A card from an unloaded page, so its column is unknown
+      this.loadTickets();
+    }
+  }
+
+  // Insert a card among the loaded cards of its column in board order. A card
+  // that sorts after them while the column has more pages arrives with those.
+  private placeTicket(ticket: KanbanTicket, others: KanbanTicket[]): void {
+    const column = others.filter(t => t.status === ticket.status);
+    const last = column[column.length - 1];
+    if (this.pagesSubject.value[ticket.status].nextCursor && last && compareRank(ticket, last) > 0) {
+      this.ticketsSubject.next(others);
+      return;
+    }
+    const next = others.findIndex(t => t.status === ticket.status && compareRank(ticket, t) < 0);
+    this.ticketsSubject.next(next < 0 ? [...others, ticket] : [...others.slice(0, next), ticket, ...others.slice(next)]);
+  }
+
+  private adjustTotal(status: TicketStatus, delta: number): void {
+    this.setPage(status, { total: Math.max(0, this.pagesSubject.value[status].total + delta) });
+  }
+
+  // Get columns with their loaded tickets, card counts and whether more pages remain
   getColumns(): Observable<KanbanColumn[]> {
-    return this.tickets$.pipe(
-      map(tickets => {
-        const columns: KanbanColumn[] = [
-          {
-            id: 'todo',
-            title: 'To Do',
-            status: 'todo',
-            tickets: tickets.filter(t => t.status === 'todo')
-          },
-          {
-            id: 'in-progress',
-            title: 'In Progress',
-            status: 'in-progress',
-            tickets: tickets.filter(t => t.status === 'in-progress')
-          },
-          {
-            id: 'done',
-            title: 'Done',
-            status: 'done',
-            tickets: tickets.filter(t => t.status === 'done')
-          }
-        ];
-        return columns;
-      })
+    const titles: Record<TicketStatus, string> = { 'todo': 'To Do', 'in-progress': 'In Progress', 'done': 'Done' };
+    return combineLatest([this.tickets$, this.pagesSubject]).pipe(
+      map(([tickets, pages]) => STATUSES.map(status => ({
+        id: status,
+        title: titles[status],
+        status,
+        tickets: tickets.filter(t => t.status === status),
+        total: pages[status].total,
+        hasMore: pages[status].nextCursor !== null
+      })))
     );
   }
 
-  // Load tickets from API
+  // Load the board from the API: card counts plus the first page of each column
   private loadTickets(): void {
-    this.getTickets().subscribe(tickets => {
-      this.ticketsSubject.next(tickets);
+    this.getBoardSummary().subscribe(summary => {
+      const pages = emptyPages();
+      for (const status of STATUSES) {
+        pages[status].total = summary.counts.status[status];
+        pages[status].nextCursor = summary.columns[status].next_cursor;
+      }
+      this.ticketsSubject.next(STATUSES.flatMap(status => summary.columns[status].tickets));
+      this.pagesSubject.next(pages);
     });
   }
 
@@ -99,6 +263,7 @@ export class KanbanService {
         priority: 'high',
         labels: ['backend', 'security'],
         status: 'done',
+        rank: 'i0',
         createdAt: new Date('2025-07-12'),
         updatedAt: new Date('2025-07-13')
       },
@@ -109,6 +274,7 @@ export class KanbanService {
         priority: 'medium',
         labels: ['frontend', 'ui'],
         status: 'in-progress',
+        rank: 'i0',
         createdAt: new Date('2025-07-13'),
         updatedAt: new Date('2025-07-13')
       },
@@ -119,6 +285,7 @@ export class KanbanService {
         priority: 'high',
         labels: ['database', 'migration'],
         status: 'done',
+        rank: 'i1',
         createdAt: new Date('2025-07-13'),
         updatedAt: new Date('2025-07-13')
       },
@@ -129,6 +296,7 @@ export class KanbanService {
         priority: 'low',
         labels: ['documentation', 'api'],
         status: 'todo',
+        rank: 'i0',
         createdAt: new Date('2025-07-13'),
         updatedAt: new Date('2025-07-13')
       },
@@ -139,6 +307,7 @@ export class KanbanService {
         priority: 'medium',
         labels: ['testing', 'quality'],
         status: 'todo',
+        rank: 'i1',
         createdAt: new Date('2025-07-13'),
         updatedAt: new Date('2025-07-13')
       }